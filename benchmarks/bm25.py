@@ -0,0 +1,79 @@
+"""
+Query latency of the BM25Index over a synthetic corpus.
+
+    $ python benchmarks/bm25.py --sections 100000
+"""
+
+import argparse
+import itertools
+import random
+import statistics
+import time
+
+from retrievalist_parsers import search
+from retrievalist_parsers.search import BM25Index
+
+
+def create_index(sections, vocabulary_size, seed):
+    rng = random.Random(seed)
+    vocabulary = ["term{}".format(number) for number in range(vocabulary_size)]
+    # zipf like term distribution
+    weights = list(
+        itertools.accumulate(1 / rank for rank in range(1, vocabulary_size + 1))
+    )
+
+    index = BM25Index()
+    start = time.perf_counter()
+    for number in range(sections):
+        title = " ".join(
+            rng.choices(vocabulary, cum_weights=weights, k=rng.randint(2, 8))
+        )
+        content = " ".join(
+            rng.choices(vocabulary, cum_weights=weights, k=rng.randint(20, 200))
+        )
+        index.add_section("doc{}".format(number // 100), str(number), title, content)
+    print(
+        "indexed {} sections in {:.1f}s".format(sections, time.perf_counter() - start)
+    )
+    return index, vocabulary, weights
+
+
+def measure(index, queries, label):
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search(query, limit=10)
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    print(
+        "{}: p50 {:.2f}ms, p95 {:.2f}ms".format(
+            label,
+            statistics.median(latencies),
+            latencies[int(len(latencies) * 0.95)],
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sections", type=int, default=100_000)
+    parser.add_argument("--vocabulary", type=int, default=50_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    index, vocabulary, weights = create_index(args.sections, args.vocabulary, args.seed)
+    rng = random.Random(args.seed + 1)
+    queries = [
+        " ".join(rng.choices(vocabulary, cum_weights=weights, k=rng.randint(1, 5)))
+        for _ in range(args.queries)
+    ]
+
+    if search.np is not None:
+        measure(index, queries, "numpy")
+        search.np = None
+    measure(index, queries, "python")
+
+
+if __name__ == "__main__":
+    main()
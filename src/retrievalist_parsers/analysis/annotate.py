@@ -1,13 +1,22 @@
-import statistics
-from collections import Counter
+import functools
+from typing import Any, Dict, Generator, Iterable, Tuple
 
-from pdfminer.layout import LTChar, LTTextBoxHorizontal
+from pdfminer.layout import LTTextBoxHorizontal
 
+from retrievalist_parsers.analysis.charstats import BoxStats
 from retrievalist_parsers.analysis.sizemapper import SizeMapper
 from retrievalist_parsers.analysis.styledistribution import StyleDistribution
 from retrievalist_parsers.model.document import TextElement
 from retrievalist_parsers.model.style import Style, TextSize
-from retrievalist_parsers.utils import truncate
+
+
+@functools.lru_cache(maxsize=1024)
+def font_flags(font_name: str) -> Tuple[bool, bool]:
+    """
+    @return: (bold, italic) derived from the font name
+    """
+    name = font_name.lower()
+    return "bold" in name, "italic" in name
 
 
 class StyleAnnotator:
@@ -18,50 +27,49 @@ class StyleAnnotator:
       mapped Size is leveraged by the hierarchy detection algorithm.
     """
 
-    def __init__(self, sizemapper: SizeMapper, style_info: StyleDistribution):
+    def __init__(
+        self,
+        sizemapper: SizeMapper,
+        style_info: StyleDistribution,
+        compact: bool = False,
+    ) -> None:
+        """
+        @param compact: create compact elements, that do not keep the pdfminer layout
+            alive, see @TextElement.compact
+        """
         self._sizeMapper = sizemapper
         self._styleInfo = style_info
+        self.compact = compact
+        # flyweight styles, documents usually hold a few distinct styles only
+        self._styles: Dict[Tuple[Any, ...], Style] = {}
 
-    @staticmethod
-    def __investigate_box_style(element):
-        fonts = Counter()
-        sizes = []
-        for line in element:
-            if isinstance(line, LTChar):
-                fonts.update([line.fontname])
-                sizes.append(line.size)
+    def _style(self, *key: Any) -> Style:
+        style = self._styles.get(key)
+        if style is None:
+            style = self._styles[key] = Style(*key)
+        return style
 
-            else:
-                for c in line:
-                    if isinstance(c, LTChar):
-                        fonts.update([c.fontname])
-                        sizes.append(c.size)
-        return fonts, sizes
-
-    def process(self, element_gen):  # element: LTTextContainer):
+    def process(self, element_gen: Iterable[Any]) -> Generator[TextElement, None, None]:
         """ "
         annotate each element with fontsize
         """
         for element in element_gen:
             if isinstance(element, LTTextBoxHorizontal):
-                fonts, sizes = self.__investigate_box_style(element)
-                if not fonts or not element.get_text().rstrip():
+                # characters of the lines are scanned once, see @line_stats
+                stats = BoxStats(element)
+                if not stats.fonts or not stats.text.rstrip():
                     continue
 
-                font_name = fonts.most_common(1)[0][0]
-                mean_size = truncate(statistics.mean(sizes), 1)
-                max_size = max(sizes)
+                font_name = stats.font_name
+                mean_size = stats.mean_size
+                max_size = stats.max_size
                 # todo currently empty boxes are forwarded.. with holding only \n
                 mapped_size = self._sizeMapper.translate(
                     target_enum=TextSize, value=max_size
                 )
-                s = Style(
-                    bold="bold" in str(font_name.lower()),
-                    italic="italic" in font_name.lower(),
-                    font_name=font_name,
-                    mapped_font_size=mapped_size,
-                    mean_size=mean_size,
-                    max_size=max_size,
+                bold, italic = font_flags(font_name)
+                s = self._style(
+                    bold, italic, font_name, mapped_size, mean_size, max_size
                 )
 
                 # todo, split lines within LTTextBoxHorizontal
@@ -69,8 +77,17 @@ class StyleAnnotator:
                 #  e.g 1st is title with bold text
                 #      2nd & 3rd line are introduction lines with body style
                 #      -> forward 2 boxes (header, content)
-                yield TextElement(
-                    text_container=element,
-                    style=s,
-                    page=element.page if hasattr(element, "page") else None,
-                )
+                page = element.page if hasattr(element, "page") else None
+                text = stats.text.strip()
+                if self.compact:
+                    yield TextElement.compact(
+                        element, style=s, page=page, text=text, tokens=stats.tokens()
+                    )
+                else:
+                    yield TextElement(
+                        text_container=element,
+                        style=s,
+                        text=text,
+                        page=page,
+                        tokens=stats.tokens(),
+                    )
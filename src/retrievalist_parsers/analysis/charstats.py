@@ -0,0 +1,162 @@
+import statistics
+from collections import Counter
+from typing import Any, Counter as CounterType, List, Optional
+
+from pdfminer.layout import LTAnno, LTChar, LTComponent, LTTextContainer, LTTextLine
+
+from retrievalist_parsers.utils import truncate
+
+# leading objects of a line, whose size decides the style of the line,
+# see @FileSource.split_boxes_by_style
+HEAD_OBJECTS = 10
+
+
+class LineStats:
+    """
+    Result of one scan over the characters of a text line,
+    cached on the line (see @line_stats).
+    - recorded lines are shared by all reads of a source (see @PageLayout.replay),
+      size analysis, box splitting & style annotation read the same record.
+    - text excludes the trailing line break,
+      it is added & removed whenever lines are regrouped into boxes.
+    """
+
+    __slots__ = ("chars", "fonts", "head_size", "sizes", "text")
+
+    def __init__(self, line: LTTextLine) -> None:
+        self.fonts: CounterType[str] = Counter()
+        self.sizes: List[float] = []
+        # texts of the characters,
+        # words are split on space characters (see @utils.generate_words)
+        self.chars: List[str] = []
+        # max size of the characters within the head objects of the line
+        self.head_size: Optional[float] = None
+        texts: List[str] = []
+        objs = line._objs
+        last = len(objs) - 1
+        for position, obj in enumerate(objs):
+            if isinstance(obj, LTChar):
+                text = obj.get_text()
+                self.fonts[obj.fontname] += 1
+                self.sizes.append(obj.size)
+                self.chars.append(text)
+                texts.append(text)
+                if position < HEAD_OBJECTS and (
+                    self.head_size is None or obj.size > self.head_size
+                ):
+                    self.head_size = obj.size
+            elif isinstance(obj, LTAnno):
+                text = obj.get_text()
+                if position != last or text != "\n":
+                    texts.append(text)
+        self.text = "".join(texts)
+
+
+def line_stats(line: LTTextLine) -> LineStats:
+    """
+    @return: stats of the text line, the characters are scanned on first access only
+    """
+    stats: Optional[LineStats] = getattr(line, "_char_stats", None)
+    if stats is None:
+        stats = line._char_stats = LineStats(line)  # type: ignore[attr-defined]
+    return stats
+
+
+def line_text(line: LTTextLine) -> str:
+    """
+    @return: same as line.get_text(), built from the cached line stats
+    """
+    objs = line._objs
+    if objs and isinstance(objs[-1], LTAnno) and objs[-1].get_text() == "\n":
+        return line_stats(line).text + "\n"
+    return line_stats(line).text
+
+
+def is_empty_line(line: LTTextLine) -> bool:
+    """
+    same as line.is_empty(), without assembling the text of the line again
+    """
+    return LTComponent.is_empty(line) or line_text(line).isspace()
+
+
+def _char_line_stats(char: LTChar) -> LineStats:
+    # boxes may hold single characters instead of lines
+    stats = LineStats.__new__(LineStats)
+    text = char.get_text()
+    stats.fonts = Counter({char.fontname: 1})
+    stats.sizes = [char.size]
+    stats.chars = [text]
+    stats.text = text
+    stats.head_size = char.size
+    return stats
+
+
+class BoxStats:
+    """
+    Character stats of a text box, merged from the cached stats of its lines.
+    provides everything the style annotation & header detection need:
+    fonts, sizes, text & leading words.
+    """
+
+    __slots__ = ("_lines", "fonts", "sizes", "text")
+
+    def __init__(self, box: "LTTextContainer[Any]") -> None:
+        self.fonts: CounterType[str] = Counter()
+        self.sizes: List[float] = []
+        self._lines: List[LineStats] = []
+        texts: List[str] = []
+        for line in box:
+            if isinstance(line, LTChar):
+                stats = _char_line_stats(line)
+                texts.append(stats.text)
+            else:
+                stats = line_stats(line)
+                texts.append(line_text(line))
+            self._lines.append(stats)
+            self.fonts.update(stats.fonts)
+            self.sizes.extend(stats.sizes)
+        # same as box.get_text()
+        self.text = "".join(texts)
+
+    @property
+    def font_name(self) -> str:
+        """
+        @return: most common font of the box
+        """
+        return self.fonts.most_common(1)[0][0]
+
+    @property
+    def max_size(self) -> float:
+        return max(self.sizes)
+
+    @property
+    def mean_size(self) -> float:
+        """
+        @return: mean character size, truncated to 1 decimal
+        """
+        if self.sizes[0] == self.max_size == min(self.sizes):
+            # mean of equal sizes,
+            # skips the exact fraction arithmetic of statistics.mean
+            return truncate(self.sizes[0], 1)
+        return truncate(statistics.mean(self.sizes), 1)
+
+    def tokens(self, count: int = 3) -> List[str]:
+        """
+        @return: leading words of the box, same as @utils.generate_words
+        """
+        tokens = []
+        characters = []
+        for stats in self._lines:
+            for character in stats.chars:
+                if character != " ":
+                    characters.append(character)
+                    continue
+                word = "".join(characters).strip()
+                if len(word) > 0:
+                    tokens.append(word)
+                    if len(tokens) == count:
+                        return tokens
+                characters.clear()
+        if characters:
+            tokens.append("".join(characters))
+        return tokens[:count]
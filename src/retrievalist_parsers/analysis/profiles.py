@@ -0,0 +1,187 @@
+import hashlib
+import pickle
+import re
+from typing import Any, Dict, Generator, Iterable, Optional, Set
+
+from pdfminer.layout import LTChar, LTComponent, LTTextContainer, LTTextLine
+
+from retrievalist_parsers.analysis.charstats import line_stats
+from retrievalist_parsers.analysis.styledistribution import (
+    StyleAnalyser,
+    StyleDistribution,
+)
+from retrievalist_parsers.utils import truncate
+
+PROFILE_VERSION = 1
+
+# embedded font subsets are prefixed with a random tag, e.g. "ABCDEF+Helvetica-Bold"
+subset_pattern = re.compile(r"^[A-Z]{6}\+")
+
+
+def base_font(font_name: str) -> str:
+    return subset_pattern.sub("", font_name)
+
+
+def first_page(
+    elements: Iterable[LTTextContainer[Any]],
+) -> Generator[LTTextContainer[Any], None, None]:
+    """
+    @return: yields the elements of the first read page,
+        stops as soon as the next page starts
+    """
+    page = None
+    for position, element in enumerate(elements):
+        element_page = getattr(element, "page", None)
+        if position == 0:
+            page = element_page
+        elif element_page != page:
+            return
+        yield element
+
+
+def font_fingerprint(elements: Iterable[LTComponent]) -> Optional[str]:
+    """
+    cheap fingerprint of the fonts of some elements,
+    typically the first page of a document.
+    @return: digest of the used font names & character sizes,
+        None if the elements hold no text
+    """
+    fonts: Set[str] = set()
+    sizes: Set[float] = set()
+    for element in elements:
+        if not isinstance(element, LTTextContainer):
+            continue
+        for line in element:
+            if isinstance(line, LTChar):
+                fonts.add(base_font(line.fontname))
+                sizes.add(truncate(line.size, 1))
+            elif isinstance(line, LTTextLine):
+                stats = line_stats(line)
+                fonts.update(base_font(font) for font in stats.fonts)
+                sizes.update(truncate(size, 1) for size in stats.sizes)
+    if not fonts:
+        return None
+    return hashlib.sha1(repr((sorted(fonts), sorted(sizes))).encode()).hexdigest()
+
+
+def line_margin(elements: Iterable[LTComponent]) -> Optional[float]:
+    """
+    line margin of some elements (see @LineMarginAnalyer),
+    e.g. of the first page read with the default layout params.
+    @return: None if the elements hold no line distances
+    """
+    analyser = StyleAnalyser()
+    for element in elements:
+        analyser.consume(element)
+    try:
+        return analyser.lineMarginAnalyser.process_result()
+    except ValueError:
+        return None
+
+
+class StyleProfile:
+    __slots__ = ("distribution", "fingerprint", "observations")
+
+    def __init__(
+        self, fingerprint: str, distribution: StyleDistribution, observations: int = 1
+    ) -> None:
+        """
+        @param distribution: merged style distribution (including line margin)
+            of all observed documents
+        @param observations: amount of documents merged into the profile
+        """
+        self.fingerprint = fingerprint
+        self.distribution = distribution
+        self.observations = observations
+
+
+class StyleProfileStore:
+    """
+    Style distributions of a corpus,
+    keyed by the font fingerprint of the first page (see @font_fingerprint).
+    documents of the same publisher or template usually share fonts & size distribution,
+    a matching profile replaces the style analysis (first pass) of the @HierarchyParser.
+    - repeated observations of a fingerprint are merged, see @StyleDistribution.merge.
+    - profiles are validated against the style distribution of the parsed document,
+      profiles that do not match (anymore) are replaced.
+      the line margin depends on the layout params the elements were read with,
+      it is measured on the first page read with the default params (see @line_margin).
+    """
+
+    def __init__(self, tolerance: float = 0.1, min_observations: int = 1) -> None:
+        """
+        @param tolerance: max relative difference of body size, max size and line margin
+            between profile & document
+        @param min_observations: profiles are used once that many documents have been
+            observed
+        """
+        self.tolerance = tolerance
+        self.min_observations = min_observations
+        self.profiles: Dict[str, StyleProfile] = {}
+
+    def __len__(self) -> int:
+        return len(self.profiles)
+
+    def __contains__(self, fingerprint: object) -> bool:
+        return fingerprint in self.profiles
+
+    def lookup(self, fingerprint: str) -> Optional[StyleDistribution]:
+        """
+        @return: style distribution of the matching profile,
+            None if unknown or not observed often enough
+        """
+        profile = self.profiles.get(fingerprint)
+        if profile is None or profile.observations < self.min_observations:
+            return None
+        return profile.distribution
+
+    def observe(self, fingerprint: str, distribution: StyleDistribution) -> None:
+        """
+        merge the style distribution of a parsed document
+        into the profile of its fingerprint.
+        """
+        profile = self.profiles.get(fingerprint)
+        if profile is None:
+            self.profiles[fingerprint] = StyleProfile(fingerprint, distribution)
+            return
+        profile.distribution = StyleDistribution.merge(
+            profile.distribution, distribution
+        )
+        profile.observations += 1
+
+    def replace(self, fingerprint: str, distribution: StyleDistribution) -> None:
+        """
+        restart the profile of a fingerprint, e.g. after its validation failed.
+        """
+        self.profiles[fingerprint] = StyleProfile(fingerprint, distribution)
+
+    def is_valid(self, profile: StyleDistribution, observed: StyleDistribution) -> bool:
+        """
+        checks that body size, max size and line margin of a profile match the observed
+        distribution within tolerance
+        """
+
+        def close(x: float, y: float) -> bool:
+            return abs(x - y) <= self.tolerance * max(abs(x), abs(y))
+
+        return (
+            close(profile.body_size, observed.body_size)
+            and close(profile.max_found_size, observed.max_found_size)
+            and close(profile.line_margin, observed.line_margin)
+        )
+
+    def save(self, path: str) -> None:
+        with open(path, "wb") as fp:
+            pickle.dump(
+                (PROFILE_VERSION, self.__dict__), fp, protocol=pickle.HIGHEST_PROTOCOL
+            )
+
+    @classmethod
+    def load(cls, path: str) -> "StyleProfileStore":
+        with open(path, "rb") as fp:
+            version, state = pickle.load(fp)
+        if version != PROFILE_VERSION:
+            raise ValueError("unsupported profile version: {}".format(version))
+        store = cls.__new__(cls)
+        store.__dict__.update(state)
+        return store
@@ -0,0 +1,135 @@
+import math
+import random
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple
+
+from pdfminer.layout import LTComponent
+
+from retrievalist_parsers.analysis.styledistribution import (
+    StyleAnalyser,
+    StyleDistribution,
+)
+
+
+class PageSampler:
+    """
+    Selects a stratified sample of pages for the style analysis (first pass)
+    of large documents.
+    - the document is split into equally sized page ranges (strata),
+      one page is drawn per stratum.
+    - the sample is split into two interleaved halves,
+      their style distributions have to agree, otherwise the sample is considered
+      unstable and the whole document should be analysed.
+    - the first page (often holding the largest title) is always analysed,
+      but not part of the stability check.
+    - line distances are measured within pages only, sampled pages are not adjacent.
+    """
+
+    def __init__(
+        self,
+        budget: Optional[int] = None,
+        fraction: Optional[float] = None,
+        seed: int = 0,
+        min_pages: int = 8,
+        tolerance: float = 0.1,
+    ) -> None:
+        """
+        @param budget: amount of pages to sample
+        @param fraction: share of pages to sample, used if no budget is given
+        @param seed: same seed & page count -> same sample
+        @param min_pages: documents with less pages are analysed completely
+        @param tolerance: max relative difference of body size and line margin
+            between both halves
+        """
+        if budget is None and fraction is None:
+            raise ValueError("sample budget or fraction required")
+        self.budget = budget
+        self.fraction = fraction
+        self.seed = seed
+        self.min_pages = min_pages
+        self.tolerance = tolerance
+
+    def sample_size(self, page_count: int) -> int:
+        if self.budget is not None:
+            size = self.budget
+        elif self.fraction is not None:
+            size = math.ceil(self.fraction * page_count)
+        else:
+            raise ValueError("sample budget or fraction required")
+        return max(size, self.min_pages, 2)
+
+    def select(self, pages: Sequence[int]) -> Tuple[List[int], List[int], List[int]]:
+        """
+        @param pages: candidate page indices in document order
+        @return: first page & two interleaved halves of the sample,
+            all empty if all pages should be analysed
+        """
+        size = self.sample_size(len(pages) - 1)
+        if size >= len(pages) - 1:
+            return [], [], []
+
+        rng = random.Random(self.seed)
+        sample = []
+        for stratum in range(size):
+            start = 1 + stratum * (len(pages) - 1) // size
+            end = 1 + (stratum + 1) * (len(pages) - 1) // size
+            sample.append(pages[rng.randrange(start, end)])
+        return [pages[0]], sample[0::2], sample[1::2]
+
+    def is_stable(self, a: StyleDistribution, b: StyleDistribution) -> bool:
+        """
+        checks that body size and line margin of both halves match within tolerance
+        """
+
+        def close(x: float, y: float) -> bool:
+            return abs(x - y) <= self.tolerance * max(abs(x), abs(y))
+
+        return close(a.body_size, b.body_size) and close(a.line_margin, b.line_margin)
+
+    def analyse(
+        self,
+        selection: Tuple[List[int], List[int], List[int]],
+        read: Callable[[List[int]], Iterable[LTComponent]],
+    ) -> Optional[StyleDistribution]:
+        """
+        @param selection: see @select
+        @param read: reads elements of the given page indices
+        @return: style distribution of the whole sample, None if unstable
+        """
+        first_pages, *halves = selection
+        analysers = []
+        distributions = []
+        for pages in halves:
+            analyser = self.__analyse_pages(read(pages))
+            try:
+                distributions.append(analyser.process_result())
+            except (TypeError, ValueError):
+                # no text or no line distances found within sampled pages
+                return None
+            analysers.append(analyser)
+
+        if not self.is_stable(*distributions):
+            return None
+
+        result = self.__analyse_pages(read(first_pages))
+        for analyser in analysers:
+            result.merge(analyser, adjacent=False)
+        return result.process_result()
+
+    @staticmethod
+    def __analyse_pages(elements: Iterable[LTComponent]) -> StyleAnalyser:
+        """
+        analyses each page on its own and merges the results,
+        without line distances across page boundaries.
+        """
+        result = StyleAnalyser()
+        analyser = StyleAnalyser()
+        page = None
+        for element in elements:
+            element_page = getattr(element, "page", None)
+            if element_page != page:
+                result.merge(analyser, adjacent=False)
+                analyser = StyleAnalyser()
+                page = element_page
+            analyser.consume(element)
+        result.merge(analyser, adjacent=False)
+        return result
@@ -1,65 +1,239 @@
-import itertools
+import array
 from collections import Counter, defaultdict
-
-from pdfminer.layout import LTChar, LTTextContainer, LTTextLine
+from types import MappingProxyType, ModuleType
+from typing import (
+    Any,
+    Counter as CounterType,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    NoReturn,
+    Optional,
+    Tuple,
+)
+
+from pdfminer.layout import LTComponent, LTTextContainer, LTTextLine
 from sortedcontainers import SortedDict
 
+from retrievalist_parsers.analysis.charstats import is_empty_line, line_stats
 from retrievalist_parsers.utils import closest_key, truncate
 
+np: Optional[ModuleType]
+try:
+    import numpy as np
+except ImportError:  # optional, histograms are computed size by size instead
+    np = None
+
+# (size or normalised size, share) in order of the histogram
+_Histogram = List[Tuple[float, float]]
+
 
 class StyleDistribution:
     """
     Represents style information for one analysed element stream (typically one stream per document).
+    - immutable: sizes & their counts are stored as arrays in order of first occurrence,
+      aggregates (body size, min/max size, amount of values) are computed once.
+    - histograms (see @norm_data, @norm_data_binned) are computed in one vectorized
+      step & cached.
+    - distributions of consecutive streams (e.g. page ranges) can be combined,
+      see @merge.
     """
 
-    def __init__(self, data=None, line_margin=0.5):
+    __slots__ = (
+        "_amount_values",
+        "_body_size",
+        "_counts",
+        "_data",
+        "_histograms",
+        "_line_margin",
+        "_max_found_size",
+        "_min_found_size",
+        "_sizes",
+    )
+    _amount_values: float
+    _body_size: Optional[float]
+    # numpy arrays if available, see @sizes & @counts
+    _counts: Any
+    _data: Mapping[float, int]
+    _histograms: Dict[Optional[int], _Histogram]
+    _line_margin: float
+    _max_found_size: Optional[float]
+    _min_found_size: Optional[float]
+    _sizes: Any
+
+    def __init__(
+        self, data: Optional[Mapping[float, int]] = None, line_margin: float = 0.5
+    ) -> None:
         """
-
-        :type data: Counter
-        :param data:
+        @param data: count per character size, e.g. a Counter
+        @param line_margin: relative line margin of paragraphs, see @LineMarginAnalyer
         """
+        set_attribute = super().__setattr__
+        data = dict(data) if data else {}
+        sizes, counts = list(data.keys()), list(data.values())
+        if np is not None:
+            set_attribute("_sizes", np.array(sizes, dtype=np.float64))
+            set_attribute("_counts", np.array(counts, dtype=np.int64))
+            self._sizes.flags.writeable = False
+            self._counts.flags.writeable = False
+        else:
+            set_attribute("_sizes", array.array("d", sizes))
+            set_attribute("_counts", array.array("q", counts))
+        set_attribute("_line_margin", line_margin)
+        # read-only view, see @data
+        set_attribute("_data", MappingProxyType(data))
+        set_attribute("_amount_values", float(sum(counts)))
+        set_attribute("_histograms", {})
+
+        body_size = min_found_size = max_found_size = None
         if data:
-            self._data = data
-            self._body_size = data.most_common(1)[0][0]
-            self._min_found_size, self._max_found_size = (
-                min(data.keys()),
-                max(data.keys()),
-            )
-            if self._min_found_size == self._max_found_size:
-                self._min_found_size /= 2
-                self._max_found_size *= 2
-        self._line_margin = line_margin
+            # most common size,
+            # ties are resolved in order of first occurrence (as Counter.most_common)
+            body_size = sizes[counts.index(max(counts))]
+            min_found_size, max_found_size = min(sizes), max(sizes)
+            if min_found_size == max_found_size:
+                min_found_size /= 2
+                max_found_size *= 2
+        set_attribute("_body_size", body_size)
+        set_attribute("_min_found_size", min_found_size)
+        set_attribute("_max_found_size", max_found_size)
+
+    def __setattr__(self, key: str, value: object) -> NoReturn:
+        raise AttributeError("StyleDistribution is immutable")
+
+    def __reduce__(
+        self,
+    ) -> Tuple[type["StyleDistribution"], Tuple[Dict[float, int], float]]:
+        return StyleDistribution, (dict(self._data), self._line_margin)
+
+    @classmethod
+    def merge(
+        cls, *distributions: "StyleDistribution", line_margin: Optional[float] = None
+    ) -> "StyleDistribution":
+        """
+        combines distributions of separately analysed streams,
+        counts of equal sizes are summed up.
+        @param line_margin: line margin of the combined stream,
+            defaults to the mean line margin weighted by the amount of values.
+            line margins of adjacent streams can be merged exactly
+            with @StyleAnalyser.merge.
+        """
+        data: CounterType[float] = Counter()
+        for distribution in distributions:
+            data.update(distribution._data)
+        if line_margin is None:
+            weights = [distribution.amount_values for distribution in distributions]
+            if sum(weights):
+                line_margin = sum(
+                    distribution.line_margin * weight
+                    for distribution, weight in zip(distributions, weights, strict=True)
+                ) / sum(weights)
+            else:
+                line_margin = distributions[0].line_margin if distributions else 0.5
+        return cls(data, line_margin=line_margin)
 
     @property
     def line_margin(self):
         return self._line_margin
 
-    def norm_data_binned(self, bins=50):
-        amount_items = self.amount_values
+    @property
+    def sizes(self) -> Any:
+        """
+        @return: found sizes in order of first occurrence (read-only array)
+        """
+        return self._sizes
+
+    @property
+    def counts(self) -> Any:
+        """
+        @return: count per size of @sizes (read-only array)
+        """
+        return self._counts
+
+    def __normalised_sizes(self) -> Any:
+        # same as truncate(size / max_found_size, 2)
+        if np is not None and len(self._sizes):
+            return np.trunc(self._sizes / self.max_found_size * 100.0) / 100.0
+        return [truncate(size / self.max_found_size, 2) for size in self._sizes]
+
+    def __weights(self) -> Any:
+        if np is not None:
+            return self._counts / self._amount_values
+        return [float(count) / self._amount_values for count in self._counts]
+
+    def norm_data_binned(self, bins: int = 50) -> Any:
+        """
+        share of values per normalised size,
+        sizes are assigned to the closest of the bins 0, 1/bins, 2/bins ...
+        @return: SortedDict bin -> share
+        """
+        histogram = self._histograms.get(bins)
+        if histogram is None:
+            histogram = self._histograms[bins] = self.__binned(bins)
+        return SortedDict(histogram)
+
+    def __binned(self, bins: int) -> _Histogram:
         step = 1.0 / bins
         keys = [step * i for i in range(bins)]
-        normalised = SortedDict({key: 0.0 for key in keys})
-        for size in self.data:
-            norm_key = truncate(size / self.max_found_size, 2)
-            k = closest_key(normalised, norm_key)
-            normalised[k] += float(self.data[size]) / amount_items
-
-        return normalised
+        if np is None or not len(self._sizes):
+            normalised = SortedDict({key: 0.0 for key in keys})
+            for norm_key, weight in zip(
+                self.__normalised_sizes(), self.__weights(), strict=True
+            ):
+                normalised[closest_key(normalised, norm_key)] += weight
+            return list(normalised.items())
+
+        bin_keys = np.array(keys)
+        norm_keys = self.__normalised_sizes()
+        # closest bin, ties go to the upper bin (see @utils.closest_key)
+        upper = np.searchsorted(keys, norm_keys, side="left")
+        lower = np.searchsorted(keys, norm_keys, side="right") - 1
+        upper_key = bin_keys[np.minimum(upper, bins - 1)]
+        lower_key = bin_keys[np.maximum(lower, 0)]
+        use_upper = (upper < bins) & (
+            (lower < 0)
+            | (np.abs(norm_keys - upper_key) <= np.abs(norm_keys - lower_key))
+        )
+        index = np.where(use_upper, upper, lower)
+        shares = np.bincount(index, weights=self.__weights(), minlength=bins)
+        return list(zip(keys, shares.tolist(), strict=True))
 
     @property
     def norm_data(self):
+        """
+        share of values per normalised size
+        (size / max found size, truncated to 2 decimals).
+        @return: dict normalised size -> share, in order of first occurrence
+        """
         # normalise counts with total amount of collected values
         # normalise each key value against max found key value (size)
         # normalise X & Y
+        histogram = self._histograms.get(None)
+        if histogram is None:
+            histogram = self._histograms[None] = self.__normalised()
         normalised = defaultdict(int)
-        amount_items = self.amount_values
-        for size in self.data:
-            normalised[truncate(size / self.max_found_size, 2)] += (
-                float(self.data[size]) / amount_items
-            )
-
+        normalised.update(histogram)
         return normalised
 
+    def __normalised(self) -> _Histogram:
+        if not len(self._sizes):
+            return []
+        if np is None:
+            normalised: Dict[float, float] = {}
+            for norm_key, weight in zip(
+                self.__normalised_sizes(), self.__weights(), strict=True
+            ):
+                normalised[norm_key] = normalised.get(norm_key, 0) + weight
+            return list(normalised.items())
+
+        norm_keys, first, inverse = np.unique(
+            self.__normalised_sizes(), return_index=True, return_inverse=True
+        )
+        shares = np.bincount(inverse, weights=self.__weights())
+        order = np.argsort(first, kind="stable")
+        return list(zip(norm_keys[order].tolist(), shares[order].tolist(), strict=True))
+
     @property
     def min_found_size(self):
         return self._min_found_size
@@ -86,7 +260,7 @@ class StyleDistribution:
 
     @property
     def amount_values(self):
-        return sum(self._data.values(), 0.0)
+        return self._amount_values
 
     @property
     def amount_sizes(self):
@@ -97,38 +271,56 @@ class StyleDistribution:
         return len(self._data)
 
     @property
-    def data(self) -> Counter:
-        return self._data.copy()
+    def data(self) -> Mapping[float, int]:
+        """
+        @return: read-only view of the count per size
+        """
+        return self._data
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "_data": dict(self._data),
+            "_body_size": self._body_size,
+            "_min_found_size": self._min_found_size,
+            "_max_found_size": self._max_found_size,
+            "_line_margin": self._line_margin,
+        }
 
 
 class SizeAnalyser:
-    def __init__(self):
+    def __init__(self) -> None:
         self.sizeDistribution = Counter()
 
-    def consume(self, node: LTTextContainer):
-        sizes = list(
-            itertools.islice([c.size for c in node if isinstance(c, LTChar)], 10)
-        )
+    def consume(self, node: LTTextLine) -> None:
+        # sizes of the first 10 characters
+        sizes = line_stats(node).sizes[:10]
         # get max size, check that it occurred at least twice
         maxSize = max(sizes)
         if sizes.count(maxSize) > 2:
             self.sizeDistribution.update([truncate(maxSize, 2)])
 
+    def merge(self, other: "SizeAnalyser") -> None:
+        self.sizeDistribution.update(other.sizeDistribution)
+
     def process_result(self):
         pass
 
 
 class LineMarginAnalyer:
-    _previousNode: LTTextContainer
+    _previousNode: Optional[LTTextLine]
+    _firstNode: Optional[LTTextLine]
 
-    def __init__(self):
+    def __init__(self) -> None:
         self._distanceCounter = defaultdict(int)
         self._headingTrailingCounter = defaultdict(int)
         self._previousNode = None
+        self._firstNode = None
         self._y = None
         self._previousBoxHeight = None
 
-    def consume(self, node: LTTextContainer):
+    def consume(self, node: LTTextLine) -> None:
+        if self._firstNode is None:
+            self._firstNode = node
         if self._previousNode:
             diff = truncate(abs(self._previousNode.y0 - node.y1), 2)
             if self._previousNode.height == node.height:
@@ -140,7 +332,27 @@ class LineMarginAnalyer:
 
         self._previousNode = node
 
-    def process_result(self):
+    def merge(self, other: "LineMarginAnalyer", adjacent: bool = True) -> None:
+        """
+        add results of an analyser that consumed the following nodes,
+        e.g. the next pages.
+        @param adjacent: other starts directly after the last consumed node,
+            otherwise no distance is measured between both
+        """
+        if other._firstNode is None:
+            return
+        if adjacent:
+            # measure distance between last consumed node and first node of other
+            self.consume(other._firstNode)
+        elif self._firstNode is None:
+            self._firstNode = other._firstNode
+        for key, count in other._distanceCounter.items():
+            self._distanceCounter[key] += count
+        for key, count in other._headingTrailingCounter.items():
+            self._headingTrailingCounter[key] += count
+        self._previousNode = other._previousNode
+
+    def process_result(self) -> float:
         """
         Find relative line margin threshold that will be used in pdfminers paragraphs algorithm.
         lines that are vertically closer than margin * height are considered to belong to the same paragraph.
@@ -156,31 +368,55 @@ class LineMarginAnalyer:
         return body_line_margin
 
 
-def count_sizes(element_gen) -> StyleDistribution:
+class StyleAnalyser:
     """
-    analyse used fonts, character sizes, paragraph margins etc.
-    :param element_gen:
-    :return:
+    analyses fonts, character sizes, paragraph margins etc. of an element stream.
+    partial results of consecutive streams (e.g. page ranges) can be merged
+    in reading order.
     """
-    sizeAnalyser = SizeAnalyser()
-    lineMarginAnalyser = LineMarginAnalyer()
 
-    for element in element_gen:
+    def __init__(self) -> None:
+        self.sizeAnalyser = SizeAnalyser()
+        self.lineMarginAnalyser = LineMarginAnalyer()
+
+    def consume(self, element: LTComponent) -> None:
         if isinstance(element, LTTextContainer):
             for node in element:
                 if (
                     not isinstance(node, LTTextLine)
-                    or node.is_empty()
+                    or is_empty_line(node)
                     or len(node._objs) == 0
                 ):
                     continue
 
-                sizeAnalyser.consume(node)
-                lineMarginAnalyser.consume(node)
+                self.sizeAnalyser.consume(node)
+                self.lineMarginAnalyser.consume(node)
 
-    if not sizeAnalyser.sizeDistribution:
-        raise TypeError("document does not contain text")
+    def merge(self, other: "StyleAnalyser", adjacent: bool = True) -> None:
+        """
+        @param adjacent: other consumed the elements directly following this one,
+            see @LineMarginAnalyer.merge
+        """
+        self.sizeAnalyser.merge(other.sizeAnalyser)
+        self.lineMarginAnalyser.merge(other.lineMarginAnalyser, adjacent)
 
-    return StyleDistribution(
-        sizeAnalyser.sizeDistribution, line_margin=lineMarginAnalyser.process_result()
-    )
+    def process_result(self) -> StyleDistribution:
+        if not self.sizeAnalyser.sizeDistribution:
+            raise TypeError("document does not contain text")
+
+        return StyleDistribution(
+            self.sizeAnalyser.sizeDistribution,
+            line_margin=self.lineMarginAnalyser.process_result(),
+        )
+
+
+def count_sizes(element_gen: Iterable[LTComponent]) -> StyleDistribution:
+    """
+    analyse used fonts, character sizes, paragraph margins etc.
+    :param element_gen:
+    :return:
+    """
+    analyser = StyleAnalyser()
+    for element in element_gen:
+        analyser.consume(element)
+    return analyser.process_result()
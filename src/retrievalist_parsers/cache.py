@@ -0,0 +1,149 @@
+import hashlib
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any, BinaryIO, Iterator, Optional, Tuple, cast
+
+import pdfminer
+from pdfminer.layout import LAParams
+from pdfminer.utils import FileOrName, open_filename
+
+# bump if the cached element stream changes, e.g. FileSource.split_boxes_by_style
+CACHE_VERSION = 1
+
+
+def file_digest(pdf_file: FileOrName) -> str:
+    """
+    content digest of a file, read in chunks.
+    @param pdf_file: file path or seekable binary file object,
+        its position is restored afterwards.
+    """
+    digest = hashlib.sha256()
+    with open_filename(pdf_file, "rb") as fp:
+        fp = cast("BinaryIO", fp)  # opened in binary mode
+        position = fp.tell()
+        fp.seek(0)
+        for chunk in iter(lambda: fp.read(1 << 20), b""):
+            digest.update(chunk)
+        fp.seek(position)
+    return digest.hexdigest()
+
+
+def params_key(la_params: LAParams) -> str:
+    return repr(sorted(vars(la_params).items()))
+
+
+class LayoutCache:
+    """
+    Persistent, content addressed cache for the element stream of a Source,
+    one entry per page.
+    - entries are written to a temporary file and moved in place,
+      concurrent writers never expose partial entries.
+    - if the cache grows beyond max_size bytes, least recently used entries are evicted.
+    """
+
+    def __init__(self, directory: str, max_size: int = 1 << 30):
+        """
+        @param directory: cache root, created if missing
+        @param max_size: upper bound of the cache size in bytes
+        """
+        self.directory = Path(directory).expanduser()
+        self.max_size = max_size
+        self._size: Optional[int] = None
+
+    @staticmethod
+    def key(*parts: object) -> str:
+        text = "|".join(map(str, (CACHE_VERSION, pdfminer.__version__, *parts)))
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def page_key(self, digest: str, la_params: LAParams, page_number: int) -> str:
+        """
+        @param digest: content digest of the pdf
+        @param page_number: zero based page index within the pdf
+        """
+        return self.key("page", digest, params_key(la_params), page_number)
+
+    def page_count_key(self, digest: str) -> str:
+        return self.key("page_count", digest)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / key
+
+    def __contains__(self, key: str) -> bool:
+        return self._path(key).is_file()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as fp:
+                value = pickle.load(fp)
+            # mark as recently used
+            os.utime(path)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            # missing, evicted in the meantime or broken entry
+            return default
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fp = tempfile.NamedTemporaryFile(
+            dir=path.parent, prefix=".", suffix=".tmp", delete=False
+        )
+        try:
+            with fp:
+                pickle.dump(value, fp, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(fp.name, path)
+        except BaseException:
+            # e.g. unpicklable value or full disk, no temporary file is left behind
+            os.unlink(fp.name)
+            raise
+
+        if self._size is None:
+            self._size = self.size()
+        else:
+            self._size += os.path.getsize(path)
+        if self._size > self.max_size:
+            self.evict()
+
+    def _entries(self) -> Iterator[Tuple[Path, os.stat_result]]:
+        for path in self.directory.glob("*/*"):
+            if path.name.startswith("."):
+                continue
+            try:
+                yield path, path.stat()
+            except FileNotFoundError:
+                continue
+
+    def size(self) -> int:
+        """
+        current size of all entries in bytes
+        """
+        return sum(stat.st_size for _, stat in self._entries())
+
+    def evict(self, target_ratio: float = 0.8) -> None:
+        """
+        remove least recently used entries,
+        until cache is smaller than target_ratio * max_size.
+        """
+        entries = sorted(self._entries(), key=lambda entry: entry[1].st_mtime)
+        size = sum(stat.st_size for _, stat in entries)
+        for path, stat in entries:
+            if size <= self.max_size * target_ratio:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                # removed by a concurrent writer
+                pass
+            size -= stat.st_size
+        self._size = size
+
+    def clear(self) -> None:
+        for path, _ in self._entries():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        self._size = 0
@@ -0,0 +1,181 @@
+import functools
+import re
+from typing import Callable, Generator, Iterable, List, Optional, Tuple
+
+from retrievalist_parsers.model.document import StructuredPdfDocument
+
+sentence_pattern = re.compile(r"(?<=[.!?])\s+")
+
+
+class Chunk:
+    """
+    Size bounded part of one section: paragraphs of the section,
+    prefixed by the headings of all its ancestors.
+    """
+
+    __slots__ = ("_prefix", "breadcrumb", "content", "length", "path")
+
+    def __init__(
+        self,
+        path: str,
+        breadcrumb: List[str],
+        content: str,
+        length: int,
+        prefix: str = "",
+    ) -> None:
+        """
+        @param path: path id of the section, see @SectionIndex
+        @param breadcrumb: headings from the top level section down to the section
+            itself
+        @param length: length of @text,
+            as measured by the length function of the chunker
+        """
+        self.path = path
+        self.breadcrumb = breadcrumb
+        self.content = content
+        self.length = length
+        self._prefix = prefix
+
+    @property
+    def text(self) -> str:
+        """
+        @return: breadcrumb prefix & content, this is what should be embedded
+        """
+        return self._prefix + self.content
+
+    def __str__(self) -> str:
+        return self.text
+
+
+class SectionChunker:
+    """
+    Streams chunks of a document for retrieval pipelines.
+    - paragraphs (see @Section.top_level_content) are packed into chunks of at most
+      max_length, chunks never span more than one section.
+    - each chunk is prefixed by the heading breadcrumb of its section,
+      e.g. "Data Structures > Array\n".
+    - paragraphs exceeding max_length are split at sentence boundaries,
+      sentences exceeding max_length at words.
+    - lengths are measured once per text and cached,
+      least recently used texts are evicted. re-chunking with another max_length
+      is cheap. lengths of joined texts are summed up, the length function should
+      be (roughly) additive, e.g. len or token counts.
+    """
+
+    def __init__(
+        self,
+        max_length: int = 1000,
+        length_function: Callable[[str], int] = len,
+        paragraph_separator: str = "\n",
+        breadcrumb_separator: str = " > ",
+        cache_size: int = 2**16,
+    ) -> None:
+        """
+        @param max_length: max length of a chunk, including the breadcrumb prefix
+        @param length_function: measures the length of a text,
+            e.g. number of tokens of the embedding model
+        @param cache_size: max amount of texts whose length is cached
+        """
+        self.max_length = max_length
+        self.length_function = length_function
+        self.paragraph_separator = paragraph_separator
+        self.breadcrumb_separator = breadcrumb_separator
+        self._length: Callable[[str], int] = functools.lru_cache(maxsize=cache_size)(
+            length_function
+        )
+
+    def length(self, text: str) -> int:
+        return self._length(text)
+
+    def chunk(
+        self, document: StructuredPdfDocument, max_length: Optional[int] = None
+    ) -> Generator[Chunk, StructuredPdfDocument, None]:
+        """
+        @param max_length: overrides the max length of the chunker
+        @return: yields chunks in document order
+        """
+        max_length = max_length or self.max_length
+        index = document.section_index
+        headings: List[str] = []
+        for position, section in enumerate(index.sections):
+            path = index.paths[position]
+            depth = path.count(".")
+            del headings[depth:]
+            headings.append(section.heading_text)
+
+            if section.children:
+                paragraphs = [child.heading_text for child in section.top_level_content]
+                breadcrumb = [heading for heading in headings if heading]
+            elif depth == 0:
+                # paragraph outside of any section
+                paragraphs = [section.heading_text]
+                breadcrumb = []
+            else:
+                continue
+            yield from self.__pack(path, breadcrumb, paragraphs, max_length)
+
+    def __prefix(
+        self, breadcrumb: List[str], max_length: int
+    ) -> Tuple[List[str], str, int]:
+        # the breadcrumb takes at most half of the chunk, falls back to the own heading
+        for candidate in (breadcrumb, breadcrumb[-1:]):
+            if not candidate:
+                break
+            prefix = (
+                self.breadcrumb_separator.join(candidate) + self.paragraph_separator
+            )
+            length = self.length(prefix)
+            if length <= max_length // 2:
+                return candidate, prefix, length
+        return [], "", 0
+
+    def __pack(
+        self, path: str, breadcrumb: List[str], paragraphs: List[str], max_length: int
+    ) -> Generator[Chunk, None, None]:
+        breadcrumb, prefix, prefix_length = self.__prefix(breadcrumb, max_length)
+        budget = max_length - prefix_length
+
+        pieces: List[Tuple[str, int]] = []
+        for paragraph in paragraphs:
+            if paragraph:
+                pieces.extend(self.__split(paragraph, budget))
+        for content, length in self.__merge(pieces, self.paragraph_separator, budget):
+            yield Chunk(path, breadcrumb, content, prefix_length + length, prefix)
+
+    def __split(self, paragraph: str, budget: int) -> List[Tuple[str, int]]:
+        length = self.length(paragraph)
+        if length <= budget:
+            return [(paragraph, length)]
+
+        sentences: List[Tuple[str, int]] = []
+        for sentence in sentence_pattern.split(paragraph):
+            length = self.length(sentence)
+            if length <= budget:
+                sentences.append((sentence, length))
+                continue
+            # single words exceeding the budget end up in a chunk on their own
+            words = [(word, self.length_function(word)) for word in sentence.split()]
+            sentences.extend(self.__merge(words, " ", budget))
+        return self.__merge(sentences, " ", budget)
+
+    def __merge(
+        self, pieces: Iterable[Tuple[str, int]], separator: str, budget: int
+    ) -> List[Tuple[str, int]]:
+        """
+        greedily joins consecutive pieces as long as they fit into the budget.
+        """
+        separator_length = self.length(separator)
+        merged: List[Tuple[str, int]] = []
+        current: List[str] = []
+        current_length = 0
+        for piece, length in pieces:
+            if current and current_length + separator_length + length > budget:
+                merged.append((separator.join(current), current_length))
+                current, current_length = [], 0
+            if current:
+                current_length += separator_length
+            current.append(piece)
+            current_length += length
+        if current:
+            merged.append((separator.join(current), current_length))
+        return merged
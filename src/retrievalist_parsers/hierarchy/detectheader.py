@@ -1,18 +1,31 @@
-from collections import Counter
-
-from pdfminer.layout import LTTextBoxVertical
+import array
+import itertools
+from types import ModuleType
+from typing import Generator, Iterable, List, Optional, Sequence, Tuple, cast
 
 from retrievalist_parsers import utils
 from retrievalist_parsers.analysis.styledistribution import StyleDistribution
+from retrievalist_parsers.hierarchy.headercompare import numeration_pattern
 from retrievalist_parsers.model.document import TextElement
 from retrievalist_parsers.model.style import TextSize
 
+np: Optional[ModuleType]
+try:
+    import numpy as np
+except ImportError:  # optional, rows are classified one by one instead
+    np = None
+
+# conditions of @header_detector: headers are longer than MIN_LENGTH characters
+# and contain at least MIN_LETTERS letters
+MIN_LENGTH = 2
+MIN_LETTERS = 2
+
 
 def header_detector(element: TextElement, style_distribution: StyleDistribution):
-    if isinstance(element._data, LTTextBoxVertical):
+    if element.is_vertical:
         return False
-    stats = Counter()
-    terms = element._data
+    # letters of the text are the ones of the characters, see @BoxStats
+    terms = element.text
     style = element.style
 
     if len(element.text) <= 2:
@@ -34,12 +47,15 @@ def header_detector(element: TextElement, style_distribution: StyleDistribution)
 def check_valid_header_tokens(element):
     """
     fr a paragraph to be treated as a header, it has to contain at least 2 letters.
-    @param element:
+    @param element: LTTextContainer or its text
     @return:
     """
     alpha_count = 0
     numeric_count = 0
-    for word in utils.generate_words(element):
+    words = (
+        element.split() if isinstance(element, str) else utils.generate_words(element)
+    )
+    for word in words:
         for c in word:
             if c.isalpha():
                 alpha_count += 1
@@ -49,3 +65,213 @@ def check_valid_header_tokens(element):
             if alpha_count >= 2:
                 return True
     return False
+
+
+class HeaderFeatures:
+    """
+    Features of a batch of elements, one column per feature & one row per element.
+    - style columns & text length are extracted in one pass over the elements,
+      texts are cached by the elements.
+    - letter & digit counts and leading words are text scans,
+      they are computed on first access.
+    - @classify applies the rules of @header_detector to all rows at once,
+      letters are only counted for rows, that pass the style conditions.
+    """
+
+    __slots__ = (
+        "_counts",
+        "_elements",
+        "_first_token",
+        "body_size",
+        "bold",
+        "italic",
+        "length",
+        "mapped_font_size",
+        "max_size",
+        "vertical",
+    )
+
+    def __init__(self, elements: Sequence[TextElement], body_size: float) -> None:
+        """
+        @param body_size: most common font size of the document,
+            see @StyleDistribution.body_size
+        """
+        self.body_size = body_size
+        self._elements = elements
+        self._counts: Optional[List[Tuple[int, int]]] = None
+        self._first_token: Optional[List[str]] = None
+        rows = [self.__row(element) for element in elements]
+        columns = list(zip(*rows, strict=True)) if rows else [()] * 6
+        if np is not None:
+            int_columns = [np.array(column, dtype=np.int64) for column in columns[:4]]
+            max_size = np.array(columns[4], dtype=np.float64)
+            vertical = np.array(columns[5], dtype=bool)
+        else:
+            int_columns = [array.array("q", column) for column in columns[:4]]
+            max_size = array.array("d", columns[4])
+            vertical = list(columns[5])
+        self.length, self.bold, self.italic, self.mapped_font_size = int_columns
+        self.max_size = max_size
+        self.vertical = vertical
+
+    @staticmethod
+    def __row(element: TextElement) -> Tuple[int, int, int, int, float, bool]:
+        if element.is_vertical:
+            return 0, 0, 0, 0, 0.0, True
+        style = element.style
+        return (
+            len(element.text or ""),
+            bool(style.bold),
+            bool(style.italic),
+            int(style.mapped_font_size),
+            style.max_size,
+            False,
+        )
+
+    def __len__(self) -> int:
+        return len(self._elements)
+
+    @staticmethod
+    def __count(element: TextElement) -> Tuple[int, int]:
+        if element.is_vertical:
+            return 0, 0
+        # letters & digits of the text are the ones of its characters,
+        # spaces are neither
+        text = element.text or ""
+        return sum(map(str.isalpha, text)), sum(map(str.isnumeric, text))
+
+    @property
+    def alpha_count(self) -> List[int]:
+        if self._counts is None:
+            self._counts = [self.__count(element) for element in self._elements]
+        return [alpha_count for alpha_count, _ in self._counts]
+
+    @property
+    def numeric_count(self) -> List[int]:
+        if self._counts is None:
+            self._counts = [self.__count(element) for element in self._elements]
+        return [numeric_count for _, numeric_count in self._counts]
+
+    @property
+    def first_token(self) -> List[str]:
+        """
+        leading word of each element, words are split on space characters of the pdf.
+        """
+        if self._first_token is None:
+            self._first_token = [
+                "" if element.is_vertical else element.first_token
+                for element in self._elements
+            ]
+        return self._first_token
+
+    @property
+    def enumerated(self) -> List[bool]:
+        """
+        @return: per row, True if the element starts with an enumeration
+            like "1.2" or "3:"
+        """
+        return [bool(numeration_pattern.match(token)) for token in self.first_token]
+
+    @property
+    def size_delta(self) -> Sequence[float]:
+        """
+        @return: max size of each element minus the body size of the document
+        """
+        if np is not None:
+            return cast("Sequence[float]", self.max_size - self.body_size)
+        return [max_size - self.body_size for max_size in self.max_size]
+
+    def classify(self) -> List[bool]:
+        """
+        @return: per row, True if the element is a header,
+            decisions equal @header_detector
+        """
+        candidates = self.__style_candidates()
+        if self._counts is not None:
+            alpha_count = self.alpha_count
+            return [
+                candidate and alpha_count[row] >= MIN_LETTERS
+                for row, candidate in enumerate(candidates)
+            ]
+        # check_valid_header_tokens stops at the second letter as well
+        return [
+            candidate and has_letters(self._elements[row].text)
+            for row, candidate in enumerate(candidates)
+        ]
+
+    def __style_candidates(self) -> List[bool]:
+        # max_size is compared to body_size + 2 as in @header_detector, equal rounding
+        size_threshold = self.body_size + 2
+        middle = int(TextSize.middle)
+        if np is not None:
+            styled = (self.bold | self.italic).astype(bool)
+            candidates = (
+                ~self.vertical
+                & (self.length > MIN_LENGTH)
+                & (
+                    styled & (self.mapped_font_size >= middle)
+                    | (self.mapped_font_size > middle)
+                    | (self.max_size > size_threshold)
+                )
+            )
+            return cast("List[bool]", candidates.tolist())
+
+        rows = zip(
+            self.vertical,
+            self.length,
+            self.bold,
+            self.italic,
+            self.mapped_font_size,
+            self.max_size,
+            strict=True,
+        )
+        return [
+            not vertical
+            and length > MIN_LENGTH
+            and (
+                ((bold or italic) and mapped_font_size >= middle)
+                or mapped_font_size > middle
+                or max_size > size_threshold
+            )
+            for vertical, length, bold, italic, mapped_font_size, max_size in rows
+        ]
+
+
+def has_letters(text: str, minimum: int = MIN_LETTERS) -> bool:
+    """
+    @return: True if the text contains at least the minimum amount of letters
+    """
+    count = 0
+    for character in text:
+        if character.isalpha():
+            count += 1
+            if count >= minimum:
+                return True
+    return False
+
+
+def detect_headers(
+    elements: Sequence[TextElement], style_distribution: StyleDistribution
+) -> List[bool]:
+    """
+    batched @header_detector
+    @return: per element, True if the element is a header
+    """
+    return HeaderFeatures(elements, style_distribution.body_size).classify()
+
+
+def classify_headers(
+    elements: Iterable[TextElement],
+    style_distribution: StyleDistribution,
+    batch_size: int = 256,
+) -> Generator[Tuple[TextElement, bool], None, None]:
+    """
+    classifies a stream of elements in batches, see @detect_headers.
+    @return: yields (element, is header) in order of the given elements
+    """
+    elements = iter(elements)
+    while True:
+        batch = list(itertools.islice(elements, batch_size))
+        if not batch:
+            return
+        yield from zip(batch, detect_headers(batch, style_distribution), strict=True)
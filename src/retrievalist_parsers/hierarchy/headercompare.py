@@ -1,38 +1,218 @@
+import math
 import re
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from retrievalist_parsers import utils
 from retrievalist_parsers.model.document import Section
+from retrievalist_parsers.model.style import TextSize
 
 numeration_pattern = re.compile("^(?=.*\\d+)((?=.*\\.)|(?=.*:)).*$")
+numbering_pattern = re.compile(r"^\d+(?:\.\d+)*")
 white_space_pattern = re.compile("\\s+")
 
+# (h1, h2) -> True if h2 is a sub-header of h1
+SubHeaderCondition = Callable[[Section, Section], bool]
+
+
+class HeadingSignature:
+    """
+    Properties of a heading, that are compared by the sub-header conditions.
+    - computed once per section, see @signature.
+    - numbering: leading numbers of the first token, e.g. "1.2.3" -> (1, 2, 3),
+      empty if not numbered.
+    """
+
+    __slots__ = (
+        "bold",
+        "enumerated",
+        "first_token",
+        "mapped_font_size",
+        "max_size",
+        "numbering",
+    )
+
+    def __init__(
+        self, first_token: str, bold: bool, mapped_font_size: TextSize, max_size: float
+    ) -> None:
+        self.first_token = first_token
+        numbering = numbering_pattern.match(first_token)
+        self.numbering = (
+            tuple(map(int, numbering.group().split("."))) if numbering else ()
+        )
+        self.enumerated = numeration_pattern.match(first_token) is not None
+        self.bold = bold
+        self.mapped_font_size = mapped_font_size
+        self.max_size = max_size
+
+    @classmethod
+    def from_section(cls, section: Section) -> "HeadingSignature":
+        heading = section.heading
+        # only header sections are compared
+        assert heading is not None
+        style = heading.style
+        return cls(
+            heading.first_token, style.bold, style.mapped_font_size, style.max_size
+        )
+
+
+def signature(section: Section) -> HeadingSignature:
+    """
+    @return: signature of the heading of the section, cached by the section
+    """
+    if section._signature is None:
+        section._signature = HeadingSignature.from_section(section)
+    return section._signature
+
+
+class ConditionStats:
+    """
+    Measurements of one sub-header condition, see @SubHeaderPredicate.stats.
+    """
+
+    __slots__ = ("calls", "hits", "name", "seconds")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.calls = 0
+        self.hits = 0
+        self.seconds = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.calls if self.calls else 0.0
+
+    @property
+    def cost_per_hit(self) -> float:
+        """
+        @return: seconds spent per hit, inf if the condition never applied
+        """
+        return self.seconds / self.hits if self.hits else math.inf
+
+    def __repr__(self) -> str:
+        return "{}(calls={}, hits={}, seconds={:.6f})".format(
+            self.name, self.calls, self.hits, self.seconds
+        )
+
 
 class SubHeaderPredicate:
     """
     Compares two paragraphs that are classified as headers, but have the same mapped FontSize.
-    - Its possible that those headers are actually not on the same level, based on some conditions like H1 is enumerated & bold, H2 not.
+    - Its possible that those headers are actually not on the same level,
+      based on some conditions like H1 is enumerated & bold, H2 not.
+    - h2 is a sub-header if any condition applies. conditions are expected to be
+      free of side effects, their order does not change the result & they are
+      reordered by measured cost per hit (see @reorder).
+    - calls, hits & time are recorded per condition, see @stats.
+    - a predicate can be shared by threads (see @HierarchyParser.parse_pdf_async):
+      the conditions are replaced, never changed in place, each test evaluates the
+      conditions it started with. stats are updated under a lock.
+    - there is no cache of compared pairs: within a parse each pair includes the
+      new header (see @HierarchyParser.__pop_stack_until_match), no pair repeats.
     """
 
-    def __init__(self):
-        self._conditions = []
+    def __init__(self, reorder_interval: Optional[int] = None) -> None:
+        """
+        @param reorder_interval: reorder conditions after every n tests,
+            None keeps the order they were added in
+        """
+        # (condition, stats) in order of evaluation
+        self._conditions: List[Tuple[SubHeaderCondition, ConditionStats]] = []
+        self.reorder_interval = reorder_interval
+        self.tests = 0
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # the lock stays within the process
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
 
-    def add_condition(self, condition):
-        self._conditions.append(condition)
+    def add_condition(self, condition: SubHeaderCondition) -> None:
+        name = getattr(condition, "__name__", repr(condition))
+        with self._lock:
+            self._conditions = [*self._conditions, (condition, ConditionStats(name))]
 
-    def test(self, h1, h2):
-        return any(condition(h1, h2) for condition in self._conditions)
+    @property
+    def conditions(self) -> List[SubHeaderCondition]:
+        return [condition for condition, _ in self._conditions]
 
+    @property
+    def stats(self) -> List[ConditionStats]:
+        """
+        @return: stats per condition in order of evaluation,
+            accumulated over all parsed documents
+        """
+        return [stats for _, stats in self._conditions]
 
-def get_default_sub_header_conditions():
-    _isSubHeader = SubHeaderPredicate()
-    _isSubHeader.add_condition(condition_boldness)
-    _isSubHeader.add_condition(condition_h1_enum_h2_not)
-    _isSubHeader.add_condition(condition_h2_extends_h1)
-    _isSubHeader.add_condition(condition_h1_slightly_bigger_h2)
-    return _isSubHeader
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.tests = 0
+            self._conditions = [
+                (condition, ConditionStats(stats.name))
+                for condition, stats in self._conditions
+            ]
 
+    def reorder(self) -> None:
+        """
+        evaluates cheap conditions, that often apply, first.
+        conditions without hits are evaluated last.
+        """
+        with self._lock:
+            self.__reorder()
 
-def condition_boldness(h1: Section, h2: Section):
+    def __reorder(self) -> None:
+        # sorted copy, tests running concurrently keep their list
+        self._conditions = sorted(
+            self._conditions,
+            key=lambda item: (
+                item[1].cost_per_hit,
+                item[1].seconds / item[1].calls if item[1].calls else 0.0,
+            ),
+        )
+
+    def test(self, h1: Section, h2: Section) -> bool:
+        """
+        @return: True if h2 is a sub-header of h1
+        """
+        result = False
+        # (stats, seconds) per evaluated condition
+        measured: List[Tuple[ConditionStats, float]] = []
+        conditions = self._conditions
+        for condition, stats in conditions:
+            start = time.perf_counter()
+            applies = condition(h1, h2)
+            measured.append((stats, time.perf_counter() - start))
+            if applies:
+                result = True
+                break
+
+        with self._lock:
+            self.tests += 1
+            for stats, seconds in measured:
+                stats.seconds += seconds
+                stats.calls += 1
+            if result:
+                measured[-1][0].hits += 1
+            if self.reorder_interval and self.tests % self.reorder_interval == 0:
+                self.__reorder()
+        return result
+
+
+def get_default_sub_header_conditions() -> SubHeaderPredicate:
+    is_sub_header = SubHeaderPredicate(reorder_interval=256)
+    is_sub_header.add_condition(condition_boldness)
+    is_sub_header.add_condition(condition_h1_enum_h2_not)
+    is_sub_header.add_condition(condition_h2_extends_h1)
+    is_sub_header.add_condition(condition_h1_slightly_bigger_h2)
+    return is_sub_header
+
+
+def condition_boldness(h1: Section, h2: Section) -> bool:
     """
     h2 is subheader if:if h1 is bold
     - h1 is bold & h2 is not bold
@@ -41,45 +221,49 @@ def condition_boldness(h1: Section, h2: Section):
     @param h2:
     @return:
     """
-    h1start = next(utils.generate_words(h1.heading._data))
-    h2start = next(utils.generate_words(h2.heading._data))
-    if numeration_pattern.match(h2start) and not numeration_pattern.match(h1start):
+    first, second = signature(h1), signature(h2)
+    if second.enumerated and not first.enumerated:
         return False
 
-    return h1.heading.style.bold and not h2.heading.style.bold
+    return first.bold and not second.bold
 
 
-def condition_h2_extends_h1(h1: Section, h2: Section):
+def condition_h2_extends_h1(h1: Section, h2: Section) -> bool:
     """
     e.g.:   h1  ->  1.1 some header
             h2  ->  1.1.2   some sub header
+    numberings are compared number by number,
+    "1.1" is extended by "1.1.2" but not by "1.10" or "11.1".
     @param h1:
     @param h2:
     @return:
     """
-    h1start = next(utils.generate_words(h1.heading._data))
-    h2start = next(utils.generate_words(h2.heading._data))
-    return len(h2start) > len(h1start) and h1start in h2start
+    h1_numbering = signature(h1).numbering
+    h2_numbering = signature(h2).numbering
+    return (
+        len(h1_numbering) > 0
+        and len(h2_numbering) > len(h1_numbering)
+        and h2_numbering[: len(h1_numbering)] == h1_numbering
+    )
 
 
-def condition_h1_enum_h2_not(h1: Section, h2: Section):
+def condition_h1_enum_h2_not(h1: Section, h2: Section) -> bool:
     """
     e.g.    h1  -> 1.1 some header title
             h2  -> some other header title
     -> applies only if both headers are of same style type
 
     """
-    if h2.heading.style.bold and not h1.heading.style.bold:
+    first, second = signature(h1), signature(h2)
+    if second.bold and not first.bold:
         return False
     # if h2.heading.style.font_name != h1.heading.style.font_name:
     #    return False
 
-    h1start = next(utils.generate_words(h1.heading._data))
-    h2start = next(utils.generate_words(h2.heading._data))
-    return numeration_pattern.match(h1start) and not numeration_pattern.match(h2start)
+    return first.enumerated and not second.enumerated
 
 
-def condition_h1_slightly_bigger_h2(h1: Section, h2: Section):
+def condition_h1_slightly_bigger_h2(h1: Section, h2: Section) -> bool:
     """s
     Style analysis maps found sizes to a predefined enum (xsmall, small, large, xlarge).
     but sometimes it makes sense to look deeper.
@@ -87,7 +271,8 @@ def condition_h1_slightly_bigger_h2(h1: Section, h2: Section):
     @param h2:
     @return:
     """
+    first, second = signature(h1), signature(h2)
     return (
-        h1.heading.style.mapped_font_size == h2.heading.style.mapped_font_size
-        and h1.heading.style.max_size - h2.heading.style.max_size > 1.0
+        first.mapped_font_size == second.mapped_font_size
+        and first.max_size - second.max_size > 1.0
     )
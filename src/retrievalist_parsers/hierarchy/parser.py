@@ -1,16 +1,50 @@
+import asyncio
+import contextlib
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    wait,
+)
+from concurrent.futures.process import BrokenProcessPool
+from os import PathLike
 from pathlib import Path
-from typing import Generator, List
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Self,
+    Tuple,
+)
 
 from pdfminer.layout import LAParams, LTTextContainer
 
 from retrievalist_parsers.analysis.annotate import StyleAnnotator
-from retrievalist_parsers.analysis.sizemapper import PivotLogMapper
+from retrievalist_parsers.analysis.profiles import (
+    StyleProfileStore,
+    first_page,
+    font_fingerprint,
+    line_margin,
+)
+from retrievalist_parsers.analysis.sizemapper import PivotLogMapper, SizeMapper
 from retrievalist_parsers.analysis.styledistribution import (
+    StyleAnalyser,
     StyleDistribution,
-    count_sizes,
 )
-from retrievalist_parsers.hierarchy.detectheader import header_detector
+from retrievalist_parsers.hierarchy.detectheader import classify_headers
 from retrievalist_parsers.hierarchy.headercompare import (
+    ConditionStats,
+    SubHeaderPredicate,
     get_default_sub_header_conditions,
 )
 from retrievalist_parsers.model.document import (
@@ -19,51 +53,342 @@ from retrievalist_parsers.model.document import (
     StructuredPdfDocument,
     TextElement,
 )
-from retrievalist_parsers.source import Source
+from retrievalist_parsers.model.index import SectionIndex
+from retrievalist_parsers.model.style import TextSize
+from retrievalist_parsers.source import BufferSource, CancellableSource, Source
 
 
 class HierarchyParser:
-    def __init__(self, sub_header_conditions=get_default_sub_header_conditions()):
-        self._isSubHeader = sub_header_conditions
+    def __init__(
+        self,
+        sub_header_conditions: Optional[SubHeaderPredicate] = None,
+        executor: Optional[Executor] = None,
+        max_concurrency: Optional[int] = None,
+        compact: bool = False,
+        profiles: Optional[StyleProfileStore] = None,
+    ) -> None:
+        """
+        @param sub_header_conditions: see @SubHeaderPredicate,
+            defaults to @get_default_sub_header_conditions
+        @param executor: thread or process pool used by @parse_pdf_async,
+            defaults to the event loops default executor
+        @param max_concurrency: limits documents parsed at the same time
+            by @parse_pdf_async
+        @param compact: documents keep compact elements only (see @TextElement.compact)
+        @param profiles: style profiles of the corpus, @parse_pdf skips the style
+            analysis of documents with a matching profile. profiles observed by worker
+            processes (see @parse_many) stay within the worker.
+        """
+        self._isSubHeader = (
+            sub_header_conditions
+            if sub_header_conditions is not None
+            else get_default_sub_header_conditions()
+        )
+        self.executor = executor
+        self.max_concurrency = max_concurrency
+        self.compact = compact
+        self.profiles = profiles
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._manager: Optional["multiprocessing.managers.SyncManager"] = None
 
-    def parse_pdf(self, source: Source) -> StructuredPdfDocument:
+    def close(self) -> None:
+        """
+        shuts down the multiprocessing manager started by @parse_pdf_async
+        for process executors. the executor is owned by the caller and stays open,
+        the parser stays usable.
+        """
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type: object, exc_val: object, exc_tb: object) -> None:
+        self.close()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # executor & synchronisation primitives stay within the parent process
+        state = self.__dict__.copy()
+        state.update(executor=None, _semaphore=None, _manager=None)
+        return state
+
+    @property
+    def sub_header_stats(self) -> List[ConditionStats]:
+        """
+        calls, hits & time per sub-header condition,
+        accumulated over all documents parsed by this parser.
+        documents parsed by worker processes (see @parse_many) are not included.
+        """
+        return self._isSubHeader.stats
+
+    def parse_pdf(
+        self,
+        source: Source,
+        distribution: Optional[StyleDistribution] = None,
+        size_mapper: Optional[SizeMapper] = None,
+    ) -> StructuredPdfDocument:
         """
         Analysises and parses a PDF document from a given @Source containing its natural hierarchy.
+        - with style profiles (see @StyleProfileStore), the profile matching the
+          fonts of the first page replaces the style analysis. the profile is
+          validated against the sizes of the read elements and the line margin of the
+          first page, if it does not match, the document is parsed again.
         @param source:
-        @return:
+        @param distribution: known style distribution, e.g. of a previous version of
+            the document or a sibling chapter. the style analysis is skipped,
+            the source is read exactly once. style profiles are not used.
+        @param size_mapper: maps character sizes to @TextSize,
+            defaults to @PivotLogMapper of the style distribution
+        @return: parsed document, state kept by the source between reads
+            (e.g. recorded layouts) is released
         """
-        # 1. iterate once through PDF and analyse style distribution
-        distribution = count_sizes(source.read())
-        size_mapper = PivotLogMapper(distribution)
-        style_annotator = StyleAnnotator(
-            sizemapper=size_mapper, style_info=distribution
+        fingerprint: Optional[str] = None
+        profile: Optional[StyleDistribution] = None
+        profiles = self.profiles
+        if profiles is not None and distribution is None:
+            page = self.__first_page(source)
+            fingerprint = font_fingerprint(page)
+            if fingerprint is not None:
+                profile = profiles.lookup(fingerprint)
+
+        if distribution is not None:
+            pdf_document = self.__parse(source, distribution, size_mapper=size_mapper)
+        elif profiles is None or fingerprint is None or profile is None:
+            pdf_document = self.__parse(source, size_mapper=size_mapper)
+            if profiles is not None and fingerprint is not None:
+                profiles.observe(fingerprint, pdf_document.style_distribution)
+        else:
+            analyser = StyleAnalyser()
+            pdf_document = self.__parse(source, profile, analyser, size_mapper)
+            # elements were read with the margin of the profile,
+            # the margin is measured on the first page read with the default params
+            margin = line_margin(page)
+            observed = StyleDistribution(
+                analyser.process_result().data,
+                line_margin=profile.line_margin if margin is None else margin,
+            )
+            if profiles.is_valid(profile, observed):
+                profiles.observe(fingerprint, observed)
+            else:
+                # the document does not fit its profile (anymore),
+                # layouts recorded by the source are replayed
+                pdf_document = self.__parse(source, size_mapper=size_mapper)
+                profiles.replace(fingerprint, pdf_document.style_distribution)
+
+        enrich_metadata(pdf_document, source)
+        # recorded layouts are only replayed within one parse
+        source.release()
+        return pdf_document
+
+    def __parse(
+        self,
+        source: Source,
+        distribution: Optional[StyleDistribution] = None,
+        analyser: Optional[StyleAnalyser] = None,
+        size_mapper: Optional[SizeMapper] = None,
+    ) -> StructuredPdfDocument:
+        distribution, elements = self.__read(source, distribution, analyser)
+
+        # - annotate & create nested document structure on the fly,
+        #   closed sections are indexed
+        section_index = SectionIndex()
+        structured_elements = self.create_hierarchy(
+            elements,
+            distribution,
+            section_index,
+            size_mapper=size_mapper or PivotLogMapper(distribution),
+        )
+
+        # 3. create wrapped document and capture some metadata
+        return StructuredPdfDocument(
+            elements=structured_elements,
+            style_info=distribution,
+            section_index=section_index,
         )
 
-        # 2. iterate second time trough pdf
-        # - annotate each paragraph with mapped Style
-        elements_with_style = style_annotator.process(
-            source.read(
-                override_la_params=LAParams(line_margin=distribution.line_margin)
+    @staticmethod
+    def __first_page(source: Source) -> List[LTTextContainer[Any]]:
+        """
+        @return: elements of the first page, read with the default layout params
+        """
+        elements = source.read()
+        try:
+            return list(first_page(elements))
+        finally:
+            elements.close()
+
+    def parse_pdf_stream(
+        self,
+        source: Source,
+        section_index: Optional[SectionIndex] = None,
+        distribution: Optional[StyleDistribution] = None,
+        size_mapper: Optional[SizeMapper] = None,
+    ) -> Generator[Section, StructuredPdfDocument, None]:
+        """
+        Same as @parse_pdf, but top level sections are yielded as soon as they are
+        complete, see @iter_hierarchy.
+        state kept by the source between reads (e.g. recorded layouts) is released
+        once the stream ends or is closed.
+        @param source:
+        @param section_index: optional index, yielded sections are added to
+        @param distribution: known style distribution,
+            the source is read exactly once, see @parse_pdf
+        @param size_mapper: see @parse_pdf
+        @return: top level sections (including DanglingTextSections) in document order
+        """
+        distribution, elements = self.__read(source, distribution)
+        try:
+            yield from self.iter_hierarchy(
+                elements,
+                distribution,
+                section_index,
+                size_mapper=size_mapper or PivotLogMapper(distribution),
             )
+        finally:
+            # the stream is read once, nothing is replayed afterwards
+            source.release()
+
+    @staticmethod
+    def __read(
+        source: Source,
+        distribution: Optional[StyleDistribution] = None,
+        analyser: Optional[StyleAnalyser] = None,
+    ) -> Tuple[StyleDistribution, Generator[LTTextContainer[Any], None, None]]:
+        """
+        @param distribution: known style distribution, skips the style analysis
+        @param analyser: analyses the read elements on the fly,
+            e.g. to validate the given distribution
+        @return: style distribution & paragraphs read with its line margin
+        """
+        # 1. iterate once through PDF and analyse style distribution
+        if distribution is None:
+            distribution = source.count_sizes()
+
+        # 2. iterate second time trough pdf,
+        # sources like FileSource replay the recorded line layout
+        elements = source.read(
+            override_la_params=LAParams(line_margin=distribution.line_margin)
         )
+        if analyser is not None:
+            elements = _analysed(elements, analyser)
+        return distribution, elements
 
-        # - create nested document structure on the fly
-        structured_elements = self.create_hierarchy(elements_with_style, distribution)
+    async def parse_pdf_async(self, source: Source) -> StructuredPdfDocument:
+        """
+        @parse_pdf, running in the configured executor.
+        cancelling the awaiting task stops reading the source at the next page,
+        see @CancellableSource.
+        - thread executors parse the given source in place.
+        - process executors parse a pickled copy of the source within the worker,
+          cancellation uses a multiprocessing manager that runs until @close.
+        @param source:
+        @return:
+        """
+        if self.max_concurrency and self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
 
-        # 3. create wrapped document and capture some metadata
-        pdf_document = StructuredPdfDocument(
-            elements=structured_elements, style_info=distribution
+        async with self._semaphore or contextlib.nullcontext():
+            loop = asyncio.get_running_loop()
+            if isinstance(self.executor, ProcessPoolExecutor):
+                if self._manager is None:
+                    self._manager = multiprocessing.Manager()
+                cancel_event = self._manager.Event()
+            else:
+                cancel_event = threading.Event()
+
+            try:
+                return await loop.run_in_executor(
+                    self.executor,
+                    _parse_pdf,
+                    self,
+                    CancellableSource(source, cancel_event),
+                )
+            except asyncio.CancelledError:
+                cancel_event.set()
+                raise
+
+    def parse_many(  # ruff: ignore[too-many-arguments]
+        self,
+        sources: Iterable[Source],
+        *,
+        workers: Optional[int] = None,
+        ordered: bool = False,
+        max_tasks_per_child: Optional[int] = None,
+        chunk_size: int = 8,
+        small_file_size: int = 1 << 20,
+    ) -> Generator[Tuple[Source, StructuredPdfDocument | Exception], None, None]:
+        """
+        Parses many documents in a pool of processes.
+        @param sources: picklable sources, consumed lazily
+        @param workers: amount of processes, defaults to cpu count
+        @param ordered: yield results in order of the given sources,
+            otherwise as soon as they are parsed
+        @param max_tasks_per_child: replace worker processes after that many tasks
+            (chunks), e.g. to free memory
+        @param chunk_size: max amount of small documents sent to a worker at once
+        @param small_file_size: documents up to that size (bytes) are dispatched
+            in chunks
+        @return: yields (source, parsed document or raised exception).
+            sources, that crash their worker process, yield a BrokenProcessPool error,
+            the pool is restarted.
+        """
+        pool = _ChunkPool(
+            self,
+            _chunk_sources(enumerate(sources), chunk_size, small_file_size),
+            workers or os.cpu_count() or 1,
+            max_tasks_per_child,
         )
-        enrich_metadata(pdf_document, source)
-        return pdf_document
+        # reorder buffer, index -> result
+        done: Dict[int, Tuple[Source, StructuredPdfDocument | Exception]] = {}
+        next_index = 0
+        try:
+            while pool.fill():
+                for (index, source), result in pool.completed():
+                    if ordered:
+                        done[index] = (source, result)
+                    else:
+                        yield source, result
+
+                while next_index in done:
+                    yield done.pop(next_index)
+                    next_index += 1
+        finally:
+            # stop queued chunks if the consumer stops early
+            pool.shutdown()
 
     def create_hierarchy(
         self,
-        element_gen: Generator[TextElement, LTTextContainer, None],
+        element_gen: Iterable[Any],
         style_distribution: StyleDistribution,
+        section_index: Optional[SectionIndex] = None,
+        size_mapper: Optional[SizeMapper] = None,
     ) -> List[Section]:
         """
         Takes incoming flat list of paragraphs and creates nested natural order hierarchy.
+        see @iter_hierarchy
+        """
+        return list(
+            self.iter_hierarchy(
+                element_gen, style_distribution, section_index, size_mapper=size_mapper
+            )
+        )
+
+    def iter_hierarchy(
+        self,
+        element_gen: Iterable[Any],
+        style_distribution: StyleDistribution,
+        section_index: Optional[SectionIndex] = None,
+        batch_size: int = 256,
+        size_mapper: Optional[SizeMapper] = None,
+    ) -> Generator[Section, None, None]:
+        """
+        Takes incoming flat list of paragraphs and yields the nested natural order
+        hierarchy.
+        - a top level section is yielded once the next top level section
+          (or dangling text) starts, only the currently open branch is kept in memory.
+        - headers are detected in batches (see @classify_headers),
+          up to batch_size paragraphs are read ahead.
 
         Example Structure:
         ==================
@@ -81,27 +406,47 @@ class HierarchyParser:
             content
         >>
 
-        @param element_gen:
-        @return:
+        @param element_gen: paragraphs annotated with their style (see @StyleAnnotator)
+            or, if a size mapper is given, raw paragraphs of a source read with the line
+            margin of the style distribution, annotated on the fly.
+            e.g. if the style distribution is known, the source is read once:
+            create_hierarchy(
+                source.read(
+                    override_la_params=LAParams(line_margin=distribution.line_margin)
+                ),
+                distribution,
+                size_mapper=PivotLogMapper(distribution),
+            )
+        @param section_index: optional index, closed top level sections are added to
+        @param batch_size: amount of paragraphs classified at once
+        @param size_mapper: maps character sizes of raw paragraphs to @TextSize
+        @return: top level sections in document order
         """
-        structured = []
-        level_stack = []
+        if size_mapper is not None:
+            element_gen = StyleAnnotator(
+                sizemapper=size_mapper,
+                style_info=style_distribution,
+                compact=self.compact,
+            ).process(element_gen)
+
+        # holds the open top level section, sections before are complete
+        structured: List[Section] = []
+        level_stack: List[Section] = []
 
-        for element in element_gen:
+        for element, is_header in classify_headers(
+            element_gen, style_distribution, batch_size
+        ):
             # if line is header
             style = element.style
-            if header_detector(element, style_distribution):
+            if is_header:
                 child = Section(element)
                 header_size = style.mapped_font_size
 
-                # initial state - push and continue with next element
                 if not level_stack:
+                    # initial state - push and continue with next element
                     self.__push_to_stack(child, level_stack, structured)
-                    continue
 
-                stack_peek_size = level_stack[-1].heading.style.mapped_font_size
-
-                if stack_peek_size > header_size:
+                elif _header_size(level_stack[-1]) > header_size:
                     # append element as children
                     self.__push_to_stack(child, level_stack, structured)
 
@@ -111,25 +456,23 @@ class HierarchyParser:
                     self.__push_to_stack(child, level_stack, structured)
 
             else:
-                # no header found, add paragraph as a content element to previous node
-                # - content is on same level as its corresponding header
-                content_node = Section(element, level=len(level_stack))
-                if level_stack:
-                    level_stack[-1].append_children(content_node)
-                else:
-                    # if last element in output structure has also no header, merge
-                    if structured and isinstance(structured[-1], DanglingTextSection):
-                        structured[-1].append_children(content_node)
-                    else:
-                        # # add dangling content as section
-                        dangling_content = DanglingTextSection()
-                        dangling_content.append_children(content_node)
-                        dangling_content.set_level(len(level_stack))
-                        structured.append(dangling_content)
+                self.__append_content(element, level_stack, structured)
+
+            while len(structured) > 1:
+                yield self.__close(structured.pop(0), section_index)
 
-        return structured
+        for section in structured:
+            yield self.__close(section, section_index)
 
-    def __pop_stack_until_match(self, stack, headerSize, header):
+    @staticmethod
+    def __close(section: Section, section_index: Optional[SectionIndex]) -> Section:
+        if section_index is not None:
+            section_index.add(section)
+        return section
+
+    def __pop_stack_until_match(
+        self, stack: List[Section], headerSize: TextSize, header: Section
+    ) -> None:
         # if top level is smaller than current header to test, pop it
         # repeat until top level is bigger or same
 
@@ -139,12 +482,31 @@ class HierarchyParser:
             poped = stack.pop()
             # header on higher level in stack has sime FontSize
             # -> check additional sub-header conditions like regexes, enumeration etc.
-            if poped.heading.style.mapped_font_size == headerSize:
+            if _header_size(poped) == headerSize:
                 # check if header_to_check is sub-header of poped element within stack
                 if self._isSubHeader.test(poped, header):
                     stack.append(poped)
                     return
 
+    @staticmethod
+    def __append_content(
+        element: TextElement, level_stack: List[Section], structured: List[Section]
+    ) -> None:
+        # no header found, add paragraph as a content element to previous node
+        # - content is on same level as its corresponding header
+        content_node = Section(element, level=len(level_stack))
+        if level_stack:
+            level_stack[-1].append_children(content_node)
+        # if last element in output structure has also no header, merge
+        elif structured and isinstance(structured[-1], DanglingTextSection):
+            structured[-1].append_children(content_node)
+        else:
+            # # add dangling content as section
+            dangling_content = DanglingTextSection()
+            dangling_content.append_children(content_node)
+            dangling_content.set_level(len(level_stack))
+            structured.append(dangling_content)
+
     @staticmethod
     def __push_to_stack(child, stack, output):
         """
@@ -156,7 +518,7 @@ class HierarchyParser:
         """
         if stack:
             child.set_level(len(stack))
-            stack[-1].children.append(child)
+            stack[-1].append_children(child)
         else:
             # append as highest order element
             output.append(child)
@@ -171,10 +533,7 @@ class HierarchyParser:
         """
         if not stack:
             return False
-        return (
-            stack[-1].heading.style.mapped_font_size
-            <= header_to_test.heading.style.mapped_font_size
-        )
+        return _header_size(stack[-1]) <= _header_size(header_to_test)
 
     @staticmethod
     def __top_has_no_header(stack: [Section]):
@@ -185,7 +544,205 @@ class HierarchyParser:
         """
         if not stack:
             return False
-        return len(stack[-1].heading._data) == 0
+        return stack[-1].heading.is_empty
+
+
+def _header_size(section: Section) -> TextSize:
+    """
+    @return: mapped font size of the heading of a header section
+    """
+    assert section.heading is not None
+    return section.heading.style.mapped_font_size
+
+
+def _analysed(
+    elements: Iterable[LTTextContainer[Any]], analyser: StyleAnalyser
+) -> Generator[LTTextContainer[Any], None, None]:
+    """
+    @return: yields the given elements, after they have been consumed by the analyser
+    """
+    for element in elements:
+        analyser.consume(element)
+        yield element
+
+
+def _parse_pdf(parser: HierarchyParser, source: Source) -> StructuredPdfDocument:
+    """
+    executor task of @HierarchyParser.parse_pdf_async
+    """
+    return parser.parse_pdf(source)
+
+
+def _parse_chunk(
+    parser: HierarchyParser, sources: List[Source]
+) -> List[StructuredPdfDocument | Exception]:
+    """
+    worker task of @HierarchyParser.parse_many
+    @return: parsed document or raised exception per source
+    """
+    results: List[StructuredPdfDocument | Exception] = []
+    for source in sources:
+        try:
+            results.append(parser.parse_pdf(source))
+        except Exception as e:
+            results.append(e)
+    return results
+
+
+# (index, source) pairs dispatched to one worker
+_Chunk = List[Tuple[int, Source]]
+
+
+class _ChunkPool:
+    """
+    process pool of @HierarchyParser.parse_many, restarted if a worker dies.
+    all futures of a broken pool fail, their sources become suspects.
+    suspects run alone, one at a time, so that a crash is attributed to its source.
+    chunks that fail as a whole (e.g. not picklable) are retried source by source.
+    """
+
+    def __init__(
+        self,
+        parser: HierarchyParser,
+        chunks: Iterator[_Chunk],
+        workers: int,
+        max_tasks_per_child: Optional[int],
+    ) -> None:
+        self.parser = parser
+        self.chunks = chunks
+        self.workers = workers
+        self.max_tasks_per_child = max_tasks_per_child
+        # future -> (chunk, runs alone)
+        self.pending: Dict[
+            Future[List[StructuredPdfDocument | Exception]], Tuple[_Chunk, bool]
+        ] = {}
+        # chunks to submit again, e.g. not accepted by a broken pool
+        self.retry: Deque[_Chunk] = deque()
+        # sources in flight when a worker died
+        self.suspects: Deque[Tuple[int, Source]] = deque()
+        self.executor = self.__create_executor()
+
+    def __create_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers, max_tasks_per_child=self.max_tasks_per_child
+        )
+
+    def __restart(self) -> None:
+        for chunk, _ in self.pending.values():
+            self.suspects.extend(chunk)
+        self.pending.clear()
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        self.executor = self.__create_executor()
+
+    def __next_chunk(self) -> Optional[Tuple[_Chunk, bool]]:
+        """
+        @return: (chunk, runs alone), None if nothing can be submitted right now
+        """
+        if any(alone for _, alone in self.pending.values()):
+            return None
+        if self.suspects:
+            if self.pending:
+                return None
+            return [self.suspects.popleft()], True
+        if self.retry:
+            return self.retry.popleft(), False
+        chunk = next(self.chunks, None)
+        return None if chunk is None else (chunk, False)
+
+    def __submit(self) -> bool:
+        task = self.__next_chunk()
+        if task is None:
+            return False
+        chunk, alone = task
+        try:
+            future = self.executor.submit(
+                _parse_chunk, self.parser, [source for _, source in chunk]
+            )
+        except BrokenProcessPool:
+            # the pool broke since the last result, the chunk did not run
+            if alone:
+                self.suspects.extendleft(chunk)
+            else:
+                self.retry.appendleft(chunk)
+            self.__restart()
+            return True
+        self.pending[future] = task
+        return True
+
+    def fill(self) -> bool:
+        """
+        keeps some chunks queued, without materializing all sources.
+        @return: False once all chunks are done
+        """
+        while len(self.pending) < self.workers * 2 and self.__submit():
+            pass
+        return bool(self.pending)
+
+    def completed(
+        self,
+    ) -> Iterator[Tuple[Tuple[int, Source], StructuredPdfDocument | Exception]]:
+        """
+        waits for the next finished chunks.
+        @return: yields ((index, source), parsed document or raised exception)
+        """
+        finished, _ = wait(self.pending, return_when=FIRST_COMPLETED)
+        for future in finished:
+            if future not in self.pending:
+                # moved to the suspects by a restart
+                continue
+            chunk, alone = self.pending.pop(future)
+            try:
+                results = future.result()
+            except BrokenProcessPool as e:
+                self.__restart()
+                if not alone:
+                    self.suspects.extend(chunk)
+                    continue
+                # the source crashed its worker on its own
+                results = [e]
+            except Exception as e:
+                # e.g. a source is not picklable
+                if len(chunk) > 1:
+                    # one task per source, only the failing source gets the exception
+                    self.retry.extend([member] for member in chunk)
+                    continue
+                results = [e]
+            yield from zip(chunk, results, strict=True)
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _source_size(source: Source) -> Optional[int]:
+    """
+    @return: size of the pdf in bytes, None if unknown
+    """
+    if isinstance(source, BufferSource) and source.data is not None:
+        return memoryview(source.data).nbytes
+    try:
+        return os.path.getsize(source.uri)
+    except (OSError, TypeError):
+        return None
+
+
+def _chunk_sources(
+    indexed_sources: Iterable[Tuple[int, Source]], chunk_size: int, small_file_size: int
+) -> Iterator[_Chunk]:
+    """
+    groups consecutive small documents into chunks, bigger ones are dispatched alone.
+    """
+    chunk: _Chunk = []
+    for index, source in indexed_sources:
+        size = _source_size(source)
+        if size is None or size > small_file_size:
+            yield [(index, source)]
+            continue
+        chunk.append((index, source))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
 
 
 def enrich_metadata(pdf: StructuredPdfDocument, source: Source):
@@ -196,7 +753,9 @@ def enrich_metadata(pdf: StructuredPdfDocument, source: Source):
         # todo extract document-title from best titles
     @return:
     """
-    # try to capture filename
+    # try to capture filename, sources reading from memory or streams may not have one
+    if not isinstance(source.uri, (str, PathLike)):
+        return
     try:
         filename = Path(source.uri).name
         pdf.update_metadata("filename", filename)
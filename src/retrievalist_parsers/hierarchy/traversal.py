@@ -1,15 +1,78 @@
 import sys
 from collections import deque
-from typing import Generator
+from typing import Dict, Generator, List, Optional
 
 from retrievalist_parsers.model.document import Section, StructuredPdfDocument
 
 
+class PreOrderIndex:
+    """
+    Pre-order sequence of all sections within a document,
+    built iteratively with an explicit stack.
+    - the subtree of the section at position i spans the positions [i, span_end[i]).
+    - cached on the document, see @preorder_index.
+    """
+
+    def __init__(self, elements: List[Section]) -> None:
+        self.sections: List[Section] = []
+        self.depths: List[int] = []
+        parents: List[int] = []
+
+        stack = [(section, -1, 0) for section in reversed(elements)]
+        while stack:
+            section, parent, depth = stack.pop()
+            position = len(self.sections)
+            self.sections.append(section)
+            self.depths.append(depth)
+            parents.append(parent)
+            stack.extend(
+                (child, position, depth + 1) for child in reversed(section.children)
+            )
+
+        # subtree sizes, children follow their parent
+        sizes = [1] * len(self.sections)
+        for position in range(len(sizes) - 1, -1, -1):
+            if parents[position] >= 0:
+                sizes[parents[position]] += sizes[position]
+        self.span_end = [position + size for position, size in enumerate(sizes)]
+        self._positions: Optional[Dict[int, int]] = None
+
+    def __len__(self) -> int:
+        return len(self.sections)
+
+    def position(self, section: Section) -> int:
+        if self._positions is None:
+            self._positions = {
+                id(element): position for position, element in enumerate(self.sections)
+            }
+        return self._positions[id(section)]
+
+    def subtree(self, section: Section) -> List[Section]:
+        """
+        @return: section & all nested children in pre-order
+        """
+        position = self.position(section)
+        return self.sections[position : self.span_end[position]]
+
+
+def preorder_index(document: StructuredPdfDocument) -> PreOrderIndex:
+    """
+    @PreOrderIndex of the document, cached on the document until its structure changes
+    (see @StructuredPdfDocument.structure_version).
+    """
+    version = document.structure_version
+    cache = document._traversal_cache
+    if cache is None or cache[0] != version:
+        cache = document._traversal_cache = (version, PreOrderIndex(document.elements))
+    index: PreOrderIndex = cache[1]
+    return index
+
+
 def get_document_depth(document: StructuredPdfDocument):
     """
     retrieves document depth found within tree structure, + 1 because the levels are 0 notated.
     """
-    return max(set([section.level for section in traverse_in_order(document)])) + 1
+    return max(section.level for section in preorder_index(document).sections) + 1
 
 
 def traverse_inorder_sections_with_content(
@@ -33,7 +96,7 @@ def traverse_inorder_sections_with_content(
 
 
 def traverse_in_order(
-    document: StructuredPdfDocument,
+    document: StructuredPdfDocument, max_depth=sys.maxsize
 ) -> Generator[Section, StructuredPdfDocument, None]:
     """
                      5   10
@@ -44,17 +107,32 @@ def traverse_in_order(
 
     yield order:
     - [5,1,a,b,c,2,10,3,x]
-    """
 
-    def __traverse__(section: Section):
-        child: Section
-        for child in section.children:
-            yield child
-            yield from __traverse__(child)
-
-    for element in document.elements:
-        yield element
-        yield from __traverse__(element)
+    @param max_depth: skip sections (and their children) with level >= max_depth
+    """
+    index = preorder_index(document)
+    sections = index.sections
+    if max_depth == sys.maxsize:
+        yield from sections
+        return
+
+    position = 0
+    while position < len(sections):
+        section = sections[position]
+        if section.level < max_depth:
+            yield section
+            position += 1
+        else:
+            position = index.span_end[position]
+
+
+def traverse_subtree(
+    document: StructuredPdfDocument, section: Section
+) -> List[Section]:
+    """
+    @return: section of the document & all its nested children in pre-order
+    """
+    return preorder_index(document).subtree(section)
 
 
 def traverse_level_order(
@@ -0,0 +1,190 @@
+import copy
+from typing import (
+    BinaryIO,
+    Container,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    cast,
+)
+
+from pdfminer.converter import PDFPageAggregator
+from pdfminer.layout import (
+    LAParams,
+    LTAnno,
+    LTChar,
+    LTComponent,
+    LTFigure,
+    LTPage,
+    LTTextLine,
+)
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.pdfpage import PDFPage
+from pdfminer.utils import FileOrName, Matrix, open_filename
+
+
+class RecordingPage(LTPage):
+    """
+    LTPage that keeps the text lines found by pdfminers layout analysis.
+    lines do not depend on line_margin,
+    they can be regrouped into boxes later on without interpreting the page again.
+    """
+
+    textlines: List[LTTextLine]
+
+    def group_objects(
+        self, laparams: LAParams, objs: Iterable[LTComponent]
+    ) -> Iterator[LTTextLine]:
+        self.textlines = list(super().group_objects(laparams, objs))
+        return iter(self.textlines)
+
+
+class ReplayPage(LTPage):
+    """
+    LTPage that skips character grouping,
+    reuses text lines recorded by a @RecordingPage instead.
+    """
+
+    def __init__(self, layout: "PageLayout"):
+        super().__init__(layout.pageid, layout.bbox, layout.rotate)
+        self._textlines = layout.textlines
+        # pdfminer only starts grouping if the page holds characters
+        self._objs = [
+            char
+            for line in layout.textlines
+            for char in line
+            if isinstance(char, LTChar)
+        ]
+        self._objs.extend(layout.others)
+
+    def group_objects(
+        self, laparams: LAParams, objs: Iterable[LTComponent]
+    ) -> Iterator[LTTextLine]:
+        for line in self._textlines:
+            # recorded lines are part of already yielded boxes, the analysis
+            # changes a shallow copy (sharing the cached line stats)
+            replica = copy.copy(line)
+            line_objs = line._objs
+            # drop the line break appended by the prior LTTextLine.analyze call
+            if (
+                line_objs
+                and isinstance(line_objs[-1], LTAnno)
+                and line_objs[-1].get_text() == "\n"
+            ):
+                line_objs = line_objs[:-1]
+            replica._objs = list(line_objs)
+            yield replica
+
+
+class PageLayout:
+    """
+    Compact line level layout of one page:
+    text lines with their chars and the objects FileSource.read consumes.
+    """
+
+    def __init__(
+        self,
+        pageid: int,
+        bbox: Tuple[float, float, float, float],
+        rotate: float,
+        textlines: List[LTTextLine],
+        others: Sequence[LTComponent],
+    ):
+        self.pageid = pageid
+        self.bbox = bbox
+        self.rotate = rotate
+        self.textlines = textlines
+        self.others = others
+
+    @classmethod
+    def from_page(cls, page: LTPage) -> "PageLayout":
+        """
+        @param page: analysed page, created by the @LayoutRecordingAggregator
+        @return: recorded layout, lines are shared with the given page
+        """
+        # figures keep their raw characters, empty lines are part of the recorded lines
+        others = [compact_figure(obj) for obj in page if isinstance(obj, LTFigure)]
+        return cls(
+            page.pageid, page.bbox, page.rotate, getattr(page, "textlines", []), others
+        )
+
+    def replay(self, laparams: LAParams) -> LTPage:
+        """
+        regroup recorded lines into boxes, e.g. using another line_margin.
+        @param laparams: only params that act on grouped lines are applied
+            (line_margin, boxes_flow)
+        @return: analysed page
+        """
+        page = ReplayPage(self)
+        page.analyze(laparams)
+        return page
+
+
+def compact_figure(figure: LTFigure) -> LTFigure:
+    """
+    copy of the figure, that keeps its characters only.
+    other objects like images (which refer to the pdf stream) are replaced
+    by their bounding box.
+    """
+    compact = copy.copy(figure)
+    compact._objs = [
+        obj if isinstance(obj, LTChar) else LTComponent(obj.bbox) for obj in figure
+    ]
+    return compact
+
+
+class LayoutRecordingAggregator(PDFPageAggregator):
+    def begin_page(self, page: PDFPage, ctm: Matrix) -> None:
+        super().begin_page(page, ctm)
+        self.cur_item = RecordingPage(self.pageno, self.cur_item.bbox)
+
+
+def line_params_key(laparams: LAParams) -> Tuple[float, float, float, bool, bool]:
+    """
+    LAParams that influence how characters are grouped into lines.
+    recorded layouts can only be replayed with params sharing the same key.
+    """
+    return (
+        laparams.line_overlap,
+        laparams.char_margin,
+        laparams.word_margin,
+        laparams.detect_vertical,
+        laparams.all_texts,
+    )
+
+
+def extract_recorded_pages(
+    pdf_file: FileOrName,
+    laparams: LAParams,
+    page_numbers: Optional[Container[int]] = None,
+    password: str = "",
+    caching: bool = True,
+) -> Generator[LTPage, None, None]:
+    """
+    Same as pdfminer.high_level.extract_pages,
+    but analysed pages remember their text lines.
+    pass them to @PageLayout.from_page to replay them later on.
+    """
+    with open_filename(pdf_file, "rb") as fp:
+        fp = cast("BinaryIO", fp)  # opened in binary mode
+        resource_manager = PDFResourceManager(caching=caching)
+        device = LayoutRecordingAggregator(resource_manager, laparams=laparams)
+        interpreter = PDFPageInterpreter(resource_manager, device)
+        for page in PDFPage.get_pages(
+            fp, page_numbers, password=password, caching=caching
+        ):
+            interpreter.process_page(page)
+            yield device.get_result()
+
+
+def count_pages(pdf_file: FileOrName, password: str = "") -> int:
+    """
+    amount of pages within the pdf, pages are not interpreted.
+    """
+    with open_filename(pdf_file, "rb") as fp:
+        fp = cast("BinaryIO", fp)  # opened in binary mode
+        return sum(1 for _ in PDFPage.get_pages(fp, password=password))
@@ -0,0 +1,234 @@
+import array
+import sys
+from collections import defaultdict
+from types import ModuleType
+from typing import Any, Dict, List, Optional, Sequence, Tuple, cast
+
+from retrievalist_parsers.model.document import (
+    DanglingTextSection,
+    Section,
+    StructuredPdfDocument,
+    TextElement,
+)
+from retrievalist_parsers.model.style import Style
+
+np: Optional[ModuleType]
+try:
+    import numpy as np
+except ImportError:  # optional, plain arrays are used instead
+    np = None
+
+HAS_HEADING = 1
+DANGLING = 2
+
+# per section columns, see @ColumnarDocument.__init__
+COLUMNS = (
+    "parent",
+    "depth",
+    "level",
+    "page",
+    "style",
+    "flags",
+    "text_start",
+    "text_end",
+    "subtree_end",
+)
+
+
+def _int_array(values: List[int]) -> Sequence[int]:
+    if np is not None:
+        return cast("Sequence[int]", np.array(values, dtype=np.int64))
+    return array.array("q", values)
+
+
+class ColumnarDocument:
+    """
+    StructuredPdfDocument stored as flat arrays, one entry per section in pre-order.
+    - subtrees are contiguous: section i spans the indices [i, subtree_end[i]).
+    - texts of all sections are stored in one text arena,
+      each non-empty text followed by a line break.
+      text of section i is arena[text_start[i]:text_end[i]],
+      its full content a single slice as well.
+    - numpy arrays are used if numpy is installed.
+    """
+
+    def __init__(
+        self,
+        columns: Dict[str, Sequence[int]],
+        text_arena: str,
+        styles: List[Style],
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        @param columns: array per name of @COLUMNS, one entry per section:
+            - parent: index of the parent section, -1 for top level sections
+            - depth: depth within the tree, top level sections have depth 0
+            - level: Section.level
+            - page: page of the heading, -1 if unknown
+            - style: index within styles, -1 if section has no heading
+            - flags: HAS_HEADING | DANGLING
+            - text_start, text_end: text of the section within the text arena
+            - subtree_end: index after the last nested child
+        """
+        self.parent = columns["parent"]
+        self.depth = columns["depth"]
+        self.level = columns["level"]
+        self.page = columns["page"]
+        self.style = columns["style"]
+        self.flags = columns["flags"]
+        self.text_start = columns["text_start"]
+        self.text_end = columns["text_end"]
+        self.subtree_end = columns["subtree_end"]
+        self.text_arena = text_arena
+        self.styles = styles
+        self.metadata = metadata if metadata is not None else {}
+
+    def __len__(self) -> int:
+        return len(self.parent)
+
+    @classmethod
+    def from_document(cls, document: StructuredPdfDocument) -> "ColumnarDocument":
+        columns: Dict[str, List[int]] = {name: [] for name in COLUMNS}
+        parent = columns["parent"]
+        texts = []
+        arena_size = 0
+        styles: Dict[Tuple[Any, ...], int] = {}
+
+        stack = [(section, -1, 0) for section in reversed(document.elements)]
+        while stack:
+            section, parent_index, depth = stack.pop()
+            index = len(parent)
+            parent.append(parent_index)
+            columns["depth"].append(depth)
+            columns["level"].append(section.level or 0)
+
+            heading = section.heading
+            flags = DANGLING if isinstance(section, DanglingTextSection) else 0
+            if heading is not None:
+                flags |= HAS_HEADING
+                columns["page"].append(-1 if heading.page is None else heading.page)
+                columns["style"].append(
+                    styles.setdefault(heading.style.key(), len(styles))
+                )
+            else:
+                columns["page"].append(-1)
+                columns["style"].append(-1)
+            columns["flags"].append(flags)
+
+            text = section.heading_text
+            columns["text_start"].append(arena_size)
+            columns["text_end"].append(arena_size + len(text))
+            if text:
+                texts.append(text)
+                arena_size += len(text) + 1
+
+            stack.extend(
+                (child, index, depth + 1) for child in reversed(section.children)
+            )
+
+        # subtree sizes, children follow their parent in pre-order
+        size = [1] * len(parent)
+        for index in range(len(parent) - 1, -1, -1):
+            if parent[index] >= 0:
+                size[parent[index]] += size[index]
+        columns["subtree_end"] = [index + size[index] for index in range(len(size))]
+
+        texts.append("")
+        return cls(
+            {name: _int_array(values) for name, values in columns.items()},
+            text_arena="\n".join(texts),
+            styles=[Style(*key) for key in styles],
+            metadata=dict(document.metadata),
+        )
+
+    def to_document(self) -> StructuredPdfDocument:
+        """
+        @return: object model of this document, styles are shared between sections
+        """
+        sections: List[Section] = []
+        elements: List[Section] = []
+        for index in range(len(self)):
+            flags = self.flags[index]
+            section: Section
+            if flags & DANGLING:
+                section = DanglingTextSection()
+                section.set_level(int(self.level[index]))
+            else:
+                section = Section(None, int(self.level[index]))
+            if flags & HAS_HEADING:
+                page = int(self.page[index])
+                section.heading = TextElement(
+                    text_container=None,
+                    style=self.styles[self.style[index]],
+                    text=self.text(index),
+                    page=page if page >= 0 else None,
+                )
+            sections.append(section)
+
+            parent = self.parent[index]
+            if parent < 0:
+                elements.append(section)
+            else:
+                sections[parent].append_children(section)
+
+        document = StructuredPdfDocument(elements)
+        document.metadata = defaultdict(str, self.metadata)
+        return document
+
+    def text(self, index: int) -> str:
+        return self.text_arena[self.text_start[index] : self.text_end[index]]
+
+    def full_content(self, index: int) -> str:
+        """
+        same as Section.full_content: texts of the section and all nested children.
+        """
+        end = self.subtree_end[index]
+        arena_end = self.text_start[end] if end < len(self) else len(self.text_arena)
+        return self.text_arena[self.text_start[index] : arena_end][:-1]
+
+    def subtree(self, index: int) -> slice:
+        """
+        @return: pre-order indices of the section and all nested children
+        """
+        return slice(int(index), int(self.subtree_end[index]))
+
+    def children(self, index: int) -> Sequence[int]:
+        """
+        @return: indices of the direct children
+        """
+        children = []
+        child = index + 1
+        while child < self.subtree_end[index]:
+            children.append(child)
+            child = self.subtree_end[child]
+        return children
+
+    def traverse_in_order(self) -> Sequence[int]:
+        """
+        indices in order of @traverse_in_order
+        """
+        if np is not None:
+            return cast("Sequence[int]", np.arange(len(self)))
+        return range(len(self))
+
+    def traverse_level_order(self, max_depth: int = sys.maxsize) -> Sequence[int]:
+        """
+        indices in order of @traverse_level_order:
+        sections by depth, siblings in document order.
+        """
+        if np is not None:
+            order = np.lexsort((np.arange(len(self)), self.depth))
+            return cast("Sequence[int]", order[self.level[order] < max_depth])
+        return [
+            index
+            for index in sorted(range(len(self)), key=self.depth.__getitem__)
+            if self.level[index] < max_depth
+        ]
+
+    def get_document_depth(self) -> int:
+        """
+        same as @get_document_depth
+        """
+        if np is not None:
+            return int(np.max(self.level)) + 1
+        return max(self.level) + 1
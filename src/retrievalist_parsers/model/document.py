@@ -1,31 +1,140 @@
+import itertools
 from collections import defaultdict
-from typing import List
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
 
-from pdfminer.layout import LTTextContainer
+from pdfminer.layout import LTTextBoxVertical, LTTextContainer
+from pdfminer.utils import Rect
 
+from retrievalist_parsers import utils
 from retrievalist_parsers.analysis.styledistribution import StyleDistribution
+from retrievalist_parsers.model.index import SectionIndex
 from retrievalist_parsers.model.style import Style
 
+if TYPE_CHECKING:
+    # headercompare imports the document model
+    from retrievalist_parsers.hierarchy.headercompare import HeadingSignature
+
 
 class TextElement:
     """
     Represents one single TextContainer like a line of words.
+    - compact elements (see @compact) keep no reference to pdfminer objects,
+      only text, bbox & leading words.
     """
 
+    # in order of the printed attributes, see @utils.object_to_dict
+    __slots__ = (  # ruff: ignore[unsorted-dunder-slots]
+        "_data",
+        "_text",
+        "style",
+        "page",
+        "_bbox",
+        "_tokens",
+        "_vertical",
+    )
+
     def __init__(
-        self, text_container: LTTextContainer, style: Style, text=None, page=None
-    ):
+        self,
+        text_container: Optional[LTTextContainer[Any]],
+        style: Style,
+        text: Optional[str] = None,
+        page: Optional[int] = None,
+        tokens: Optional[List[str]] = None,
+    ) -> None:
+        """
+        @param text: stripped text of the container,
+            computed on first access if not given
+        @param tokens: leading words of the container (see @tokens),
+            computed on access if not given
+        """
         self._data = text_container
         self._text = text
         self.style = style
         self.page = page
+        self._bbox: Optional[Rect] = None
+        self._tokens = tokens
+        self._vertical = False
+
+    @classmethod
+    def compact(  # ruff: ignore[too-many-arguments]
+        cls,
+        text_container: "LTTextContainer[Any]",
+        style: Style,
+        *,
+        page: Optional[int] = None,
+        token_count: int = 3,
+        text: Optional[str] = None,
+        tokens: Optional[List[str]] = None,
+    ) -> "TextElement":
+        """
+        creates an element, that drops the given container
+        (chars, lines, fonts of the pdfminer layout).
+        @param token_count: amount of leading words kept for header comparison
+        @param text: stripped text of the container,
+            e.g. from the @BoxStats of the container
+        @param tokens: leading words, e.g. from the @BoxStats of the container
+        """
+        element = cls(
+            text_container=None,
+            style=style,
+            text=text if text is not None else text_container.get_text().strip(),
+            page=page,
+        )
+        element._bbox = text_container.bbox
+        if tokens is None:
+            tokens = utils.generate_words(text_container)
+        element._tokens = list(itertools.islice(tokens, token_count))
+        element._vertical = isinstance(text_container, LTTextBoxVertical)
+        return element
 
     @property
     def text(self):
-        if not self._data:
-            return self._text
-        else:
-            return self._data.get_text().strip()
+        # containers are not changed after annotation, their text is computed once
+        if self._text is None and self._data:
+            self._text = self._data.get_text().strip()
+        return self._text
+
+    @property
+    def bbox(self) -> Optional[Rect]:
+        """
+        @return: (x0, y0, x1, y1), None if unknown (e.g. parsed from json)
+        """
+        if self._data is not None:
+            return self._data.bbox
+        return self._bbox
+
+    @property
+    def tokens(self) -> List[str]:
+        """
+        leading words of the element, words are split on space characters of the pdf.
+        """
+        if self._tokens is not None:
+            return self._tokens
+        if self._data is not None:
+            return list(itertools.islice(utils.generate_words(self._data), 3))
+        return self._text.split()[:3] if self._text else []
+
+    @property
+    def first_token(self) -> str:
+        if self._data is not None and self._tokens is None:
+            return next(utils.generate_words(self._data), "")
+        tokens = self.tokens
+        return tokens[0] if tokens else ""
+
+    @property
+    def is_vertical(self) -> bool:
+        if self._data is not None:
+            return isinstance(self._data, LTTextBoxVertical)
+        return self._vertical
+
+    @property
+    def is_empty(self) -> bool:
+        """
+        @return: True if element holds no lines
+        """
+        if self._data is not None:
+            return len(self._data) == 0
+        return not self._text
 
     @classmethod
     def from_json(cls, data: dict):
@@ -49,40 +158,131 @@ class TextElement:
 class Section:
     """
     Represents a section with title, contents and children
+    - full content is cached per section. changing the heading, children or level
+      of a section clears the caches of the section, its ancestors & the owning
+      document (see @StructuredPdfDocument).
+    - structural changes have to go through the properties or @append_children,
+      children lists changed in place are not tracked.
     """
 
-    heading: TextElement
+    # in order of the printed attributes, see @utils.object_to_dict
+    __slots__ = (  # ruff: ignore[unsorted-dunder-slots]
+        "_heading",
+        "_children",
+        "_level",
+        "_parent",
+        "_content",
+        "_signature",
+    )
+
+    def __init__(self, element: Optional[TextElement], level: int = 0) -> None:
+        # parent section or owning document, notified on changes (see @_invalidate)
+        self._parent: Union[Section, StructuredPdfDocument, None] = None
+        self._heading = element
+        self._children: List[Section] = []
+        self._level = level
+        # full content, None until computed or after a change
+        self._content: Optional[str] = None
+        # heading properties compared by the sub-header conditions,
+        # see @headercompare.signature
+        self._signature: Optional[HeadingSignature] = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # parents & caches are restored by __setstate__
+        return {
+            "heading": self._heading,
+            "children": self._children,
+            "level": self._level,
+        }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self._parent = None
+        self._content = None
+        self._signature = None
+        self._heading = state["heading"]
+        self._level = state["level"]
+        self._children = state["children"]
+        for child in self._children:
+            child._parent = self
+
+    def _invalidate(self) -> None:
+        """
+        clears the cached content of the section & its ancestors,
+        the owning document is notified.
+        """
+        section: Union[Section, StructuredPdfDocument, None] = self
+        while isinstance(section, Section):
+            section._content = None
+            section = section._parent
+        if section is not None:
+            section._invalidate()
 
-    def __init__(self, element: TextElement, level=0):
-        self.heading = element
-        self.children = []  # Section
-        self.level = None
-        self.set_level(level)
+    @property
+    def heading(self) -> Optional[TextElement]:
+        return self._heading
+
+    @heading.setter
+    def heading(self, element: Optional[TextElement]) -> None:
+        self._heading = element
+        self._signature = None
+        self._invalidate()
 
-    def set_level(self, level):
+    @property
+    def children(self) -> List["Section"]:
+        return self._children
+
+    @children.setter
+    def children(self, children: List["Section"]) -> None:
+        self._children = children
+        for child in children:
+            child._parent = self
+        self._invalidate()
+
+    @property
+    def level(self) -> int:
+        return self._level
+
+    @level.setter
+    def level(self, level: int) -> None:
+        self._level = level
+        self._invalidate()
+
+    def set_level(self, level: int) -> None:
         self.level = level
 
-    def append_children(self, section):
-        self.children.append(section)
+    def append_children(self, section: "Section") -> None:
+        self._children.append(section)
+        section._parent = self
+        self._invalidate()
 
     @property
-    def full_content(self):
+    def full_content(self) -> str:
         """
         Returns merged full content of all nested children.
+        - assembled bottom-up from the content of the children, each section caches
+          its content until the next change within its subtree (see @_invalidate).
         @return:
         """
-        contents = [self.heading_text] if self.heading_text else []
-
-        def __traverse__(section: Section):
-            child: Section
-            for child in section.children:
-                yield child
-                yield from __traverse__(child)
+        if self._content is not None:
+            return self._content
+
+        # post-order, explicit stack instead of nested generators
+        stack: List[Tuple[Section, bool]] = [(self, False)]
+        while stack:
+            section, expanded = stack.pop()
+            if section._content is not None:
+                continue
+            if not expanded:
+                stack.append((section, True))
+                stack.extend((child, False) for child in section._children)
+                continue
 
-        for child in __traverse__(self):
-            if child.heading_text:
-                contents.append(child.heading_text)
-        return "\n".join(contents)
+            contents = [section.heading_text] if section.heading_text else []
+            contents.extend(
+                child._content for child in section._children if child._content
+            )
+            section._content = "\n".join(contents)
+        return self._content or ""
 
     @property
     def top_level_content(self):
@@ -129,7 +329,9 @@ class Section:
 
 
 class DanglingTextSection(Section):
-    def __init__(self):
+    __slots__ = ()
+
+    def __init__(self) -> None:
         super().__init__(element=None)
 
     def __str__(self):
@@ -138,22 +340,94 @@ class DanglingTextSection(Section):
 
 class StructuredPdfDocument:
     """
-    PDF document containing its natural order hierarchy, as detected by the HierarchyParser.
+    PDF document containing its natural order hierarchy,
+    as detected by the HierarchyParser.
+    - text, section index & traversal index (see @traversal.preorder_index)
+      are cached, until a section of the document changes or top level sections
+      are replaced or added.
     """
 
-    elements: List[Section]
-
-    def __init__(self, elements: [Section], style_info=None):
+    def __init__(
+        self,
+        elements: List[Section],
+        style_info: Optional[StyleDistribution] = None,
+        section_index: Optional[SectionIndex] = None,
+    ) -> None:
+        """
+        @param section_index: index over the given elements,
+            e.g. built by the HierarchyParser, see @section_index
+        """
         self.metadata = defaultdict(str)
+        self._version = 0
+        self._owned = 0
+        self._elements: List[Section] = []
         self.elements = elements
         self.metadata["style_distribution"] = style_info
+        # (structure version, PreOrderIndex), see @traversal.preorder_index
+        self._traversal_cache: Optional[Tuple[int, Any]] = None
+        self._text_cache: Optional[Tuple[int, str]] = None
+        self._index_cache: Optional[Tuple[int, SectionIndex]] = None
+        if section_index is not None:
+            self._index_cache = (self.structure_version, section_index)
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        # parents of sections are not pickled, see @Section.__getstate__
+        self.__own(self._elements)
+
+    @property
+    def elements(self) -> List[Section]:
+        return self._elements
+
+    @elements.setter
+    def elements(self, elements: List[Section]) -> None:
+        self._elements = elements
+        self.__own(elements)
+
+    def __own(self, elements: List[Section]) -> None:
+        for section in elements:
+            section._parent = self
+        self._owned = len(elements)
+        self._invalidate()
+
+    def _invalidate(self) -> None:
+        """
+        called by sections of the document, after they changed
+        """
+        self._version += 1
 
-    def update_metadata(self, key, value):
+    @property
+    def structure_version(self) -> int:
+        """
+        changes whenever a section of the document changes,
+        keys the caches of the document.
+        """
+        if len(self._elements) != self._owned:
+            # top level sections added in place
+            self.__own(self._elements)
+        return self._version
+
+    @property
+    def section_index(self) -> SectionIndex:
+        """
+        lookup of sections by path id, level & page range.
+        rebuilt after the structure changed.
+        """
+        version = self.structure_version
+        if self._index_cache is None or self._index_cache[0] != version:
+            self._index_cache = (version, SectionIndex.from_elements(self.elements))
+        return self._index_cache[1]
+
+    def update_metadata(self, key: str, value: Any) -> None:
         self.metadata[key] = value
 
     @property
-    def text(self):
-        return "\n".join([item.full_content for item in self.elements])
+    def text(self) -> str:
+        version = self.structure_version
+        if self._text_cache is None or self._text_cache[0] != version:
+            text = "\n".join([item.full_content for item in self.elements])
+            self._text_cache = (version, text)
+        return self._text_cache[1]
 
     @property
     def title(self):
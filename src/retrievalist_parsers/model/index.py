@@ -0,0 +1,215 @@
+import bisect
+from collections import defaultdict
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    # document.py imports the index
+    from retrievalist_parsers.model.document import Section
+
+
+class SectionIndex:
+    """
+    Lookup index over all sections of a document, entries are stored in pre-order.
+    - path id: 1-based position of the section within its parent (or the document),
+      e.g. "3.2.1".
+    - page span: first & last page found within the section and all its nested children.
+    - sections without any page (e.g. of elements read without page) get the page
+      of the section read before, so page queries have no gaps.
+    - page ranges are queried by descending only into sections,
+      whose span overlaps the range.
+      spans of nested children lie within the span of their parent.
+      top level sections that may overlap are found by bisection over their spans.
+    """
+
+    def __init__(self) -> None:
+        self.sections: List[Section] = []
+        self.paths: List[str] = []
+        self.first_page: List[Optional[int]] = []
+        self.last_page: List[Optional[int]] = []
+        # subtree of position i spans [i, subtree_end[i])
+        self.subtree_end: List[int] = []
+        self.levels: Dict[int, List[int]] = defaultdict(list)
+        self._positions: Dict[str, int] = {}
+        # id(section) -> position
+        self._section_positions: Dict[int, int] = {}
+        self._roots = 0
+        # positions of the top level sections & running max of their last pages
+        self._root_positions: List[int] = []
+        self._max_last_page: List[float] = []
+        # running min of the first pages of following top level sections (lazy)
+        self._min_first_page: Optional[List[float]] = None
+        # last page found in reading order
+        self._page: Optional[int] = None
+
+    @classmethod
+    def from_elements(cls, elements: Iterable["Section"]) -> "SectionIndex":
+        index = cls()
+        for section in elements:
+            index.add(section)
+        return index
+
+    def __len__(self) -> int:
+        return len(self.sections)
+
+    def add(self, section: "Section") -> None:
+        """
+        appends a complete top level section & its children.
+        """
+        self._roots += 1
+        start = len(self.sections)
+        parents: List[int] = []
+
+        stack = [(section, str(self._roots), -1)]
+        while stack:
+            section, path, parent = stack.pop()
+            position = len(self.sections)
+            self.sections.append(section)
+            self.paths.append(path)
+            self._positions[path] = position
+            self._section_positions[id(section)] = position
+            self.levels[section.level].append(position)
+            page = section.heading.page if section.heading is not None else None
+            self.first_page.append(page)
+            self.last_page.append(page)
+            self.subtree_end.append(position + 1)
+            parents.append(parent)
+            children = section.children
+            stack.extend(
+                (children[number - 1], "{}.{}".format(path, number), position)
+                for number in range(len(children), 0, -1)
+            )
+
+        self.__merge_spans(start, parents)
+        # sections without pages are placed at the page read before
+        gaps = False
+        for position in range(start, len(self.sections)):
+            section = self.sections[position]
+            page = section.heading.page if section.heading is not None else None
+            if page is not None:
+                self._page = page
+            elif self.first_page[position] is None and self._page is not None:
+                self.first_page[position] = self.last_page[position] = self._page
+                gaps = True
+        if gaps:
+            self.__merge_spans(start, parents)
+
+        self._root_positions.append(start)
+        last = self.last_page[start]
+        previous = self._max_last_page[-1] if self._max_last_page else float("-inf")
+        self._max_last_page.append(previous if last is None else max(previous, last))
+        self._min_first_page = None
+
+    def __merge_spans(self, start: int, parents: List[int]) -> None:
+        # children follow their parent, spans are merged bottom-up
+        for position in range(len(self.sections) - 1, start - 1, -1):
+            parent = parents[position - start]
+            if parent < 0:
+                continue
+            self.subtree_end[parent] = max(
+                self.subtree_end[parent], self.subtree_end[position]
+            )
+            # first & last page are set together
+            first, last = self.first_page[position], self.last_page[position]
+            if first is None or last is None:
+                continue
+            parent_first, parent_last = self.first_page[parent], self.last_page[parent]
+            if parent_first is None or first < parent_first:
+                self.first_page[parent] = first
+            if parent_last is None or last > parent_last:
+                self.last_page[parent] = last
+
+    def get(self, path: str) -> Optional["Section"]:
+        """
+        @param path: path id, e.g. "3.2.1"
+        @return: section, None if not found
+        """
+        position = self._positions.get(path)
+        return self.sections[position] if position is not None else None
+
+    def path(self, section: "Section") -> str:
+        position = self._section_positions.get(id(section))
+        if position is None:
+            raise KeyError("section is not part of the index")
+        return self.paths[position]
+
+    def page_span(self, path: str) -> Tuple[Optional[int], Optional[int]]:
+        """
+        @return: (first page, last page) of the section & its children,
+            pages are 0 based
+        """
+        position = self._positions[path]
+        return self.first_page[position], self.last_page[position]
+
+    def level(self, level: int) -> List["Section"]:
+        """
+        @return: sections with the given Section.level in document order
+        """
+        return [self.sections[position] for position in self.levels.get(level, [])]
+
+    def overlapping(
+        self,
+        first_page: int,
+        last_page: Optional[int] = None,
+        level: Optional[int] = None,
+    ) -> List["Section"]:
+        """
+        @param first_page: first page of the range (0 based)
+        @param last_page: last page of the range, defaults to first_page
+        @param level: only return sections of that level
+        @return: sections (in document order) with a page span overlapping the range
+        """
+        if last_page is None:
+            last_page = first_page
+        # top level sections before lo end before the range,
+        # sections from hi on start after it
+        lo = bisect.bisect_left(self._max_last_page, first_page)
+        hi = bisect.bisect_right(self.__min_first_pages(), last_page)
+        if lo >= hi:
+            return []
+        sections: List[Section] = []
+        position = self._root_positions[lo]
+        end = self.subtree_end[self._root_positions[hi - 1]]
+        while position < end:
+            first, last = self.first_page[position], self.last_page[position]
+            if first is None or last is None or first > last_page or last < first_page:
+                # children lie within the span of the section
+                position = self.subtree_end[position]
+                continue
+            section = self.sections[position]
+            if level is None or section.level == level:
+                sections.append(section)
+            position += 1
+        return sections
+
+    def __min_first_pages(self) -> List[float]:
+        """
+        @return: per top level section, min first page of it & all following ones
+        """
+        if self._min_first_page is None:
+            minimum = float("inf")
+            min_first_page = []
+            for position in reversed(self._root_positions):
+                first = self.first_page[position]
+                if first is not None:
+                    minimum = min(minimum, first)
+                min_first_page.append(minimum)
+            min_first_page.reverse()
+            self._min_first_page = min_first_page
+        return self._min_first_page
+
+    def covering(self, page: int, level: Optional[int] = None) -> List["Section"]:
+        """
+        @return: sections whose page span contains the page
+        """
+        return self.overlapping(page, page, level=level)
+
+    def to_json(self) -> Dict[str, Any]:
+        """
+        @return: path ids & page spans in pre-order,
+            levels are part of the serialized sections
+        """
+        return {
+            "paths": self.paths,
+            "first_page": self.first_page,
+            "last_page": self.last_page,
+        }
@@ -1,4 +1,5 @@
 from enum import IntEnum, auto
+from typing import NoReturn, Tuple
 
 
 class TextSize(IntEnum):
@@ -30,23 +31,64 @@ class TextSize(IntEnum):
 class Style:
     """
     Extracted paragraphs get annotated with found font-style information.
+    - styles are immutable & hashable, paragraphs of the same style share one instance
+      (see @StyleAnnotator).
     """
 
+    # in order of the printed attributes, see @utils.object_to_dict
+    __slots__ = (  # ruff: ignore[unsorted-dunder-slots]
+        "bold",
+        "italic",
+        "font_name",
+        "mapped_font_size",
+        "mean_size",
+        "max_size",
+    )
+    bold: bool
+    italic: bool
+    font_name: str
+    mapped_font_size: TextSize
+    mean_size: float
+    max_size: float
+
     def __init__(
         self,
-        bold,
-        italic,
-        font_name,
+        bold: bool,
+        italic: bool,
+        font_name: str,
         mapped_font_size: TextSize,
         mean_size: float,
         max_size: float,
-    ):
-        self.bold = bold
-        self.italic = italic
-        self.font_name = font_name
-        self.mapped_font_size = mapped_font_size
-        self.mean_size = mean_size
-        self.max_size = max_size
+    ) -> None:
+        set_attribute = super().__setattr__
+        set_attribute("bold", bold)
+        set_attribute("italic", italic)
+        set_attribute("font_name", font_name)
+        set_attribute("mapped_font_size", mapped_font_size)
+        set_attribute("mean_size", mean_size)
+        set_attribute("max_size", max_size)
+
+    def __setattr__(self, key: str, value: object) -> NoReturn:
+        raise AttributeError("Style is immutable")
+
+    def __delattr__(self, key: str) -> NoReturn:
+        raise AttributeError("Style is immutable")
+
+    def __reduce__(self) -> Tuple[type, Tuple[bool, bool, str, TextSize, float, float]]:
+        return Style, self.key()
+
+    def key(self) -> Tuple[bool, bool, str, TextSize, float, float]:
+        """
+        @return: all style attributes, identical keys share one Style instance
+        """
+        return (
+            self.bold,
+            self.italic,
+            self.font_name,
+            self.mapped_font_size,
+            self.mean_size,
+            self.max_size,
+        )
 
     @classmethod
     def from_json(cls, data: dict):
@@ -82,3 +124,7 @@ class Style:
             )
         else:
             return False
+
+    def __hash__(self) -> int:
+        # consistent with __eq__, which compares mapped size & boldness only
+        return hash((self.mapped_font_size, self.bold))
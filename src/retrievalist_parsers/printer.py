@@ -1,13 +1,17 @@
+import functools
+import io
 import json
-from typing import Iterator
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional
 
 from retrievalist_parsers import utils
+from retrievalist_parsers.analysis.styledistribution import StyleDistribution
 from retrievalist_parsers.hierarchy.traversal import traverse_in_order
 from retrievalist_parsers.model.document import (
     Section,
     StructuredPdfDocument,
     TextElement,
 )
+from retrievalist_parsers.model.index import SectionIndex
 from retrievalist_parsers.model.style import Style
 
 
@@ -75,39 +79,171 @@ class PrettyStringFilePrinter(PrettyStringPrinter):
 class ElementTextEncoder(json.JSONEncoder):
     def default(self, e):
         if isinstance(e, TextElement):
-            properties = e.__dict__.copy()
+            properties = utils.object_to_dict(e)
             properties["data"] = e._data.get_text()
             return properties
         else:
             return super().default(e)
 
 
-def encode_pdf_element(obj):
+def encode_pdf_element(obj: object, section_index: bool = False) -> Dict[str, Any]:
     """
     customizse pdf element encoding
     - get rid of detailed pdf information retrieved from pdfminer like bounding box coords
     - use mapped fontsize name instead of ordinal value
     @param obj:
+    @param section_index: documents include their section index (see @SectionIndex),
+        written after the elements
     @return:
     """
     if isinstance(obj, TextElement):
         properties = utils.exclude_keys_from_dict(
-            obj.__dict__.copy(), ("_data", "_text")
+            utils.object_to_dict(obj),
+            ("_data", "_text", "_bbox", "_tokens", "_vertical"),
         )
         properties["text"] = obj.text
         properties["style"] = encode_pdf_element(obj.style)
         return properties
+    elif isinstance(obj, StructuredPdfDocument):
+        properties = utils.exclude_keys_from_dict(
+            utils.object_to_dict(obj),
+            (
+                "_elements",
+                "_version",
+                "_owned",
+                "_traversal_cache",
+                "_text_cache",
+                "_index_cache",
+            ),
+        )
+        properties["elements"] = obj.elements
+        if section_index:
+            properties["section_index"] = obj.section_index
+        return properties
+    elif isinstance(obj, (SectionIndex, StyleDistribution)):
+        return obj.to_json()
+    elif isinstance(obj, Section):
+        return {"heading": obj.heading, "children": obj.children, "level": obj.level}
     elif isinstance(obj, Style):
-        properties = obj.__dict__.copy()
+        properties = utils.object_to_dict(obj)
         properties["mapped_font_size"] = str(obj.mapped_font_size.name)
         return properties
     else:
-        return obj.__dict__
+        return utils.object_to_dict(obj)
+
+
+def pdf_element_encoder(section_index: bool = False) -> Callable[[object], Any]:
+    """
+    @return: json default function, see @encode_pdf_element
+    """
+    if not section_index:
+        return encode_pdf_element
+    return functools.partial(encode_pdf_element, section_index=True)
 
 
 class JsonStringPrinter(Printer):
     def print(self, document: StructuredPdfDocument, *args, **kwargs):
-        return json.dumps(document, default=encode_pdf_element, indent=4)
+        """
+        @param kwargs:
+            Keyword Args:
+                section_index (bool): include the section index of the document
+        """
+        return json.dumps(
+            document,
+            default=pdf_element_encoder(kwargs.get("section_index", False)),
+            indent=4,
+        )
+
+
+class JsonStreamWriter:
+    """
+    Writes documents as json incrementally, sections are encoded one by one
+    and written in buffered chunks.
+    - output equals json.dump(document, default=encode_pdf_element, indent=4),
+      if compact is False (see @JsonStringPrinter).
+    - compact output has no indentation & whitespace.
+    """
+
+    def __init__(
+        self,
+        sink: IO[Any],
+        compact: bool = False,
+        flush_size: int = 1 << 16,
+        section_index: bool = False,
+    ) -> None:
+        """
+        @param sink: writable text or binary file object
+        @param compact: skip indentation
+        @param flush_size: buffered characters, written to the sink once exceeded
+        @param section_index: documents include their section index,
+            see @encode_pdf_element
+        """
+        self.sink = sink
+        self.compact = compact
+        self.flush_size = flush_size
+        self._default = pdf_element_encoder(section_index)
+        # sinks that are no io classes (e.g. codecs writers) get text, unless binary
+        self._binary = isinstance(
+            sink, (io.RawIOBase, io.BufferedIOBase)
+        ) or "b" in getattr(sink, "mode", "")
+        self._buffer: List[str] = []
+        self._buffered = 0
+
+    def _encode(self, obj: object, level: int) -> str:
+        if self.compact:
+            return json.dumps(obj, default=self._default, separators=(",", ":"))
+        encoded = json.dumps(obj, default=self._default, indent=4)
+        return encoded.replace("\n", "\n" + "    " * level)
+
+    def _write(self, text: str) -> None:
+        self._buffer.append(text)
+        self._buffered += len(text)
+        if self._buffered >= self.flush_size:
+            self.flush()
+
+    def flush(self) -> None:
+        data = "".join(self._buffer)
+        self._buffer.clear()
+        self._buffered = 0
+        self.sink.write(data.encode() if self._binary else data)
+
+    def write_document(self, document: StructuredPdfDocument) -> None:
+        properties = self._default(document)
+        elements = properties.pop("elements")
+        self.write_sections(elements, **properties)
+
+    def write_sections(
+        self,
+        sections: Iterable[Section],
+        metadata: Optional[Dict[str, Any]] = None,
+        **properties: Any,
+    ) -> None:
+        """
+        writes a document, whose sections are produced lazily,
+        e.g. by @HierarchyParser.parse_pdf_stream.
+        @param sections: top level sections
+        @param metadata: document metadata, written ahead of the sections
+        @param properties: further document properties, written after the sections
+        """
+        # layout of json.dump(indent=4), section items are nested on 2nd level
+        newline = "" if self.compact else "\n    "
+        item_newline = "" if self.compact else "\n        "
+        key_separator = ":" if self.compact else ": "
+
+        self._write("{" + newline + '"metadata"' + key_separator)
+        self._write(self._encode(metadata if metadata is not None else {}, 1))
+        self._write("," + newline + '"elements"' + key_separator + "[")
+        empty = True
+        for section in sections:
+            self._write(("" if empty else ",") + item_newline)
+            self._write(self._encode(section, 2))
+            empty = False
+        self._write("]" if empty else newline + "]")
+        for key, value in properties.items():
+            self._write("," + newline + json.dumps(key) + key_separator)
+            self._write(self._encode(value, 1))
+        self._write("}" if self.compact else "\n}")
+        self.flush()
 
 
 class JsonFilePrinter(Printer):
@@ -118,9 +254,18 @@ class JsonFilePrinter(Printer):
         @param kwargs:
             Keyword Args:
                 file_path (str): path to output file
+                compact (bool): skip indentation, see @JsonStreamWriter
+                flush_size (int): buffered characters per write
+                section_index (bool): include the section index of the document
         @return:
         """
         file_path = kwargs.get("file_path")
         with open(file_path, "w") as fp:
-            json.dump(document, fp=fp, default=encode_pdf_element, indent=4)
+            writer = JsonStreamWriter(
+                fp,
+                compact=kwargs.get("compact", False),
+                flush_size=kwargs.get("flush_size", 1 << 16),
+                section_index=kwargs.get("section_index", False),
+            )
+            writer.write_document(document)
         return file_path
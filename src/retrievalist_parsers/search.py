@@ -0,0 +1,181 @@
+import array
+import heapq
+import math
+import pickle
+import re
+from types import ModuleType
+from typing import Dict, List, Optional, Tuple
+
+from retrievalist_parsers.hierarchy.traversal import (
+    traverse_inorder_sections_with_content,
+)
+from retrievalist_parsers.model.document import StructuredPdfDocument
+
+np: Optional[ModuleType]
+try:
+    import numpy as np
+except ImportError:  # optional, scores are accumulated in plain dicts instead
+    np = None
+
+INDEX_VERSION = 1
+
+token_pattern = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    return token_pattern.findall(text.lower())
+
+
+class BM25Index:
+    """
+    In-memory inverted index over the sections of parsed documents, ranked with BM25.
+    - one entry per section with children (see @traverse_inorder_sections_with_content):
+      its heading and the paragraphs directly below.
+    - heading terms count heading_weight times (term frequency & section length).
+    - postings are stored as arrays of section ids & weighted term frequencies,
+      sorted by section id.
+    """
+
+    def __init__(
+        self, k1: float = 1.2, b: float = 0.75, heading_weight: float = 2.0
+    ) -> None:
+        """
+        @param k1: term frequency saturation
+        @param b: section length normalization
+        @param heading_weight: weight of heading terms compared to content terms
+        """
+        self.k1 = k1
+        self.b = b
+        self.heading_weight = heading_weight
+        # term -> (section ids, weighted term frequencies)
+        self.postings: Dict[str, Tuple[array.array[int], array.array[float]]] = {}
+        self.lengths = array.array("f")
+        # (document id, section path) per section id
+        self.sections: List[Tuple[str, str]] = []
+        self.documents: List[str] = []
+        self._total_length = 0.0
+
+    def __len__(self) -> int:
+        return len(self.sections)
+
+    def add_document(
+        self, document: StructuredPdfDocument, document_id: Optional[str] = None
+    ) -> str:
+        """
+        indexes all sections of the document, documents can be added at any time.
+        @param document_id: defaults to the file name of the document
+        @return: document id
+        """
+        if document_id is None:
+            document_id = str(document.metadata.get("filename") or len(self.documents))
+        self.documents.append(document_id)
+
+        section_index = document.section_index
+        # same order & filter as traverse_inorder_sections_with_content
+        paths = [
+            section_index.paths[position]
+            for position, section in enumerate(section_index.sections)
+            if section.children
+        ]
+        for path, (_, title, content) in zip(
+            paths, traverse_inorder_sections_with_content(document), strict=True
+        ):
+            self.add_section(document_id, path, title, content)
+        return document_id
+
+    def add_section(
+        self, document_id: str, path: str, title: str, content: str
+    ) -> None:
+        frequencies: Dict[str, float] = {}
+        for term in tokenize(title):
+            frequencies[term] = frequencies.get(term, 0.0) + self.heading_weight
+        for term in tokenize(content):
+            frequencies[term] = frequencies.get(term, 0.0) + 1.0
+
+        section_id = len(self.sections)
+        self.sections.append((document_id, path))
+        length = sum(frequencies.values())
+        self.lengths.append(length)
+        self._total_length += length
+
+        for term, frequency in frequencies.items():
+            posting = self.postings.get(term)
+            if posting is None:
+                posting = self.postings[term] = (array.array("I"), array.array("f"))
+            posting[0].append(section_id)
+            posting[1].append(frequency)
+
+    def idf(self, term: str) -> float:
+        posting = self.postings.get(term)
+        frequency = len(posting[0]) if posting else 0
+        return math.log(1 + (len(self.sections) - frequency + 0.5) / (frequency + 0.5))
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[str, str, float]]:
+        """
+        @param query: free text, tokenized like indexed sections
+        @param limit: max amount of results
+        @return: (document id, section path, score) ordered by descending score
+        """
+        terms = [term for term in set(tokenize(query)) if term in self.postings]
+        if not terms:
+            return []
+        average_length = self._total_length / len(self.sections)
+        if np is not None:
+            return self.__search_arrays(np, terms, limit, average_length)
+
+        scores: Dict[int, float] = {}
+        k1, b = self.k1, self.b
+        for term in terms:
+            idf = self.idf(term)
+            section_ids, frequencies = self.postings[term]
+            for section_id, frequency in zip(section_ids, frequencies, strict=True):
+                norm = k1 * (1 - b + b * self.lengths[section_id] / average_length)
+                scores[section_id] = scores.get(section_id, 0.0) + idf * (
+                    frequency * (k1 + 1) / (frequency + norm)
+                )
+        best = heapq.nlargest(
+            limit, scores.items(), key=lambda item: (item[1], -item[0])
+        )
+        return [(*self.sections[section_id], score) for section_id, score in best]
+
+    def __search_arrays(
+        self, numpy: ModuleType, terms: List[str], limit: int, average_length: float
+    ) -> List[Tuple[str, str, float]]:
+        lengths = numpy.frombuffer(self.lengths, dtype=numpy.float32)
+        scores = numpy.zeros(len(self.sections), dtype=numpy.float64)
+        k1, b = self.k1, self.b
+        for term in terms:
+            section_ids, frequencies = self.postings[term]
+            ids = numpy.frombuffer(section_ids, dtype=numpy.uint32)
+            frequency = numpy.frombuffer(frequencies, dtype=numpy.float32)
+            norm = k1 * (1 - b + b * lengths[ids] / average_length)
+            # section ids are unique within postings
+            scores[ids] += self.idf(term) * (frequency * (k1 + 1) / (frequency + norm))
+
+        candidates = numpy.flatnonzero(scores)
+        if len(candidates) > limit:
+            candidates = candidates[
+                numpy.argpartition(-scores[candidates], limit)[:limit]
+            ]
+        # descending score, ties in order of the sections
+        best = candidates[numpy.lexsort((candidates, -scores[candidates]))]
+        return [
+            (*self.sections[section_id], float(scores[section_id]))
+            for section_id in best
+        ]
+
+    def save(self, path: str) -> None:
+        with open(path, "wb") as fp:
+            pickle.dump(
+                (INDEX_VERSION, self.__dict__), fp, protocol=pickle.HIGHEST_PROTOCOL
+            )
+
+    @classmethod
+    def load(cls, path: str) -> "BM25Index":
+        with open(path, "rb") as fp:
+            version, state = pickle.load(fp)
+        if version != INDEX_VERSION:
+            raise ValueError("unsupported index version: {}".format(version))
+        index = cls.__new__(cls)
+        index.__dict__.update(state)
+        return index
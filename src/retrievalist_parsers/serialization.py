@@ -0,0 +1,293 @@
+"""
+Compact binary format of a StructuredPdfDocument.
+
+    header:     magic (4 bytes) | version (1 byte) | compression (1 byte)
+    body:       optionally compressed, see COMPRESSIONS
+        metadata    varint length | json
+        strings     varint count | (varint length | utf-8)*
+        styles      varint count | style*
+            style       flags | varint font_name | varint mapped_font_size
+                        | mean_size | max_size
+        sections    varint count | section*, pre-order
+            section     flags | varint level | varint child count
+                        [| varint text | varint style | varint page + 1]
+
+texts & font names are stored once in the string table,
+styles once in the style table.
+"""
+
+import json
+import lzma
+import struct
+import zlib
+from typing import BinaryIO, Callable, Dict, List, Optional, Tuple
+
+from retrievalist_parsers.model.document import (
+    DanglingTextSection,
+    Section,
+    StructuredPdfDocument,
+    TextElement,
+)
+from retrievalist_parsers.model.style import Style, TextSize
+from retrievalist_parsers.printer import encode_pdf_element
+
+MAGIC = b"RPDF"
+FORMAT_VERSION = 1
+
+COMPRESSIONS = {None: 0, "zlib": 1, "lzma": 2}
+
+_HAS_HEADING = 1
+_DANGLING = 2
+_BOLD = 1
+_ITALIC = 2
+
+# 7 bits per varint byte, the high bit marks following bytes
+_VARINT_BITS = 0x7F
+_VARINT_MORE = 0x80
+
+_sizes = struct.Struct("<dd")
+
+# see @Style.key
+_StyleKey = Tuple[bool, bool, str, TextSize, float, float]
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value > _VARINT_BITS:
+        out.append((value & _VARINT_BITS) | _VARINT_MORE)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes | memoryview, position: int) -> Tuple[int, int]:
+    value = 0
+    shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        value |= (byte & _VARINT_BITS) << shift
+        if byte < _VARINT_MORE:
+            return value, position
+        shift += 7
+
+
+def _read_small_varint(data: bytes | memoryview, position: int) -> Tuple[int, int]:
+    # ids & page numbers usually fit one byte
+    value = data[position]
+    if value > _VARINT_BITS:
+        return _read_varint(data, position)
+    return value, position + 1
+
+
+def _write_sections(
+    elements: List[Section],
+    string_id: Callable[[str], int],
+    style_id: Callable[[Style], int],
+) -> bytearray:
+    sections = bytearray()
+    _write_varint(sections, len(elements))
+    stack = list(reversed(elements))
+    while stack:
+        section = stack.pop()
+        heading = section.heading
+        flags = _HAS_HEADING if heading is not None else 0
+        if isinstance(section, DanglingTextSection):
+            flags |= _DANGLING
+        sections.append(flags)
+        _write_varint(sections, section.level or 0)
+        _write_varint(sections, len(section.children))
+        if heading is not None:
+            _write_varint(sections, string_id(heading.text or ""))
+            _write_varint(sections, style_id(heading.style))
+            _write_varint(sections, 0 if heading.page is None else heading.page + 1)
+        stack.extend(reversed(section.children))
+    return sections
+
+
+def _write_styles(
+    styles: Dict[_StyleKey, int], string_id: Callable[[str], int]
+) -> bytearray:
+    style_table = bytearray()
+    _write_varint(style_table, len(styles))
+    for bold, italic, font_name, mapped_font_size, mean_size, max_size in styles:
+        style_table.append((_BOLD if bold else 0) | (_ITALIC if italic else 0))
+        _write_varint(style_table, string_id(font_name))
+        _write_varint(style_table, int(mapped_font_size))
+        style_table += _sizes.pack(mean_size, max_size)
+    return style_table
+
+
+def dumps(document: StructuredPdfDocument, compression: Optional[str] = None) -> bytes:
+    """
+    @param document: document to serialize
+    @param compression: None, "zlib" or "lzma"
+    @return: serialized document, see module description
+    """
+    if compression not in COMPRESSIONS:
+        raise ValueError("unknown compression: {}".format(compression))
+
+    strings: Dict[str, int] = {}
+    styles: Dict[_StyleKey, int] = {}
+
+    def string_id(text: str) -> int:
+        index = strings.get(text)
+        if index is None:
+            index = strings[text] = len(strings)
+        return index
+
+    def style_id(style: Style) -> int:
+        key = style.key()
+        index = styles.get(key)
+        if index is None:
+            index = styles[key] = len(styles)
+        return index
+
+    sections = _write_sections(document.elements, string_id, style_id)
+
+    body = bytearray()
+    metadata = json.dumps(document.metadata, default=encode_pdf_element).encode()
+    _write_varint(body, len(metadata))
+    body += metadata
+
+    # font names are part of the string table as well
+    style_table = _write_styles(styles, string_id)
+
+    _write_varint(body, len(strings))
+    for text in strings:
+        encoded = text.encode()
+        _write_varint(body, len(encoded))
+        body += encoded
+    body += style_table
+    body += sections
+
+    header = MAGIC + bytes((FORMAT_VERSION, COMPRESSIONS[compression]))
+    if compression == "zlib":
+        return header + zlib.compress(body)
+    if compression == "lzma":
+        return header + lzma.compress(body)
+    return header + body
+
+
+def dump(
+    document: StructuredPdfDocument, fp: BinaryIO, compression: Optional[str] = None
+) -> None:
+    fp.write(dumps(document, compression=compression))
+
+
+def _decompress(data: bytes) -> bytes | memoryview:
+    if data[:4] != MAGIC:
+        raise ValueError("not a serialized document")
+    version, compression = data[4], data[5]
+    if version != FORMAT_VERSION:
+        raise ValueError("unsupported format version: {}".format(version))
+    if compression == COMPRESSIONS["zlib"]:
+        return zlib.decompress(data[6:])
+    if compression == COMPRESSIONS["lzma"]:
+        return lzma.decompress(data[6:])
+    if compression == COMPRESSIONS[None]:
+        return memoryview(data)[6:]
+    raise ValueError("unknown compression: {}".format(compression))
+
+
+def _read_strings(body: bytes | memoryview, position: int) -> Tuple[List[str], int]:
+    count, position = _read_varint(body, position)
+    strings = []
+    for _ in range(count):
+        length, position = _read_varint(body, position)
+        strings.append(str(body[position : position + length], "utf-8"))
+        position += length
+    return strings, position
+
+
+def _read_styles(
+    body: bytes | memoryview, position: int, strings: List[str]
+) -> Tuple[List[Style], int]:
+    count, position = _read_varint(body, position)
+    styles = []
+    for _ in range(count):
+        flags = body[position]
+        font_name, position = _read_varint(body, position + 1)
+        mapped_font_size, position = _read_varint(body, position)
+        mean_size, max_size = _sizes.unpack_from(body, position)
+        position += _sizes.size
+        styles.append(
+            Style(
+                bold=bool(flags & _BOLD),
+                italic=bool(flags & _ITALIC),
+                font_name=strings[font_name],
+                mapped_font_size=TextSize(mapped_font_size),
+                mean_size=mean_size,
+                max_size=max_size,
+            )
+        )
+    return styles, position
+
+
+def _read_sections(
+    body: bytes | memoryview, position: int, strings: List[str], styles: List[Style]
+) -> List[Section]:
+    count, position = _read_varint(body, position)
+    elements: List[Section] = []
+    # parent of the current section (None at top level)
+    # & amount of siblings still to read, outer parents are stacked
+    parent: Optional[Section] = None
+    remaining = count
+    stack: List[Tuple[Optional[Section], int]] = []
+    while True:
+        if not remaining:
+            if not stack:
+                break
+            parent, remaining = stack.pop()
+            continue
+        remaining -= 1
+
+        # single byte varints are read inline
+        flags, level, child_count = body[position : position + 3]
+        position += 3
+        if level > _VARINT_BITS or child_count > _VARINT_BITS:
+            level, position = _read_varint(body, position - 2)
+            child_count, position = _read_varint(body, position)
+        section: Section
+        if flags & _DANGLING:
+            section = DanglingTextSection()
+            section.set_level(level)
+        else:
+            section = Section(None, level)
+        if flags & _HAS_HEADING:
+            text, position = _read_small_varint(body, position)
+            style, position = _read_small_varint(body, position)
+            page, position = _read_small_varint(body, position)
+            section.heading = TextElement(
+                None, styles[style], strings[text], page - 1 if page else None
+            )
+        if parent is None:
+            elements.append(section)
+        else:
+            parent.append_children(section)
+        if child_count:
+            stack.append((parent, remaining))
+            parent, remaining = section, child_count
+    return elements
+
+
+def loads(data: bytes) -> StructuredPdfDocument:
+    """
+    @param data: serialized document, created by @dumps
+    @return: document with the same sections, styles & metadata
+    """
+    body = _decompress(data)
+
+    length, position = _read_varint(body, 0)
+    metadata = json.loads(bytes(body[position : position + length]))
+    position += length
+
+    strings, position = _read_strings(body, position)
+    styles, position = _read_styles(body, position, strings)
+    elements = _read_sections(body, position, strings, styles)
+
+    document = StructuredPdfDocument(elements)
+    document.metadata.update(metadata)
+    return document
+
+
+def load(fp: BinaryIO) -> StructuredPdfDocument:
+    return loads(fp.read())
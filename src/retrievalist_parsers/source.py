@@ -1,17 +1,62 @@
+import asyncio
+import contextlib
+import copy
+import hashlib
+import io
 import itertools
-from typing import Any, Generator
+import math
+import mmap
+import threading
+import weakref
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import (
+    Any,
+    AsyncGenerator,
+    BinaryIO,
+    Callable,
+    Dict,
+    Generator,
+    Hashable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    cast,
+)
 
-from pdfminer.high_level import extract_pages
 from pdfminer.layout import (
     LAParams,
     LTAnno,
     LTChar,
     LTFigure,
+    LTPage,
     LTTextBoxHorizontal,
     LTTextBoxVertical,
     LTTextContainer,
     LTTextLineHorizontal,
 )
+from pdfminer.utils import FileOrName
+
+from retrievalist_parsers import utils
+from retrievalist_parsers.analysis.charstats import line_stats
+from retrievalist_parsers.analysis.sampling import PageSampler
+from retrievalist_parsers.analysis.styledistribution import (
+    StyleAnalyser,
+    StyleDistribution,
+    count_sizes,
+)
+from retrievalist_parsers.cache import LayoutCache, file_digest
+from retrievalist_parsers.layout import (
+    PageLayout,
+    count_pages,
+    extract_recorded_pages,
+    line_params_key,
+)
+
+# default layout analysis settings of @FileSource, the instance is shared (see @read)
+DEFAULT_LA_PARAMS = LAParams(boxes_flow=0.3, detect_vertical=True, line_margin=0.3)
 
 
 class Source:
@@ -19,45 +64,374 @@ class Source:
     Abstract interface to read a PDF from somewhere.
     """
 
-    def __init__(self, uri=None):
+    # set while a cancellable parse runs, checked once per page (see @CancellableSource)
+    cancel_event: Optional[threading.Event] = None
+
+    def __init__(self, uri: Any = None) -> None:
         """
 
         @param uri: points to pdf that should be read
         """
         self.uri = uri
 
-    def config(self):
+    def config(self) -> Optional[Dict[str, Any]]:
         """
         get source configuration
         @return:
         """
         pass
 
-    def read(self, *args, **kwargs) -> Generator[LTTextContainer, Any, None]:
+    def read(
+        self, *args: Any, **kwargs: Any
+    ) -> Generator[LTTextContainer[Any], Any, None]:
         """
         yields flat list of paragraphs within a document.
         @param args:
         @param kwargs:
         @return:
         """
-        pass
+        raise NotImplementedError
+
+    def count_sizes(self) -> StyleDistribution:
+        """
+        analyse style distribution of the whole document
+        (first pass of the HierarchyParser).
+        @return:
+        """
+        return count_sizes(self.read())
+
+    def release(self) -> None:
+        """
+        free state kept between reads (e.g. recorded layouts),
+        the source stays readable.
+        """
+
+    def check_cancelled(self) -> None:
+        """
+        @raise asyncio.CancelledError: if the cancel event is set
+        """
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise asyncio.CancelledError()
+
+    async def read_async(
+        self,
+        *args: Any,
+        executor: Optional[Executor] = None,
+        batch_size: int = 64,
+        **kwargs: Any,
+    ) -> AsyncGenerator[LTTextContainer[Any], None]:
+        """
+        async iterator form of @read,
+        elements are produced in a thread of the given executor.
+        if the consumer stops (e.g. its task is cancelled),
+        the underlying read is closed as well.
+        @param executor: thread based executor,
+            defaults to the event loops default executor
+        @param batch_size: elements produced per executor call
+        @param args: see @read
+        @param kwargs: see @read
+        """
+        loop = asyncio.get_running_loop()
+        elements = self.read(*args, **kwargs)
+        pending = None
+        try:
+            while True:
+                pending = loop.run_in_executor(
+                    executor, _next_batch, elements, batch_size
+                )
+                batch = await pending
+                pending = None
+                if not batch:
+                    return
+                for element in batch:
+                    yield element
+        finally:
+            # the generator can only be closed once its current batch is done
+            if pending is None:
+                loop.run_in_executor(executor, elements.close)
+            else:
+                pending.add_done_callback(
+                    lambda _: loop.run_in_executor(executor, elements.close)
+                )
+
+
+class CancellableSource(Source):
+    """
+    Wraps a source and stops reading once the given event is set,
+    used to cancel parsing running in an executor.
+    - the event is checked once per page, manager events are checked via IPC.
+    - the first pass of the wrapped source (see @count_sizes) is cancellable as well,
+      if the source checks the event itself, like @FileSource.
+    - other attributes are looked up on the wrapped source.
+    """
+
+    def __init__(self, source: Source, cancel_event: threading.Event) -> None:
+        """
+        @param source: wrapped source
+        @param cancel_event: threading.Event or a multiprocessing manager event
+        """
+        super().__init__(uri=source.uri)
+        self.source = source
+        self.cancel_event = cancel_event
+
+    def __getattr__(self, name: str) -> Any:
+        # only called for attributes not found on the wrapper
+        if name == "source":
+            raise AttributeError(name)
+        return getattr(self.source, name)
+
+    def config(self) -> Optional[Dict[str, Any]]:
+        return self.source.config()
+
+    def release(self) -> None:
+        self.source.release()
+
+    @contextlib.contextmanager
+    def __cancellable(self) -> Iterator[None]:
+        previous = self.source.cancel_event
+        self.source.cancel_event = self.cancel_event
+        try:
+            yield
+        finally:
+            self.source.cancel_event = previous
+
+    def count_sizes(self) -> StyleDistribution:
+        self.check_cancelled()
+        with self.__cancellable():
+            return self.source.count_sizes()
+
+    def read(
+        self, *args: Any, **kwargs: Any
+    ) -> Generator[LTTextContainer[Any], Any, None]:
+        elements = self.source.read(*args, **kwargs)
+        page = None
+        try:
+            for position, element in enumerate(elements):
+                element_page = getattr(element, "page", None)
+                if position == 0 or element_page != page:
+                    page = element_page
+                    self.check_cancelled()
+                yield element
+        finally:
+            elements.close()
 
 
 class FileSource(Source):
-    def __init__(
+    def __init__(  # ruff: ignore[too-many-arguments]
         self,
-        file_path: str,
-        page_numbers=None,
-        la_params=LAParams(boxes_flow=0.3, detect_vertical=True, line_margin=0.3),
-    ):
+        file_path: Optional[str],
+        page_numbers: Optional[Sequence[int]] = None,
+        la_params: LAParams = DEFAULT_LA_PARAMS,
+        *,
+        workers: Optional[int] = None,
+        pages_per_shard: Optional[int] = None,
+        cache: Optional[LayoutCache] = None,
+        sampler: Optional[PageSampler] = None,
+    ) -> None:
+        """
+        @param file_path: pdf file
+        @param page_numbers: zero based page indices to read, all pages if not set
+        @param la_params: pdfminer layout analysis settings
+        @param workers: if > 1, page ranges are analysed in a pool of processes
+        @param pages_per_shard: pages per worker task,
+            by default each worker gets ~4 tasks
+        @param cache: persistent cache for the yielded elements of each page
+        @param sampler: analyse style distribution on a sample of pages only,
+            see @count_sizes
+        """
         super().__init__(uri=file_path)
         self.page_numbers = page_numbers
         self.la_params = la_params
+        self.workers = workers
+        self.pages_per_shard = pages_per_shard
+        self.cache = cache
+        self.sampler = sampler
+        # line level layout of the last complete read, see @__layout_pages
+        self._layout_cache: Optional[Tuple[Any, List[PageLayout]]] = None
+        self._digest: Optional[str] = None
+
+    def config(self) -> Dict[str, Any]:
+        return utils.exclude_keys_from_dict(self.__dict__, ("_layout_cache", "_digest"))
+
+    def _pdf_file(self) -> FileOrName:
+        """
+        @return: file path or seekable binary file object, read by pdfminer
+        """
+        pdf_file: FileOrName = self.uri
+        return pdf_file
+
+    def _compute_digest(self) -> str:
+        return file_digest(self.uri)
+
+    def _shard(self, page_numbers: Sequence[int], la_params: LAParams) -> "FileSource":
+        """
+        picklable copy of this source, restricted to given pages.
+        used by worker tasks of the parallel mode.
+        @param la_params: effective params of the read, see @read
+        """
+        return FileSource(
+            self.uri, page_numbers=page_numbers, la_params=la_params, cache=self.cache
+        )
+
+    @property
+    def digest(self) -> str:
+        if self._digest is None:
+            self._digest = self._compute_digest()
+        return self._digest
+
+    def release(self) -> None:
+        """
+        drop the recorded line layout, the next read interprets the pdf again.
+        """
+        self._layout_cache = None
+
+    def __page_count(self) -> int:
+        if not self.cache:
+            return count_pages(self._pdf_file())
+        key = self.cache.page_count_key(self.digest)
+        page_count: Optional[int] = self.cache.get(key)
+        if page_count is None:
+            page_count = count_pages(self._pdf_file())
+            self.cache.put(key, page_count)
+        return page_count
+
+    def __select_pages(self, page_numbers: Optional[Sequence[int]]) -> List[int]:
+        """
+        @return: zero based indices of the pages to read, in document order
+        """
+        page_count = self.__page_count()
+        selected = sorted(set(page_numbers) if page_numbers else range(page_count))
+        return [page for page in selected if page < page_count]
+
+    def __page_keys(
+        self,
+        cache: LayoutCache,
+        page_numbers: Optional[Sequence[int]],
+        la_params: LAParams,
+    ) -> List[str]:
+        return [
+            cache.page_key(self.digest, la_params, page)
+            for page in self.__select_pages(page_numbers)
+        ]
+
+    def __is_cached(
+        self, page_numbers: Optional[Sequence[int]], la_params: LAParams
+    ) -> bool:
+        cache = self.cache
+        return cache is not None and all(
+            key in cache for key in self.__page_keys(cache, page_numbers, la_params)
+        )
+
+    @staticmethod
+    def __layout_key(
+        page_numbers: Optional[Sequence[int]], la_params: LAParams
+    ) -> Hashable:
+        return (
+            tuple(page_numbers) if page_numbers else None,
+            line_params_key(la_params),
+        )
+
+    def __is_parallel(
+        self, page_numbers: Optional[Sequence[int]], la_params: LAParams
+    ) -> bool:
+        """
+        layout analysis is only spread over processes,
+        if there is no recorded layout to replay.
+        """
+        if not self.workers or self.workers <= 1:
+            return False
+        if self.__is_cached(page_numbers, la_params):
+            return False
+        return self._layout_cache is None or self._layout_cache[0] != self.__layout_key(
+            page_numbers, la_params
+        )
+
+    def __map_shards(
+        self,
+        task: Callable[["FileSource", int], Any],
+        page_numbers: Optional[Sequence[int]],
+        la_params: LAParams,
+    ) -> Generator[Any, None, None]:
+        """
+        runs @task on consecutive page ranges in a process pool.
+        @return: yields results in page order
+        """
+        selected = self.__select_pages(page_numbers)
+        size = self.pages_per_shard or max(
+            1, math.ceil(len(selected) / ((self.workers or 1) * 4))
+        )
+
+        executor = ProcessPoolExecutor(max_workers=self.workers)
+        try:
+            futures = [
+                executor.submit(task, self._shard(selected[i : i + size], la_params), i)
+                for i in range(0, len(selected), size)
+            ]
+            for future in futures:
+                self.check_cancelled()
+                yield future.result()
+        finally:
+            # stop pending shards if the consumer stops early
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def count_sizes(self) -> StyleDistribution:
+        if self.sampler:
+            selection = self.sampler.select(self.__select_pages(self.page_numbers))
+            if selection[0]:
+                distribution = self.sampler.analyse(
+                    selection, lambda pages: self.read(override_page_numbers=pages)
+                )
+                if distribution is not None:
+                    return distribution
+            # small document or unstable sample, analyse all pages
+
+        if not self.__is_parallel(self.page_numbers, self.la_params):
+            return super().count_sizes()
+
+        analyser = StyleAnalyser()
+        layouts = []
+        for partial, shard_layouts in self.__map_shards(
+            _analyse_shard, self.page_numbers, self.la_params
+        ):
+            analyser.merge(partial)
+            layouts.extend(shard_layouts)
+        self._layout_cache = (
+            self.__layout_key(self.page_numbers, self.la_params),
+            layouts,
+        )
+        return analyser.process_result()
+
+    def __layout_pages(
+        self, page_numbers: Optional[Sequence[int]], la_params: LAParams
+    ) -> Generator[LTPage, None, None]:
+        """
+        yields analysed pages.
+        the first pass interprets the pdf and records its text lines, following passes
+        only regroup the recorded lines into boxes (e.g. with a different line_margin).
+        @param page_numbers: selected pages
+        @param la_params: effective params of the read
+        """
+        key = self.__layout_key(page_numbers, la_params)
+        if self._layout_cache and self._layout_cache[0] == key:
+            for layout in self._layout_cache[1]:
+                self.check_cancelled()
+                yield layout.replay(la_params)
+            return
 
-    def config(self):
-        return self.__dict__
+        layouts = []
+        for page in extract_recorded_pages(
+            self._pdf_file(), laparams=la_params, page_numbers=page_numbers
+        ):
+            self.check_cancelled()
+            layouts.append(PageLayout.from_page(page))
+            yield page
+        # cache only completely read documents
+        self._layout_cache = (key, layouts)
 
-    def __handle_lt_figure(self, element: LTFigure):
+    @staticmethod
+    def __handle_lt_figure(
+        element: LTFigure, la_params: LAParams
+    ) -> Generator[LTTextBoxHorizontal, None, None]:
         """
         sometimes pieces of text are wrongly detected as LTFigure, e.g. in slide-sets with border lines.
         -> extract text from LTFigure line by line put them into a LTTextBoxHorizontal as a workaround
@@ -67,6 +441,7 @@ class FileSource(Source):
 
         line = LTTextLineHorizontal(0)
         wrapper = LTTextBoxHorizontal()
+        wrapper.page = element.page  # type: ignore[attr-defined]
         wrapper.add(line)
 
         y_prior = element._objs[0].y0
@@ -75,10 +450,11 @@ class FileSource(Source):
             if isinstance(letter, LTChar):
                 if abs(letter.y0 - y_prior) > 0.05:
                     # new line, yield wrapper
-                    wrapper.analyze(self.la_params)
+                    wrapper.analyze(la_params)
                     yield wrapper
 
                     wrapper = LTTextBoxHorizontal()
+                    wrapper.page = element.page  # type: ignore[attr-defined]
                     line = LTTextLineHorizontal(0)
                     wrapper.add(line)
                     y_prior = letter.y0
@@ -86,8 +462,8 @@ class FileSource(Source):
                 line.add(letter)
 
     def split_boxes_by_style(
-        self, container: LTTextContainer
-    ) -> Generator[LTTextContainer, LTTextContainer, None]:
+        self, container: LTTextContainer[Any]
+    ) -> Generator[LTTextContainer[Any], LTTextContainer[Any], None]:
         """
         pdfminers paragraphs are sometimes too broad and contain lines that should be splitted into header and content
         @param container: the extracted original paragraph
@@ -108,11 +484,9 @@ class FileSource(Source):
                 size = char.size
 
             else:
-                sizes = []
-                for char in itertools.islice(line, 10):
-                    if isinstance(char, LTChar):
-                        sizes.append(char.size)
-                size = max(sizes)
+                # max size within the first 10 objects of the line,
+                # lines hold at least one character
+                size = cast("float", line_stats(line).head_size)
 
             if not stack:
                 wrapper.add(line)
@@ -125,39 +499,319 @@ class FileSource(Source):
                     # break paragraph
                     yield wrapper
                     wrapper = LTTextBoxHorizontal()
+                    wrapper.page = container.page  # type: ignore[attr-defined]
                 wrapper.add(line)
         yield wrapper
 
     def read(
-        self, override_la_params=None, override_page_numbers=None
-    ) -> Generator[LTTextContainer, Any, None]:
+        self,
+        override_la_params: Optional[LAParams] = None,
+        override_page_numbers: Optional[Sequence[int]] = None,
+    ) -> Generator[LTTextContainer[Any], Any, None]:
         pNumber = 0
         # disable boxes_flow, style based hierarchy detection is based on purely flat list of paragraphs
         # params = LAParams(boxes_flow=None, detect_vertical=False)  # setting for easy doc
         # params = LAParams(boxes_flow=0.5, detect_vertical=True) # setting for
         # column doc
+        la_params = self.la_params
         if override_la_params:
-            # use dynamic line_margin
-            self.la_params.line_margin = override_la_params.line_margin
+            # use dynamic line_margin, on a copy: la_params may be shared by sources
+            la_params = copy.copy(self.la_params)
+            la_params.line_margin = override_la_params.line_margin
         # todo, do pre-analysis in count_sizes --> are there many boxes within same line
         # todo, understand LAParams, for columns, NONE works better, for vertical only layout LAParams(boxes_flow=None, detect_vertical=False) works better!! :O
         #   do some sort of layout analyis, if there are many boxes vertically next to each other, use layout analysis
         #   - column type
         #   - straight forward document
-        for page_layout in extract_pages(
-            self.uri,
-            laparams=self.la_params,
-            page_numbers=(
-                self.page_numbers
-                if not override_page_numbers
-                else override_page_numbers
-            ),
-        ):
-            for element in page_layout:
-                element.page = pNumber
-                if isinstance(element, LTTextContainer):
-                    yield from self.split_boxes_by_style(element)
-                    # yield element
-                elif isinstance(element, LTFigure):
-                    yield from self.__handle_lt_figure(element)
+        page_numbers = (
+            self.page_numbers if not override_page_numbers else override_page_numbers
+        )
+        if self.__is_parallel(page_numbers, la_params):
+            layouts = []
+            for elements, shard_layouts in self.__map_shards(
+                _read_shard, page_numbers, la_params
+            ):
+                layouts.extend(shard_layouts)
+                yield from elements
+            self._layout_cache = (self.__layout_key(page_numbers, la_params), layouts)
+            return
+
+        if self.cache:
+            yield from self.__read_cached(self.cache, page_numbers, la_params)
+            return
+
+        for page_layout in self.__layout_pages(page_numbers, la_params):
+            yield from self.__page_elements(page_layout, pNumber, la_params)
             pNumber += 1
+
+    def __page_elements(
+        self, page_layout: LTPage, page_number: int, la_params: LAParams
+    ) -> Generator[LTTextContainer[Any], None, None]:
+        for element in page_layout:
+            element.page = page_number  # type: ignore[attr-defined]
+            if isinstance(element, LTTextContainer):
+                yield from self.split_boxes_by_style(element)
+                # yield element
+            elif isinstance(element, LTFigure):
+                yield from self.__handle_lt_figure(element, la_params)
+
+    def __read_cached(
+        self,
+        cache: LayoutCache,
+        page_numbers: Optional[Sequence[int]],
+        la_params: LAParams,
+    ) -> Generator[LTTextContainer[Any], None, None]:
+        """
+        serve elements from cache if all selected pages are cached,
+        otherwise analyse pages and cache them.
+        """
+        keys = self.__page_keys(cache, page_numbers, la_params)
+        pages = [cache.get(key) for key in keys]
+        if None not in pages:
+            for page_number, elements in enumerate(pages):
+                self.check_cancelled()
+                for element in elements:
+                    if hasattr(element, "page"):
+                        element.page = page_number
+                    yield element
+            return
+
+        for page_number, page_layout in enumerate(
+            self.__layout_pages(page_numbers, la_params)
+        ):
+            elements = list(self.__page_elements(page_layout, page_number, la_params))
+            cache.put(keys[page_number], elements)
+            yield from elements
+
+
+# objects supporting the buffer protocol, read without copying
+BufferLike = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+
+class BufferReader(io.RawIOBase):
+    """
+    seekable binary file object on top of a buffer (bytes, memoryview, mmap...),
+    the buffer is not copied.
+    """
+
+    def __init__(self, buffer: BufferLike) -> None:
+        super().__init__()
+        self._view = memoryview(buffer).cast("B")
+        self._position = 0
+
+    @staticmethod
+    def readable() -> bool:
+        return True
+
+    @staticmethod
+    def seekable() -> bool:
+        return True
+
+    def readinto(self, b: Any) -> int:
+        target = memoryview(b).cast("B")
+        chunk = self._view[self._position : self._position + len(target)]
+        target[: len(chunk)] = chunk
+        self._position += len(chunk)
+        return len(chunk)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = len(self._view) + offset
+        else:
+            raise ValueError("invalid whence ({})".format(whence))
+        if position < 0:
+            raise ValueError("negative seek position {}".format(position))
+        self._position = position
+        return position
+
+    def tell(self) -> int:
+        return self._position
+
+    def close(self) -> None:
+        # pdfminer keeps readers in reference cycles, release the buffer right away
+        self._view.release()
+        super().close()
+
+
+class BufferSource(FileSource):
+    """
+    Reads a PDF held in memory, e.g. a request body.
+    - accepts bytes, bytearray, memoryview or any other object supporting
+      the buffer protocol.
+    - the buffer is not copied, except for the worker processes of the parallel mode.
+    """
+
+    def __init__(
+        self, data: Optional[BufferLike], name: Optional[str] = None, **kwargs: Any
+    ) -> None:
+        """
+        @param data: pdf content
+        @param name: optional file name, used as document metadata
+        @param kwargs: see @FileSource
+        """
+        super().__init__(file_path=name, **kwargs)
+        self.data = data
+
+    def config(self) -> Dict[str, Any]:
+        return utils.exclude_keys_from_dict(super().config(), ("data",))
+
+    def _buffer(self) -> BufferLike:
+        if self.data is None:
+            raise ValueError("BufferSource has no data")
+        return self.data
+
+    def _pdf_file(self) -> FileOrName:
+        return BufferReader(self._buffer())
+
+    def _compute_digest(self) -> str:
+        return hashlib.sha256(memoryview(self._buffer()).cast("B")).hexdigest()
+
+    def _shard(self, page_numbers: Sequence[int], la_params: LAParams) -> FileSource:
+        data = self._buffer()
+        return BufferSource(
+            data if isinstance(data, bytes) else bytes(data),
+            name=self.uri,
+            page_numbers=page_numbers,
+            la_params=la_params,
+            cache=self.cache,
+        )
+
+
+class MmapSource(BufferSource):
+    """
+    Reads a PDF file through a read-only memory map, the file is mapped on first access.
+    """
+
+    def __init__(self, file_path: str, **kwargs: Any) -> None:
+        super().__init__(data=None, name=file_path, **kwargs)
+        self._mmap: Optional[mmap.mmap] = None
+        self._readers: Optional[weakref.WeakSet[io.IOBase]] = None
+
+    def _buffer(self) -> BufferLike:
+        if self._mmap is None:
+            with open(self.uri, "rb") as fp:
+                self._mmap = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mmap
+
+    def _pdf_file(self) -> BufferReader:
+        reader = BufferReader(self._buffer())
+        if self._readers is None:
+            self._readers = weakref.WeakSet()
+        self._readers.add(reader)
+        return reader
+
+    def config(self) -> Dict[str, Any]:
+        return utils.exclude_keys_from_dict(super().config(), ("_mmap", "_readers"))
+
+    def _shard(self, page_numbers: Sequence[int], la_params: LAParams) -> FileSource:
+        return MmapSource(
+            self.uri, page_numbers=page_numbers, la_params=la_params, cache=self.cache
+        )
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        state["_mmap"] = None
+        state["_readers"] = None
+        return state
+
+    def close(self) -> None:
+        """
+        unmap file, reads in progress fail afterwards.
+        """
+        for reader in list(self._readers or ()):
+            reader.close()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+
+class FileObjectSource(BufferSource):
+    """
+    Reads a PDF from a binary file object.
+    - seekable file objects are read in place by pdfminer.
+    - others (e.g. sockets or request streams) are read into memory once.
+    """
+
+    def __init__(
+        self, file_object: BinaryIO, name: Optional[str] = None, **kwargs: Any
+    ) -> None:
+        """
+        @param file_object: opened in binary mode
+        @param name: optional file name, defaults to the name of the file object
+        @param kwargs: see @FileSource
+        """
+        if name is None and isinstance(getattr(file_object, "name", None), str):
+            name = file_object.name
+        seekable = isinstance(file_object, io.IOBase) and file_object.seekable()
+        super().__init__(
+            data=None if seekable else file_object.read(), name=name, **kwargs
+        )
+        self.file_object: Optional[BinaryIO] = file_object if seekable else None
+
+    def config(self) -> Dict[str, Any]:
+        return utils.exclude_keys_from_dict(super().config(), ("file_object",))
+
+    def _pdf_file(self) -> FileOrName:
+        if self.file_object is None:
+            return super()._pdf_file()
+        # seekable, see __init__
+        return cast("io.IOBase", self.file_object)
+
+    def _compute_digest(self) -> str:
+        if self.file_object is None:
+            return super()._compute_digest()
+        return file_digest(cast("io.IOBase", self.file_object))
+
+    def _shard(self, page_numbers: Sequence[int], la_params: LAParams) -> FileSource:
+        if self.file_object is None:
+            return super()._shard(page_numbers, la_params)
+        position = self.file_object.tell()
+        self.file_object.seek(0)
+        data = self.file_object.read()
+        self.file_object.seek(position)
+        return BufferSource(
+            data,
+            name=self.uri,
+            page_numbers=page_numbers,
+            la_params=la_params,
+            cache=self.cache,
+        )
+
+
+def _next_batch(
+    elements: Iterator[LTTextContainer[Any]], batch_size: int
+) -> List[LTTextContainer[Any]]:
+    return list(itertools.islice(elements, batch_size))
+
+
+def _read_shard(
+    source: FileSource, offset: int
+) -> Tuple[List[LTTextContainer[Any]], List[PageLayout]]:
+    """
+    worker task of the parallel FileSource mode.
+    @param source: source restricted to the pages of this shard
+    @param offset: index of the first page within the whole selection
+    @return: elements of the given pages and their recorded layout
+    """
+    elements = list(source.read())
+    for element in elements:
+        if hasattr(element, "page"):
+            element.page += offset
+    return elements, source._layout_cache[1] if source._layout_cache else []
+
+
+def _analyse_shard(
+    source: FileSource, offset: int
+) -> Tuple[StyleAnalyser, List[PageLayout]]:
+    """
+    worker task of the parallel FileSource mode.
+    @return: partial style analysis of the given pages and their recorded layout
+    """
+    analyser = StyleAnalyser()
+    for element in source.read():
+        analyser.consume(element)
+    return analyser, source._layout_cache[1] if source._layout_cache else []
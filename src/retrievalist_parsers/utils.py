@@ -2,7 +2,7 @@ import itertools
 import math
 import os
 from pathlib import Path
-from typing import Generator, Iterable
+from typing import Any, Dict, Generator, Iterable
 
 from pdfminer.high_level import extract_pages
 from pdfminer.layout import (
@@ -26,7 +26,22 @@ def generate_characters(text_container: LTTextContainer):
                     yield obj
 
 
-def exclude_keys_from_dict(dict_obj, exclude_keys):
+def object_to_dict(obj: object) -> Dict[str, Any]:
+    """
+    attributes of an object, including attributes stored in __slots__.
+    """
+    properties: Dict[str, Any] = {}
+    for cls in reversed(type(obj).__mro__):
+        for name in getattr(cls, "__slots__", ()):
+            if hasattr(obj, name):
+                properties[name] = getattr(obj, name)
+    properties.update(getattr(obj, "__dict__", {}))
+    return properties
+
+
+def exclude_keys_from_dict(
+    dict_obj: Dict[str, Any], exclude_keys: Iterable[str]
+) -> Dict[str, Any]:
     return {key: value for key, value in dict_obj.items() if key not in exclude_keys}
 
 
@@ -67,7 +82,7 @@ def generate_text_elements(
         page_number += 1
 
 
-def truncate(number, decimals=0):
+def truncate(number: float, decimals: int = 0) -> float:
     """
     Returns a value truncated to a specific number of decimal places.
     """
@@ -90,7 +105,7 @@ class DocumentTypeFilter:
         return filename.split(".")[-1].lower() in self.endings
 
 
-def closest_key(sorted_dict, key):
+def closest_key(sorted_dict: Any, key: float) -> float:
     "Return closest key in `sorted_dict` to given `key`."
     assert len(sorted_dict) > 0
     keys = list(itertools.islice(sorted_dict.irange(minimum=key), 1))
@@ -0,0 +1,99 @@
+import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from unittest import IsolatedAsyncioTestCase
+
+import pytest
+
+from retrievalist_parsers.analysis.profiles import first_page
+from retrievalist_parsers.analysis.sampling import PageSampler
+from retrievalist_parsers.hierarchy.parser import HierarchyParser
+from retrievalist_parsers.printer import JsonStringPrinter
+from retrievalist_parsers.source import FileSource
+
+
+class CountingSource(FileSource):
+    """
+    counts elements yielded by read, optionally blocks until released
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.count = 0
+        self.unblock = threading.Event()
+        self.unblock.set()
+
+    def read(self, *args, **kwargs):
+        for element in super().read(*args, **kwargs):
+            self.unblock.wait()
+            self.count += 1
+            yield element
+
+
+class TestAsyncParsing(IsolatedAsyncioTestCase):
+    test_doc = str(Path("tests/resources/interview_cheatsheet.pdf").absolute())
+
+    def create_source(self, cls=FileSource):
+        return cls(self.test_doc)
+
+    async def test_parse_pdf_async(self):
+        expected = JsonStringPrinter().print(
+            HierarchyParser().parse_pdf(self.create_source())
+        )
+        document = await HierarchyParser().parse_pdf_async(self.create_source())
+        self.assertEqual(expected, JsonStringPrinter().print(document))
+
+    async def test_parse_pdf_async_in_process(self):
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            parser = HierarchyParser(executor=executor, max_concurrency=1)
+            documents = await asyncio.gather(
+                parser.parse_pdf_async(self.create_source()),
+                parser.parse_pdf_async(self.create_source()),
+            )
+        self.assertEqual(
+            JsonStringPrinter().print(documents[0]),
+            JsonStringPrinter().print(documents[1]),
+        )
+        self.assertEqual(9, len(documents[0].elements))
+
+    async def test_read_async(self):
+        expected = [e.get_text() for e in self.create_source().read()]
+        elements = [e.get_text() async for e in self.create_source().read_async()]
+        self.assertEqual(expected, elements)
+
+    async def test_cancel_stops_reading(self):
+        source = self.create_source(CountingSource)
+        source.unblock.clear()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            task = asyncio.create_task(
+                HierarchyParser(executor=executor).parse_pdf_async(source)
+            )
+            await asyncio.sleep(0.5)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            source.unblock.set()
+        # the worker stops at the end of the page it was blocked on
+        page_elements = len(list(first_page(self.create_source().read())))
+        self.assertGreaterEqual(page_elements, source.count)
+        self.assertLessEqual(1, source.count)
+
+    async def test_parse_pdf_async_uses_sampler(self):
+        test_doc = str(Path("tests/resources/KnowingThatVsKnowingHow.pdf").absolute())
+        expected = FileSource(test_doc).count_sizes()
+        source = FileSource(test_doc, sampler=PageSampler(budget=4, min_pages=2))
+        document = await HierarchyParser().parse_pdf_async(source)
+        # the first pass of the wrapped source analysed a sample only
+        self.assertLess(
+            document.style_distribution.amount_values, expected.amount_values
+        )
+
+    async def test_close_shuts_down_manager(self):
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            with HierarchyParser(executor=executor) as parser:
+                await parser.parse_pdf_async(self.create_source())
+                manager = parser._manager
+                self.assertIsNotNone(manager)
+            self.assertIsNone(parser._manager)
+        self.assertFalse(manager._process.is_alive())
@@ -0,0 +1,106 @@
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import patch
+
+import pytest
+from pdfminer.layout import LAParams
+
+from retrievalist_parsers import source
+from retrievalist_parsers.cache import LayoutCache
+from retrievalist_parsers.hierarchy.parser import HierarchyParser
+from retrievalist_parsers.printer import JsonStringPrinter
+from retrievalist_parsers.source import FileSource
+
+
+class TestLayoutCache(TestCase):
+    test_doc = str(Path("tests/resources/lorem.pdf").absolute())
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def create_source(self, **kwargs):
+        return FileSource(
+            self.test_doc, cache=LayoutCache(self.directory.name), **kwargs
+        )
+
+    @staticmethod
+    def describe(elements):
+        return [(getattr(e, "page", None), e.bbox, e.get_text()) for e in elements]
+
+    def test_cache_hit_skips_layout_analysis(self):
+        cold = self.describe(self.create_source().read())
+
+        with patch.object(source, "extract_recorded_pages", side_effect=AssertionError):
+            warm = self.describe(self.create_source().read())
+
+        self.assertEqual(cold, warm)
+
+    def test_pages_are_shared_between_selections(self):
+        list(self.create_source().read())
+
+        with patch.object(source, "extract_recorded_pages", side_effect=AssertionError):
+            selected = self.describe(self.create_source(page_numbers=[0]).read())
+
+        self.assertEqual({0}, {page for page, _, _ in selected if page is not None})
+
+    def test_layout_params_are_part_of_the_key(self):
+        list(self.create_source().read())
+
+        other_source = self.create_source(la_params=LAParams(char_margin=1.0))
+        with patch.object(
+            source, "extract_recorded_pages", wraps=source.extract_recorded_pages
+        ) as extract:
+            list(other_source.read())
+        self.assertEqual(1, extract.call_count)
+
+    def test_parsing_keeps_the_default_params(self):
+        default_params = vars(FileSource(self.test_doc).la_params).copy()
+        expected = JsonStringPrinter().print(
+            HierarchyParser().parse_pdf(self.create_source())
+        )
+        self.assertEqual(default_params, vars(FileSource(self.test_doc).la_params))
+
+        # same keys on the next parse, no layout analysis
+        with patch.object(source, "extract_recorded_pages", side_effect=AssertionError):
+            document = HierarchyParser().parse_pdf(self.create_source())
+        self.assertEqual(expected, JsonStringPrinter().print(document))
+
+    def test_evict_least_recently_used(self):
+        cache = LayoutCache(self.directory.name, max_size=250)
+        for key in ("a1", "b2", "c3"):
+            cache.put(key, b"x" * 80)
+            os.utime(cache._path(key), (0, {"a1": 1, "b2": 3, "c3": 2}[key]))
+
+        cache.put("d4", b"x" * 80)
+
+        self.assertNotIn("a1", cache)
+        self.assertNotIn("c3", cache)
+        self.assertIn("b2", cache)
+        self.assertIn("d4", cache)
+        self.assertLessEqual(cache.size(), 250)
+
+    def test_replace_entry(self):
+        cache = LayoutCache(self.directory.name)
+        cache.put("a1", [1])
+        cache.put("a1", [2])
+        self.assertEqual([2], cache.get("a1"))
+        self.assertEqual([], list(Path(self.directory.name).rglob(".*.tmp")))
+
+    def test_failed_put_leaves_no_temporary_file(self):
+        cache = LayoutCache(self.directory.name)
+        with pytest.raises((pickle.PicklingError, AttributeError)):
+            cache.put("a1", lambda: None)
+        with (
+            patch.object(os, "replace", side_effect=OSError("disk full")),
+            pytest.raises(OSError, match="disk full"),
+        ):
+            cache.put("a1", [1])
+
+        self.assertNotIn("a1", cache)
+        self.assertEqual([], list(Path(self.directory.name).rglob(".*.tmp")))
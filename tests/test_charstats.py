@@ -0,0 +1,54 @@
+import itertools
+from pathlib import Path
+from unittest import TestCase
+
+from pdfminer.layout import LAParams, LTTextBoxHorizontal
+
+from retrievalist_parsers import utils
+from retrievalist_parsers.analysis.charstats import BoxStats, line_stats, line_text
+from retrievalist_parsers.source import FileSource
+
+
+class TestCharStats(TestCase):
+    paper = str(Path("tests/resources/paper.pdf").absolute())
+
+    @staticmethod
+    def boxes(source, line_margin=0.5):
+        return [
+            element
+            for element in source.read(
+                override_la_params=LAParams(line_margin=line_margin)
+            )
+            if isinstance(element, LTTextBoxHorizontal)
+        ]
+
+    def test_box_stats_equal_pdfminer(self):
+        for box in self.boxes(FileSource(self.paper)):
+            stats = BoxStats(box)
+
+            self.assertEqual(box.get_text(), stats.text)
+            self.assertEqual(
+                list(itertools.islice(utils.generate_words(box), 3)), stats.tokens()
+            )
+            chars = list(utils.generate_characters(box))
+            self.assertEqual(len(chars), len(stats.sizes))
+            self.assertEqual(max(char.size for char in chars), stats.max_size)
+
+    def test_lines_scanned_once(self):
+        source = FileSource(self.paper)
+        first = self.boxes(source)
+        line = next(iter(first[0]))
+        stats = line_stats(line)
+
+        # copies of the lines are regrouped into other boxes, stats & text stay valid
+        regrouped = self.boxes(source, line_margin=0.2)
+        (replica,) = [
+            other
+            for box in regrouped
+            for other in box
+            if getattr(other, "_char_stats", None) is stats
+        ]
+        self.assertIsNot(line, replica)
+        self.assertIs(stats, line_stats(line))
+        self.assertEqual(line.get_text(), line_text(line))
+        self.assertEqual(line.get_text(), line_text(replica))
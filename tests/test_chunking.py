@@ -0,0 +1,93 @@
+from pathlib import Path
+from unittest import TestCase
+
+from retrievalist_parsers.chunking import SectionChunker
+from retrievalist_parsers.hierarchy.parser import HierarchyParser
+from retrievalist_parsers.model.document import (
+    Section,
+    StructuredPdfDocument,
+    TextElement,
+)
+from retrievalist_parsers.source import FileSource
+
+
+def section(text, level, *children):
+    element = Section(TextElement(None, None, text=text), level)
+    for child in children:
+        element.append_children(child)
+    return element
+
+
+class TestSectionChunker(TestCase):
+    paper = str(Path("tests/resources/paper.pdf").absolute())
+
+    def setUp(self) -> None:
+        self.document = StructuredPdfDocument(
+            [
+                section("Intro", 0, section("First paragraph.", 1)),
+                section(
+                    "Methods",
+                    0,
+                    section("Short one.", 1),
+                    section(
+                        "Setup", 1, section("One. Two words. Three words here.", 2)
+                    ),
+                    section("Closing words.", 1),
+                ),
+            ]
+        )
+
+    def test_breadcrumb_prefix(self):
+        chunks = list(SectionChunker(max_length=100).chunk(self.document))
+
+        self.assertEqual(["1", "2", "2.2"], [chunk.path for chunk in chunks])
+        self.assertEqual("Intro\nFirst paragraph.", chunks[0].text)
+        self.assertEqual("Methods\nShort one.\nClosing words.", chunks[1].text)
+        self.assertEqual(
+            "Methods > Setup\nOne. Two words. Three words here.", chunks[2].text
+        )
+        self.assertEqual(["Methods", "Setup"], chunks[2].breadcrumb)
+
+    def test_split_at_sentences(self):
+        chunks = list(SectionChunker(max_length=40).chunk(self.document))
+
+        self.assertEqual(
+            ["Methods > Setup\nOne. Two words.", "Methods > Setup\nThree words here."],
+            [chunk.text for chunk in chunks if chunk.path == "2.2"],
+        )
+        for chunk in chunks:
+            self.assertEqual(len(chunk.text), chunk.length)
+            self.assertLessEqual(chunk.length, 40)
+
+    def test_length_function(self):
+        chunker = SectionChunker(max_length=6, length_function=lambda text: 1)
+        chunks = list(chunker.chunk(self.document))
+
+        # prefix, separators & each paragraph count 1
+        self.assertEqual(
+            "Methods\nShort one.\nClosing words.",
+            next(chunk.text for chunk in chunks if chunk.path == "2"),
+        )
+
+    def test_rechunk_uses_cached_lengths(self):
+        measured = []
+
+        def length(text):
+            measured.append(text)
+            return len(text)
+
+        chunker = SectionChunker(max_length=300, length_function=length)
+        document = HierarchyParser().parse_pdf(FileSource(self.paper))
+        chunks = list(chunker.chunk(document))
+        count = len(measured)
+        rechunked = list(chunker.chunk(document, max_length=600))
+
+        self.assertEqual(count, len(measured))
+        self.assertLess(len(rechunked), len(chunks))
+        for chunk in chunks:
+            self.assertLessEqual(chunk.length, 300)
+
+    def test_bounded_length_cache(self):
+        chunker = SectionChunker(max_length=300, cache_size=16)
+        list(chunker.chunk(HierarchyParser().parse_pdf(FileSource(self.paper))))
+        self.assertEqual(16, chunker._length.cache_info().currsize)
@@ -0,0 +1,71 @@
+from pathlib import Path
+from unittest import TestCase, mock
+
+from retrievalist_parsers.hierarchy.parser import HierarchyParser
+from retrievalist_parsers.hierarchy.traversal import (
+    get_document_depth,
+    traverse_in_order,
+    traverse_level_order,
+)
+from retrievalist_parsers.model import columnar
+from retrievalist_parsers.model.columnar import ColumnarDocument
+from retrievalist_parsers.printer import JsonStringPrinter
+from retrievalist_parsers.source import FileSource
+
+
+class TestColumnarDocument(TestCase):
+    straight_forward_doc = str(
+        Path("tests/resources/interview_cheatsheet.pdf").absolute()
+    )
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.testDocument = HierarchyParser().parse_pdf(
+            FileSource(cls.straight_forward_doc)
+        )
+        cls.sections = list(traverse_in_order(cls.testDocument))
+
+    def assert_same_document(self):
+        document = ColumnarDocument.from_document(self.testDocument)
+
+        self.assertEqual(len(self.sections), len(document))
+        self.assertEqual(
+            JsonStringPrinter().print(self.testDocument),
+            JsonStringPrinter().print(document.to_document()),
+        )
+        self.assertEqual(
+            get_document_depth(self.testDocument), document.get_document_depth()
+        )
+        for max_depth in (1, 2, 10):
+            self.assertEqual(
+                [
+                    self.sections.index(section)
+                    for section in traverse_level_order(self.testDocument, max_depth)
+                ],
+                list(document.traverse_level_order(max_depth)),
+            )
+
+        for index, section in enumerate(self.sections):
+            self.assertEqual(section.heading_text, document.text(index))
+            self.assertEqual(section.full_content, document.full_content(index))
+
+        array_section = self.sections.index(self.testDocument.elements[5].children[0])
+        self.assertEqual(
+            [
+                self.sections.index(child)
+                for child in self.testDocument.elements[5].children[0].children
+            ],
+            document.children(array_section),
+        )
+        self.assertEqual(
+            "Array", document.text(document.traverse_in_order()[array_section])
+        )
+
+    def test_numpy_arrays(self):
+        if columnar.np is None:
+            self.skipTest("numpy is not installed")
+        self.assert_same_document()
+
+    def test_plain_arrays(self):
+        with mock.patch.object(columnar, "np", None):
+            self.assert_same_document()
@@ -0,0 +1,77 @@
+from pathlib import Path
+from unittest import TestCase, mock
+
+from pdfminer.layout import LAParams
+
+from retrievalist_parsers.analysis.annotate import StyleAnnotator
+from retrievalist_parsers.analysis.sizemapper import PivotLogMapper
+from retrievalist_parsers.hierarchy import detectheader
+from retrievalist_parsers.hierarchy.detectheader import (
+    HeaderFeatures,
+    classify_headers,
+    detect_headers,
+    header_detector,
+)
+from retrievalist_parsers.model.document import TextElement
+from retrievalist_parsers.model.style import Style, TextSize
+from retrievalist_parsers.source import FileSource
+
+
+def annotate(path, compact=False):
+    source = FileSource(path)
+    distribution = source.count_sizes()
+    annotator = StyleAnnotator(
+        sizemapper=PivotLogMapper(distribution),
+        style_info=distribution,
+        compact=compact,
+    )
+    elements = annotator.process(
+        source.read(override_la_params=LAParams(line_margin=distribution.line_margin))
+    )
+    return list(elements), distribution
+
+
+class TestHeaderFeatures(TestCase):
+    documents = (
+        str(Path("tests/resources/interview_cheatsheet.pdf").absolute()),
+        str(Path("tests/resources/paper.pdf").absolute()),
+        str(Path("tests/resources/5648.pdf").absolute()),
+    )
+
+    def test_same_decisions_as_header_detector(self):
+        for document in self.documents:
+            for compact in (False, True):
+                elements, distribution = annotate(document, compact=compact)
+                expected = [
+                    header_detector(element, distribution) for element in elements
+                ]
+
+                self.assertEqual(expected, detect_headers(elements, distribution))
+                with mock.patch.object(detectheader, "np", None):
+                    self.assertEqual(expected, detect_headers(elements, distribution))
+                self.assertEqual(
+                    expected,
+                    [
+                        is_header
+                        for _, is_header in classify_headers(
+                            elements, distribution, batch_size=7
+                        )
+                    ],
+                )
+
+    def test_feature_rows(self):
+        bold = Style(True, False, "Arial-Bold", TextSize.large, 14.0, 16.0)
+        body = Style(False, False, "Arial", TextSize.middle, 10.0, 10.0)
+        elements = [
+            TextElement(None, bold, text="1.2 Results"),
+            TextElement(None, body, text="42 of 50"),
+        ]
+        features = HeaderFeatures(elements, body_size=10.0)
+
+        self.assertEqual([11, 8], list(features.length))
+        self.assertEqual([7, 2], features.alpha_count)
+        self.assertEqual([2, 4], features.numeric_count)
+        self.assertEqual([6.0, 0.0], list(features.size_delta))
+        self.assertEqual(["1.2", "42"], features.first_token)
+        self.assertEqual([True, False], features.enumerated)
+        self.assertEqual([True, False], features.classify())
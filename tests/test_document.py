@@ -1,8 +1,19 @@
 import json
+import pickle
 from pathlib import Path
-from unittest import TestCase
+from unittest import TestCase, mock
 
-from retrievalist_parsers.model.document import StructuredPdfDocument
+import pytest
+
+from retrievalist_parsers.hierarchy.parser import HierarchyParser
+from retrievalist_parsers.hierarchy.traversal import traverse_in_order
+from retrievalist_parsers.model.document import (
+    Section,
+    StructuredPdfDocument,
+    TextElement,
+)
+from retrievalist_parsers.model.style import Style, TextSize
+from retrievalist_parsers.source import FileSource
 
 
 class TestSection(TestCase):
@@ -20,3 +31,99 @@ class TestSection(TestCase):
             )
 
             self.assertTrue(expected_newline_merged_subsections_excerpt in text)
+
+
+class TestStyle(TestCase):
+    def test_styles_are_shared(self):
+        parser = HierarchyParser()
+        document = parser.parse_pdf(
+            FileSource(str(Path("tests/resources/interview_cheatsheet.pdf").absolute()))
+        )
+        styles = [
+            section.heading.style
+            for section in traverse_in_order(document)
+            if section.heading is not None
+        ]
+        distinct = {id(style) for style in styles}
+        self.assertEqual(len({style.key() for style in styles}), len(distinct))
+        self.assertLess(len(distinct), len(styles))
+
+    def test_style_is_immutable(self):
+        style = Style(True, False, "Arial-Bold", TextSize.large, 12.0, 12.0)
+        with pytest.raises(AttributeError):
+            style.bold = False
+        self.assertEqual(style.key(), pickle.loads(pickle.dumps(style)).key())
+        self.assertEqual(
+            1, len({style, Style(True, True, "Arial", TextSize.large, 11.0, 11.0)})
+        )
+
+
+class TestContentCache(TestCase):
+    def test_full_content_invalidated_on_mutation(self):
+        root = Section(TextElement(None, style=None, text="Header"))
+        sub = Section(TextElement(None, style=None, text="Sub Header"), 1)
+        root.append_children(sub)
+        sub.append_children(Section(TextElement(None, style=None, text="a"), 2))
+        document = StructuredPdfDocument([root])
+
+        self.assertEqual("Header\nSub Header\na", document.text)
+        self.assertIs(document.text, document.text)
+
+        sub.append_children(Section(TextElement(None, style=None, text="b"), 2))
+        self.assertEqual("Sub Header\na\nb", sub.full_content)
+        self.assertEqual("Header\nSub Header\na\nb", document.text)
+
+    @staticmethod
+    def create_document():
+        root = Section(TextElement(None, style=None, text="Header"))
+        sub = Section(TextElement(None, style=None, text="Sub Header"), 1)
+        root.append_children(sub)
+        sub.append_children(Section(TextElement(None, style=None, text="a"), 2))
+        return StructuredPdfDocument([root]), root, sub
+
+    def test_cache_survives_unrelated_sections(self):
+        document, root, _ = self.create_document()
+        text = document.text
+        index = document.section_index
+
+        _, _, other_sub = self.create_document()
+        other_sub.append_children(Section(None, 2))
+        Section(None).set_level(3)
+
+        self.assertIs(text, document.text)
+        self.assertIs(index, document.section_index)
+        self.assertIs(root.full_content, root.full_content)
+
+    def test_direct_assignments_invalidate(self):
+        document, root, sub = self.create_document()
+        self.assertEqual("Header\nSub Header\na", document.text)
+
+        sub.children = [Section(TextElement(None, style=None, text="b"), 2)]
+        self.assertEqual("Header\nSub Header\nb", root.full_content)
+        self.assertEqual("Header\nSub Header\nb", document.text)
+
+        sub.heading = TextElement(None, style=None, text="Other")
+        self.assertEqual("Header\nOther\nb", document.text)
+
+        document.elements.append(Section(TextElement(None, style=None, text="c")))
+        self.assertEqual("Header\nOther\nb\nc", document.text)
+        self.assertEqual(2, len(document.section_index.level(0)))
+
+    def test_invalidation_after_pickling(self):
+        document, _, _ = self.create_document()
+        self.assertEqual("Header\nSub Header\na", document.text)
+
+        copy = pickle.loads(pickle.dumps(document))
+        sub = copy.elements[0].children[0]
+        sub.append_children(Section(TextElement(None, style=None, text="b"), 2))
+        self.assertEqual("Header\nSub Header\na\nb", copy.text)
+        self.assertEqual("Header\nSub Header\na", document.text)
+
+    def test_text_computed_once(self):
+        container = mock.MagicMock()
+        container.get_text.return_value = " Header\n"
+        element = TextElement(container, style=None)
+
+        self.assertEqual("Header", element.text)
+        self.assertEqual("Header", element.text)
+        container.get_text.assert_called_once()
@@ -1,13 +1,20 @@
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from unittest import TestCase
 
 from pdfminer.layout import LTChar, LTTextBoxHorizontal, LTTextLineHorizontal
 
 from retrievalist_parsers.hierarchy.headercompare import (
+    SubHeaderPredicate,
     condition_h1_enum_h2_not,
     condition_h2_extends_h1,
+    signature,
 )
+from retrievalist_parsers.hierarchy.parser import HierarchyParser
 from retrievalist_parsers.model.document import Section, TextElement
 from retrievalist_parsers.model.style import Style, TextSize
+from retrievalist_parsers.source import FileSource
 
 
 class TestSubHeaderConditions(TestCase):
@@ -81,3 +88,111 @@ class TestSubHeaderConditions(TestCase):
         self.assertFalse(
             condition_h1_enum_h2_not(Section(h1), Section(neighbor_element))
         )
+
+    def test_heading_signature(self):
+        section = Section(
+            TextElement(
+                text_container=self.create_container("1.2.3 This is a test header"),
+                style=self.style_middle_bold,
+            )
+        )
+        heading_signature = signature(section)
+
+        self.assertEqual("1.2.3", heading_signature.first_token)
+        self.assertEqual((1, 2, 3), heading_signature.numbering)
+        self.assertTrue(heading_signature.enumerated)
+        self.assertTrue(heading_signature.bold)
+        self.assertEqual(TextSize.middle, heading_signature.mapped_font_size)
+        # computed once per section
+        self.assertIs(heading_signature, signature(section))
+
+    def test_condition_h2_extends_h1_compares_numbers(self):
+        def section(text):
+            return Section(TextElement(None, self.style_middle_bold, text=text))
+
+        self.assertTrue(condition_h2_extends_h1(section("1."), section("1.2 Sub")))
+        self.assertFalse(condition_h2_extends_h1(section("1.1"), section("1.10 Sub")))
+        self.assertFalse(condition_h2_extends_h1(section("1.1"), section("11.1 Sub")))
+        self.assertFalse(condition_h2_extends_h1(section("A"), section("Array")))
+
+
+class TestSubHeaderPredicate(TestCase):
+    style = TestSubHeaderConditions.style_middle_bold
+
+    def section(self, text):
+        return Section(TextElement(None, self.style, text=text))
+
+    def test_stats_per_condition(self):
+        predicate = SubHeaderPredicate()
+        predicate.add_condition(condition_h1_enum_h2_not)
+        predicate.add_condition(condition_h2_extends_h1)
+
+        self.assertTrue(predicate.test(self.section("1.1 A"), self.section("1.1.1 B")))
+        self.assertFalse(predicate.test(self.section("Head"), self.section("Other")))
+
+        enum_stats, extends_stats = predicate.stats
+        self.assertEqual("condition_h1_enum_h2_not", enum_stats.name)
+        self.assertEqual((2, 0), (enum_stats.calls, enum_stats.hits))
+        self.assertEqual((2, 1), (extends_stats.calls, extends_stats.hits))
+        self.assertEqual(0.5, extends_stats.hit_rate)
+        self.assertGreater(extends_stats.seconds, 0)
+
+    def test_reorder_keeps_results(self):
+        pairs = [
+            (self.section("1.1 A"), self.section("1.1.1 B")),
+            (self.section("2. A"), self.section("B")),
+            (self.section("Head"), self.section("Other")),
+        ] * 4
+        predicate = SubHeaderPredicate(reorder_interval=2)
+        predicate.add_condition(condition_h1_enum_h2_not)
+        predicate.add_condition(condition_h2_extends_h1)
+        expected = [
+            bool(condition_h1_enum_h2_not(h1, h2) or condition_h2_extends_h1(h1, h2))
+            for h1, h2 in pairs
+        ]
+
+        self.assertEqual(expected, [predicate.test(h1, h2) for h1, h2 in pairs])
+        # conditions without hits are evaluated last
+        predicate.add_condition(lambda h1, h2: False)
+        predicate.test(*pairs[0])
+        predicate.reorder()
+        self.assertEqual("<lambda>", predicate.stats[-1].name)
+
+    def test_shared_by_threads(self):
+        pairs = [
+            (self.section("1.1 A"), self.section("1.1.1 B")),
+            (self.section("2. A"), self.section("B")),
+            (self.section("Head"), self.section("Other")),
+        ] * 200
+        predicate = SubHeaderPredicate(reorder_interval=1)
+        predicate.add_condition(condition_h1_enum_h2_not)
+        predicate.add_condition(condition_h2_extends_h1)
+        expected = [predicate.test(h1, h2) for h1, h2 in pairs]
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(lambda pair: predicate.test(*pair), pairs))
+        self.assertEqual(expected, results)
+        self.assertEqual(2 * len(pairs), predicate.tests)
+        self.assertEqual(
+            sum(expected) * 2, sum(stats.hits for stats in predicate.stats)
+        )
+
+    def test_pickle(self):
+        predicate = SubHeaderPredicate(reorder_interval=2)
+        predicate.add_condition(condition_h2_extends_h1)
+        predicate.test(self.section("1.1 A"), self.section("1.1.1 B"))
+
+        restored = pickle.loads(pickle.dumps(predicate))
+        self.assertEqual(1, restored.stats[0].hits)
+        self.assertTrue(restored.test(self.section("1.1 A"), self.section("1.1.1 B")))
+
+    def test_stats_after_parse(self):
+        parser = HierarchyParser()
+        parser.parse_pdf(
+            FileSource(str(Path("tests/resources/interview_cheatsheet.pdf").absolute()))
+        )
+
+        self.assertEqual(4, len(parser.sub_header_stats))
+        self.assertGreater(sum(stats.calls for stats in parser.sub_header_stats), 0)
+        # stats are kept per parser
+        self.assertEqual(0, HierarchyParser().sub_header_stats[0].calls)
@@ -1,11 +1,22 @@
+import os
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 from unittest import TestCase
+from unittest.mock import patch
 
 from pdfminer.high_level import extract_text
+from pdfminer.layout import LAParams
 
+from retrievalist_parsers.analysis.sizemapper import PivotLinearMapper, PivotLogMapper
 from retrievalist_parsers.hierarchy.parser import HierarchyParser
-from retrievalist_parsers.model.document import DanglingTextSection
-from retrievalist_parsers.printer import PrettyStringPrinter
+from retrievalist_parsers.hierarchy.traversal import traverse_in_order
+from retrievalist_parsers.layout import extract_recorded_pages
+from retrievalist_parsers.model.document import (
+    DanglingTextSection,
+    StructuredPdfDocument,
+)
+from retrievalist_parsers.model.style import TextSize
+from retrievalist_parsers.printer import JsonStringPrinter, PrettyStringPrinter
 from retrievalist_parsers.source import FileSource
 
 
@@ -122,3 +133,251 @@ class TestComapreFrameworks(TestCase):
         source = FileSource(path)
         pdf = parser.parse_pdf(source)
         print(PrettyStringPrinter().print(pdf))
+
+
+class TestParseMany(TestCase):
+    files = (
+        str(Path("tests/resources/lorem.pdf").absolute()),
+        str(Path("tests/resources/missing.pdf").absolute()),
+        str(Path("tests/resources/SameSize_BoldTitle.pdf").absolute()),
+        str(Path("tests/resources/interview_cheatsheet.pdf").absolute()),
+        str(Path("tests/resources/SameStyleOnly.pdf").absolute()),
+    )
+
+    def test_parse_many_ordered(self):
+        parser = HierarchyParser()
+        sources = [FileSource(path) for path in self.files]
+        results = list(
+            parser.parse_many(
+                sources, workers=2, ordered=True, max_tasks_per_child=2, chunk_size=2
+            )
+        )
+
+        self.assertEqual(sources, [source for source, _ in results])
+        self.assertIsInstance(results[1][1], FileNotFoundError)
+        self.assertEqual(9, len(results[3][1].elements))
+        self.assertEqual("Appendix", results[2][1].elements[1].heading.text)
+
+    def test_parse_many_crashing_worker(self):
+        parser = HierarchyParser()
+        sources = [FileSource(path) for path in self.files[2:]]
+        sources.insert(1, CrashingSource(self.files[4]))
+        results = list(
+            parser.parse_many(sources, workers=2, ordered=True, chunk_size=2)
+        )
+
+        self.assertEqual(sources, [source for source, _ in results])
+        self.assertIsInstance(results[1][1], BrokenProcessPool)
+        for _, document in results[:1] + results[2:]:
+            self.assertIsInstance(document, StructuredPdfDocument)
+
+    def test_parse_many_unpicklable_source(self):
+        parser = HierarchyParser()
+        sources = [FileSource(path) for path in (self.files[0], self.files[3])]
+        sources[0].callback = lambda: None
+        results = list(
+            parser.parse_many(sources, workers=2, ordered=True, chunk_size=2)
+        )
+
+        self.assertEqual(sources, [source for source, _ in results])
+        self.assertNotIsInstance(results[0][1], StructuredPdfDocument)
+        self.assertIsInstance(results[1][1], StructuredPdfDocument)
+
+    def test_parse_many_as_completed(self):
+        parser = HierarchyParser()
+        results = {
+            source.uri: document
+            for source, document in parser.parse_many(
+                (FileSource(path) for path in self.files), workers=2, chunk_size=1
+            )
+        }
+        self.assertEqual(set(self.files), set(results))
+        self.assertEqual(
+            "interview_cheatsheet.pdf", results[self.files[3]].metadata["filename"]
+        )
+
+
+class CrashingSource(FileSource):
+    """
+    kills the worker process parsing it
+    """
+
+    @staticmethod
+    def read(*args, **kwargs):
+        os._exit(1)
+
+
+class TestCompactElements(TestCase):
+    files = (
+        str(Path("tests/resources/paper.pdf").absolute()),
+        str(Path("tests/resources/5648.pdf").absolute()),
+        str(Path("tests/resources/SameSize_EnumeratedTitle.pdf").absolute()),
+    )
+
+    @staticmethod
+    def source(path):
+        return FileSource(path)
+
+    def test_same_hierarchy_as_full_elements(self):
+        for path in self.files:
+            full = HierarchyParser().parse_pdf(self.source(path))
+            compact = HierarchyParser(compact=True).parse_pdf(self.source(path))
+            self.assertEqual(
+                JsonStringPrinter().print(full), JsonStringPrinter().print(compact)
+            )
+
+    def test_no_pdfminer_objects_kept(self):
+        source = self.source(self.files[0])
+        document = HierarchyParser(compact=True).parse_pdf(source)
+        headings = [
+            section.heading
+            for section in traverse_in_order(document)
+            if section.heading is not None
+        ]
+
+        self.assertTrue(headings)
+        self.assertTrue(all(heading._data is None for heading in headings))
+        self.assertTrue(all(heading.bbox for heading in headings))
+        # words are split on space characters of the pdf,
+        # not on spaces inserted by pdfminer
+        self.assertTrue(
+            headings[0].text.replace(" ", "").startswith(headings[0].first_token)
+        )
+        self.assertIsNone(source._layout_cache)
+
+    def test_parse_many_compact(self):
+        parser = HierarchyParser(compact=True)
+        ((_, document),) = parser.parse_many([self.source(self.files[2])], workers=1)
+        for section in traverse_in_order(document):
+            if section.heading is not None:
+                self.assertIsNone(section.heading._data)
+
+
+class TestStreamingHierarchy(TestCase):
+    doc = str(Path("tests/resources/interview_cheatsheet.pdf").absolute())
+
+    def test_same_sections_as_parse_pdf(self):
+        parser = HierarchyParser()
+        document = parser.parse_pdf(FileSource(self.doc))
+        sections = list(parser.parse_pdf_stream(FileSource(self.doc)))
+
+        self.assertEqual(len(document.elements), len(sections))
+        self.assertEqual(
+            JsonStringPrinter().print(document.elements),
+            JsonStringPrinter().print(sections),
+        )
+
+    def test_layouts_released_after_stream(self):
+        source = FileSource(self.doc)
+        sections = HierarchyParser().parse_pdf_stream(source)
+        next(sections)
+        self.assertIsNotNone(source._layout_cache)
+        list(sections)
+        self.assertIsNone(source._layout_cache)
+
+        source = FileSource(self.doc)
+        sections = HierarchyParser().parse_pdf_stream(source)
+        next(sections)
+        sections.close()
+        self.assertIsNone(source._layout_cache)
+
+    def test_layouts_released_after_parse(self):
+        source = FileSource(self.doc)
+        HierarchyParser().parse_pdf(source)
+        self.assertIsNone(source._layout_cache)
+
+    def test_sections_yielded_once_closed(self):
+        parser = HierarchyParser()
+        source = FileSource(self.doc)
+        distribution = source.count_sizes()
+        document = parser.parse_pdf(FileSource(self.doc))
+
+        consumed = []
+
+        def elements():
+            for element in document_elements(document):
+                consumed.append(element)
+                yield element
+
+        sections = parser.iter_hierarchy(elements(), distribution, batch_size=1)
+        first = next(sections)
+        # the first section is complete as soon as the second one starts
+        self.assertIs(consumed[-1], document.elements[1].heading)
+        self.assertEqual(document.elements[0].full_content, first.full_content)
+        self.assertEqual(len(document.elements), 1 + len(list(sections)))
+
+
+class TestKnownStyleDistribution(TestCase):
+    doc = str(Path("tests/resources/interview_cheatsheet.pdf").absolute())
+
+    def setUp(self):
+        self.expected = HierarchyParser().parse_pdf(FileSource(self.doc))
+        self.distribution = self.expected.style_distribution
+
+    def test_single_layout_pass(self):
+        with (
+            patch(
+                "retrievalist_parsers.source.extract_recorded_pages",
+                wraps=extract_recorded_pages,
+            ) as layout_pass,
+            patch.object(FileSource, "count_sizes") as count_sizes,
+        ):
+            document = HierarchyParser().parse_pdf(
+                FileSource(self.doc), distribution=self.distribution
+            )
+        count_sizes.assert_not_called()
+        self.assertEqual(1, layout_pass.call_count)
+        self.assertIs(self.distribution, document.style_distribution)
+        self.assertEqual(
+            JsonStringPrinter().print(self.expected),
+            JsonStringPrinter().print(document),
+        )
+
+    def test_size_mapper(self):
+        size_mapper = PivotLinearMapper(self.distribution)
+        document = HierarchyParser().parse_pdf(
+            FileSource(self.doc),
+            distribution=self.distribution,
+            size_mapper=size_mapper,
+        )
+        styles = [
+            section.heading.style
+            for section in traverse_in_order(document)
+            if section.heading is not None
+        ]
+        self.assertTrue(styles)
+        for style in styles:
+            self.assertEqual(
+                size_mapper.translate(TextSize, style.max_size), style.mapped_font_size
+            )
+
+    def test_create_hierarchy_from_source(self):
+        source = FileSource(self.doc)
+        elements = source.read(
+            override_la_params=LAParams(line_margin=self.distribution.line_margin)
+        )
+        sections = HierarchyParser().create_hierarchy(
+            elements, self.distribution, size_mapper=PivotLogMapper(self.distribution)
+        )
+        self.assertEqual(
+            JsonStringPrinter().print(self.expected.elements),
+            JsonStringPrinter().print(sections),
+        )
+
+    def test_stream(self):
+        sections = HierarchyParser().parse_pdf_stream(
+            FileSource(self.doc), distribution=self.distribution
+        )
+        self.assertEqual(
+            JsonStringPrinter().print(self.expected.elements),
+            JsonStringPrinter().print(list(sections)),
+        )
+
+
+def document_elements(document):
+    """
+    flat list of annotated paragraphs the document was created from
+    """
+    for section in traverse_in_order(document):
+        if section.heading is not None:
+            yield section.heading
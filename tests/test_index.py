@@ -0,0 +1,157 @@
+import json
+from pathlib import Path
+from unittest import TestCase
+
+from retrievalist_parsers.hierarchy.parser import HierarchyParser
+from retrievalist_parsers.hierarchy.traversal import traverse_in_order
+from retrievalist_parsers.model.document import (
+    Section,
+    StructuredPdfDocument,
+    TextElement,
+)
+from retrievalist_parsers.model.index import SectionIndex
+from retrievalist_parsers.printer import JsonStringPrinter
+from retrievalist_parsers.source import FileSource
+
+
+class TestSectionIndex(TestCase):
+    straight_forward_doc = str(
+        Path("tests/resources/interview_cheatsheet.pdf").absolute()
+    )
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.testDocument = HierarchyParser().parse_pdf(
+            FileSource(cls.straight_forward_doc)
+        )
+
+    def test_built_by_parser(self):
+        index = self.testDocument.section_index
+        rebuilt = SectionIndex.from_elements(self.testDocument.elements)
+
+        self.assertEqual(len(list(traverse_in_order(self.testDocument))), len(index))
+        self.assertEqual(rebuilt.paths, index.paths)
+        self.assertEqual(rebuilt.first_page, index.first_page)
+        self.assertEqual(rebuilt.last_page, index.last_page)
+
+    def test_lookup_by_path(self):
+        index = self.testDocument.section_index
+        array = self.testDocument.elements[5].children[0]
+
+        self.assertIs(array, index.get("6.1"))
+        self.assertEqual("6.1", index.path(array))
+        self.assertEqual("Time Complexity:", index.get("6.1.3").heading_text)
+        self.assertIsNone(index.get("6.100"))
+
+    def test_lookup_by_level(self):
+        index = self.testDocument.section_index
+        self.assertEqual(
+            [
+                section
+                for section in traverse_in_order(self.testDocument)
+                if section.level == 1
+            ],
+            index.level(1),
+        )
+
+    def test_page_queries(self):
+        index = self.testDocument.section_index
+        sections = list(traverse_in_order(self.testDocument))
+
+        def pages(section):
+            first, last = index.page_span(index.path(section))
+            return first, last
+
+        for page in (0, 2, 5):
+            expected = [
+                section
+                for section in sections
+                if pages(section)[0] is not None
+                and pages(section)[0] <= page <= pages(section)[1]
+            ]
+            self.assertEqual(expected, index.covering(page))
+            self.assertTrue(expected)
+
+        self.assertEqual(
+            [section for section in index.overlapping(1, 3) if section.level == 0],
+            index.overlapping(1, 3, level=0),
+        )
+
+    @staticmethod
+    def section(page, *children, level=0):
+        section = Section(TextElement(None, style=None, text="x", page=page), level)
+        for child in children:
+            section.append_children(child)
+        return section
+
+    def test_sections_without_pages(self):
+        index = SectionIndex.from_elements(
+            [
+                self.section(0, self.section(None, level=1)),
+                self.section(None, self.section(2, level=1)),
+                self.section(None),
+                self.section(5),
+            ]
+        )
+        self.assertEqual((0, 0), index.page_span("1.1"))
+        # spans are carried over from children & the section read before
+        self.assertEqual((2, 2), index.page_span("2"))
+        self.assertEqual((2, 2), index.page_span("3"))
+        self.assertEqual(
+            [index.get(path) for path in ("2", "2.1", "3")], index.covering(2)
+        )
+        self.assertEqual([], index.covering(4))
+
+    def test_split_headings_have_pages(self):
+        # boxes split by style and figure text carry the page of their container
+        document = HierarchyParser().parse_pdf(
+            FileSource(str(Path("tests/resources/lorem.pdf").absolute()))
+        )
+        headings = [
+            section.heading
+            for section in document.section_index.sections
+            if section.heading is not None
+        ]
+        self.assertTrue(headings)
+        self.assertNotIn(None, [heading.page for heading in headings])
+
+    def test_overlapping_equals_full_scan(self):
+        unordered = SectionIndex.from_elements(
+            [
+                self.section(3, self.section(4, level=1)),
+                self.section(1),
+                self.section(6, self.section(2, level=1), self.section(8, level=1)),
+                self.section(5),
+            ]
+        )
+        for index in (self.testDocument.section_index, unordered):
+            spans = [
+                (index.first_page[position], index.last_page[position])
+                for position in range(len(index))
+            ]
+            for first_page in range(10):
+                for last_page in range(first_page, 10):
+                    expected = [
+                        section
+                        for section, (first, last) in zip(
+                            index.sections, spans, strict=True
+                        )
+                        if first is not None
+                        and first <= last_page
+                        and last >= first_page
+                    ]
+                    self.assertEqual(expected, index.overlapping(first_page, last_page))
+
+    def test_serialized_with_document(self):
+        self.assertNotIn(
+            "section_index", json.loads(JsonStringPrinter().print(self.testDocument))
+        )
+        data = json.loads(
+            JsonStringPrinter().print(self.testDocument, section_index=True)
+        )
+        index = self.testDocument.section_index
+
+        self.assertEqual(index.paths, data["section_index"]["paths"])
+        self.assertEqual(index.first_page, data["section_index"]["first_page"])
+        decoded = StructuredPdfDocument.from_json(data)
+        self.assertEqual(index.paths, decoded.section_index.paths)
@@ -0,0 +1,73 @@
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import patch
+
+from pdfminer.layout import LAParams, LTTextLine
+
+from retrievalist_parsers import source
+from retrievalist_parsers.source import FileSource
+
+
+class TestLayoutReplay(TestCase):
+    straight_forward_doc = str(
+        Path("tests/resources/interview_cheatsheet.pdf").absolute()
+    )
+
+    @staticmethod
+    def create_source(path):
+        return FileSource(path)
+
+    @staticmethod
+    def describe(elements):
+        return [(e.page, e.bbox, e.get_text()) for e in elements]
+
+    def test_replay_equals_fresh_layout_analysis(self):
+        replayed_source = self.create_source(self.straight_forward_doc)
+        list(replayed_source.read())
+        replayed = self.describe(
+            replayed_source.read(override_la_params=LAParams(line_margin=0.1))
+        )
+
+        fresh_source = self.create_source(self.straight_forward_doc)
+        fresh = self.describe(
+            fresh_source.read(override_la_params=LAParams(line_margin=0.1))
+        )
+
+        self.assertEqual(fresh, replayed)
+
+    def test_pdf_is_interpreted_once(self):
+        file_source = self.create_source(self.straight_forward_doc)
+        with patch.object(
+            source, "extract_recorded_pages", wraps=source.extract_recorded_pages
+        ) as extract:
+            first = self.describe(file_source.read())
+            second = self.describe(file_source.read())
+
+        self.assertEqual(1, extract.call_count)
+        self.assertEqual(first, second)
+
+    def test_replay_keeps_yielded_elements(self):
+        file_source = self.create_source(self.straight_forward_doc)
+        first = list(file_source.read())
+        expected = self.describe(first)
+        replayed = list(file_source.read(override_la_params=LAParams(line_margin=0.1)))
+
+        self.assertEqual(expected, self.describe(first))
+        # characters are shared, lines are copied
+        lines = {
+            id(line)
+            for element in first
+            for line in element
+            if isinstance(line, LTTextLine)
+        }
+        self.assertTrue(lines)
+        self.assertFalse(any(id(line) in lines for e in replayed for line in e))
+
+    def test_other_page_selection_is_not_replayed(self):
+        file_source = self.create_source(self.straight_forward_doc)
+        list(file_source.read())
+        elements = list(file_source.read(override_page_numbers=[1]))
+        self.assertEqual({0}, {element.page for element in elements})
+        self.assertNotEqual(
+            self.describe(elements), self.describe(file_source.read())[: len(elements)]
+        )
@@ -1,4 +1,7 @@
+import io
 import json
+import os
+import tempfile
 from pathlib import Path
 from unittest import TestCase
 
@@ -6,6 +9,7 @@ from retrievalist_parsers.hierarchy.parser import HierarchyParser
 from retrievalist_parsers.model.document import StructuredPdfDocument
 from retrievalist_parsers.printer import (
     JsonFilePrinter,
+    JsonStreamWriter,
     JsonStringPrinter,
     PrettyStringFilePrinter,
     PrettyStringPrinter,
@@ -96,3 +100,58 @@ class TestPrettyStringPrinter(TestCase):
                 "Time Complexity:",
                 decoded_document.elements[5].children[0].children[2].heading.text,
             )
+
+
+class TestJsonStreamWriter(TestCase):
+    doc = str(Path("tests/resources/SameSize_EnumeratedTitle.pdf").absolute())
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.testDocument = HierarchyParser().parse_pdf(FileSource(cls.doc))
+
+    def test_same_output_as_json_dump(self):
+        sink = io.StringIO()
+        JsonStreamWriter(sink, flush_size=64).write_document(self.testDocument)
+        self.assertEqual(JsonStringPrinter().print(self.testDocument), sink.getvalue())
+
+    def test_compact_binary_sink(self):
+        sink = io.BytesIO()
+        JsonStreamWriter(sink, compact=True).write_document(self.testDocument)
+
+        self.assertNotIn(b"\n", sink.getvalue())
+        self.assertEqual(
+            json.loads(JsonStringPrinter().print(self.testDocument)),
+            json.loads(sink.getvalue()),
+        )
+
+    def test_sink_types(self):
+        expected = JsonStringPrinter().print(self.testDocument)
+
+        class TextSink:
+            def __init__(self):
+                self.parts = []
+
+            def write(self, text):
+                self.parts.append(text)
+
+        sink = TextSink()
+        JsonStreamWriter(sink).write_document(self.testDocument)
+        self.assertEqual(expected, "".join(sink.parts))
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "document.json")
+            with open(path, "wb") as fp:
+                JsonStreamWriter(fp).write_document(self.testDocument)
+            with open(path, encoding="utf-8") as fp:
+                self.assertEqual(expected, fp.read())
+
+    def test_write_streamed_sections(self):
+        sink = io.StringIO()
+        sections = HierarchyParser().parse_pdf_stream(FileSource(self.doc))
+        JsonStreamWriter(sink).write_sections(sections)
+
+        decoded_document = StructuredPdfDocument.from_json(json.loads(sink.getvalue()))
+        self.assertEqual(
+            [section.heading_text for section in self.testDocument.elements],
+            [section.heading_text for section in decoded_document.elements],
+        )
@@ -0,0 +1,133 @@
+import os
+import tempfile
+from collections import Counter
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import patch
+
+from retrievalist_parsers.analysis.profiles import (
+    StyleProfileStore,
+    base_font,
+    first_page,
+    font_fingerprint,
+    line_margin,
+)
+from retrievalist_parsers.analysis.styledistribution import StyleDistribution
+from retrievalist_parsers.hierarchy.parser import HierarchyParser
+from retrievalist_parsers.printer import JsonStringPrinter
+from retrievalist_parsers.source import FileSource
+
+
+class TestStyleProfileStore(TestCase):
+    test_doc = str(Path("tests/resources/interview_cheatsheet.pdf").absolute())
+
+    def test_base_font(self):
+        self.assertEqual("Helvetica-Bold", base_font("ABCDEF+Helvetica-Bold"))
+        self.assertEqual("Helvetica-Bold", base_font("Helvetica-Bold"))
+
+    def test_fingerprint_of_first_page(self):
+        elements = list(FileSource(self.test_doc).read())
+        pages = list(first_page(elements))
+        self.assertTrue(pages)
+        # including boxes split by style
+        self.assertEqual([element for element in elements if element.page == 0], pages)
+        self.assertLess(len(pages), len(elements))
+
+        fingerprint = font_fingerprint(pages)
+        self.assertEqual(fingerprint, font_fingerprint(first_page(elements)))
+        self.assertNotEqual(fingerprint, font_fingerprint(elements[len(pages) :]))
+        self.assertIsNone(font_fingerprint([]))
+
+    def test_observe_merges_distributions(self):
+        store = StyleProfileStore(min_observations=2)
+        store.observe("a", StyleDistribution(Counter({10.0: 5, 20.0: 1})))
+        self.assertIsNone(store.lookup("a"))
+
+        store.observe("a", StyleDistribution(Counter({10.0: 3, 12.0: 2})))
+        self.assertEqual(Counter({10.0: 8, 20.0: 1, 12.0: 2}), store.lookup("a").data)
+        self.assertEqual(2, store.profiles["a"].observations)
+
+        store.replace("a", StyleDistribution(Counter({12.0: 1})))
+        self.assertEqual(1, store.profiles["a"].observations)
+        self.assertIsNone(store.lookup("b"))
+
+    def test_is_valid(self):
+        store = StyleProfileStore(tolerance=0.1)
+        profile = StyleDistribution(Counter({10.0: 5, 20.0: 1}), line_margin=0.3)
+        self.assertTrue(
+            store.is_valid(
+                profile, StyleDistribution(Counter({10.0: 50, 19.0: 3}), 0.31)
+            )
+        )
+        self.assertFalse(
+            store.is_valid(profile, StyleDistribution(Counter({12.0: 5, 20.0: 1}), 0.3))
+        )
+        self.assertFalse(
+            store.is_valid(profile, StyleDistribution(Counter({10.0: 5, 20.0: 1}), 0.5))
+        )
+
+    def test_save_and_load(self):
+        store = StyleProfileStore(tolerance=0.2)
+        store.observe("a", StyleDistribution(Counter({10.0: 5}), line_margin=0.3))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "profiles.pickle")
+            store.save(path)
+            loaded = StyleProfileStore.load(path)
+        self.assertEqual(0.2, loaded.tolerance)
+        self.assertEqual(store.lookup("a").data, loaded.lookup("a").data)
+        self.assertEqual(0.3, loaded.lookup("a").line_margin)
+
+    @staticmethod
+    def encode(document):
+        return JsonStringPrinter().print(document.elements)
+
+    def test_matching_profile_skips_style_analysis(self):
+        expected = self.encode(HierarchyParser().parse_pdf(FileSource(self.test_doc)))
+
+        store = StyleProfileStore()
+        parser = HierarchyParser(profiles=store)
+        self.assertEqual(
+            expected, self.encode(parser.parse_pdf(FileSource(self.test_doc)))
+        )
+        self.assertEqual(1, len(store))
+
+        with patch.object(FileSource, "count_sizes") as count_sizes:
+            document = parser.parse_pdf(FileSource(self.test_doc))
+        count_sizes.assert_not_called()
+        self.assertEqual(expected, self.encode(document))
+        (profile,) = store.profiles.values()
+        self.assertEqual(2, profile.observations)
+
+    def test_invalid_profile_is_replaced(self):
+        expected = HierarchyParser().parse_pdf(FileSource(self.test_doc))
+
+        store = StyleProfileStore()
+        parser = HierarchyParser(profiles=store)
+        parser.parse_pdf(FileSource(self.test_doc))
+        (fingerprint,) = store.profiles
+        store.replace(fingerprint, StyleDistribution(Counter({30.0: 10, 40.0: 2})))
+
+        document = parser.parse_pdf(FileSource(self.test_doc))
+        self.assertEqual(self.encode(expected), self.encode(document))
+        self.assertEqual(
+            expected.style_distribution.body_size, store.lookup(fingerprint).body_size
+        )
+
+    def test_line_margin_is_measured_with_default_params(self):
+        expected = HierarchyParser().parse_pdf(FileSource(self.test_doc))
+        margin = line_margin(first_page(FileSource(self.test_doc).read()))
+        self.assertIsNotNone(margin)
+
+        store = StyleProfileStore()
+        parser = HierarchyParser(profiles=store)
+        parser.parse_pdf(FileSource(self.test_doc))
+        (fingerprint,) = store.profiles
+        # same sizes, the elements are grouped with another line margin
+        distribution = expected.style_distribution
+        store.replace(fingerprint, StyleDistribution(distribution.data, margin / 2))
+
+        document = parser.parse_pdf(FileSource(self.test_doc))
+        self.assertEqual(self.encode(expected), self.encode(document))
+        self.assertEqual(
+            distribution.line_margin, store.lookup(fingerprint).line_margin
+        )
@@ -0,0 +1,54 @@
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import patch
+
+from retrievalist_parsers.analysis.sampling import PageSampler
+from retrievalist_parsers.source import FileSource
+
+
+class TestPageSampler(TestCase):
+    test_doc = str(Path("tests/resources/KnowingThatVsKnowingHow.pdf").absolute())
+
+    def create_source(self, **kwargs):
+        return FileSource(self.test_doc, **kwargs)
+
+    def test_select_is_deterministic_and_stratified(self):
+        sampler = PageSampler(budget=10, seed=42)
+        first, a, b = sampler.select(range(1000))
+        self.assertEqual((first, a, b), sampler.select(range(1000)))
+        self.assertNotEqual(
+            (a, b), PageSampler(budget=10, seed=1).select(range(1000))[1:]
+        )
+
+        self.assertEqual([0], first)
+        sample = sorted(a + b)
+        self.assertEqual(10, len(sample))
+        for stratum, page in enumerate(sample):
+            self.assertTrue(
+                1 + stratum * 999 // 10 <= page < 1 + (stratum + 1) * 999 // 10
+            )
+
+    def test_select_by_fraction(self):
+        _, a, b = PageSampler(fraction=0.05, min_pages=2).select(range(1001))
+        self.assertEqual(50, len(a + b))
+
+    def test_small_documents_are_not_sampled(self):
+        self.assertEqual(([], [], []), PageSampler(budget=10).select(range(11)))
+
+    def test_sampled_distribution(self):
+        expected = self.create_source().count_sizes()
+        source = self.create_source(sampler=PageSampler(budget=4, min_pages=2))
+        distribution = source.count_sizes()
+
+        # only a sample of all lines has been analysed
+        self.assertLess(distribution.amount_values, expected.amount_values)
+        self.assertEqual(expected.body_size, distribution.body_size)
+        self.assertEqual(expected.line_margin, distribution.line_margin)
+        self.assertEqual(expected.max_found_size, distribution.max_found_size)
+
+    def test_unstable_sample_falls_back_to_full_scan(self):
+        expected = self.create_source().count_sizes()
+        source = self.create_source(sampler=PageSampler(budget=4, min_pages=2))
+        with patch.object(PageSampler, "is_stable", return_value=False):
+            distribution = source.count_sizes()
+        self.assertEqual(expected.data, distribution.data)
@@ -0,0 +1,69 @@
+import tempfile
+from pathlib import Path
+from unittest import TestCase, mock
+
+from retrievalist_parsers import search
+from retrievalist_parsers.hierarchy.parser import HierarchyParser
+from retrievalist_parsers.search import BM25Index
+from retrievalist_parsers.source import FileSource
+
+
+class TestBM25Index(TestCase):
+    straight_forward_doc = str(
+        Path("tests/resources/interview_cheatsheet.pdf").absolute()
+    )
+    paper = str(Path("tests/resources/paper.pdf").absolute())
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        parser = HierarchyParser()
+        cls.cheatsheet = parser.parse_pdf(FileSource(cls.straight_forward_doc))
+        cls.index = BM25Index()
+        cls.index.add_document(cls.cheatsheet)
+        cls.index.add_document(parser.parse_pdf(FileSource(cls.paper)), "paper")
+
+    def test_search_returns_section_paths(self):
+        document_id, path, score = self.index.search("sorting")[0]
+
+        self.assertEqual("interview_cheatsheet.pdf", document_id)
+        self.assertEqual(
+            "Efficient Sorting Basics",
+            self.cheatsheet.section_index.get(path).heading_text,
+        )
+        self.assertGreater(score, 0)
+
+    def test_documents_added_incrementally(self):
+        self.assertEqual(["interview_cheatsheet.pdf", "paper"], self.index.documents)
+        self.assertEqual("paper", self.index.search("passage retrieval")[0][0])
+        self.assertEqual([], self.index.search("xylophone"))
+
+    def test_heading_weight(self):
+        index = BM25Index(heading_weight=3.0)
+        index.add_section("doc", "1", "sorting", "some text about algorithms")
+        index.add_section("doc", "2", "algorithms", "some text about sorting")
+        index.add_section("doc", "3", "graphs", "breadth first search")
+
+        self.assertEqual(["1", "2"], [path for _, path, _ in index.search("sorting")])
+
+    def test_plain_python_scores(self):
+        results = self.index.search("binary search tree", limit=5)
+        with mock.patch.object(search, "np", None):
+            plain_results = self.index.search("binary search tree", limit=5)
+
+        self.assertEqual(
+            [(document_id, path) for document_id, path, _ in results],
+            [(document_id, path) for document_id, path, _ in plain_results],
+        )
+        for (_, _, score), (_, _, plain_score) in zip(
+            results, plain_results, strict=True
+        ):
+            self.assertAlmostEqual(score, plain_score, places=4)
+
+    def test_save_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "index.bm25"
+            self.index.save(path)
+            loaded = BM25Index.load(path)
+
+        self.assertEqual(len(self.index), len(loaded))
+        self.assertEqual(self.index.search("sorting"), loaded.search("sorting"))
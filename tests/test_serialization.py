@@ -0,0 +1,51 @@
+import io
+from pathlib import Path
+from unittest import TestCase
+
+import pytest
+
+from retrievalist_parsers import serialization
+from retrievalist_parsers.hierarchy.parser import HierarchyParser
+from retrievalist_parsers.model.document import DanglingTextSection
+from retrievalist_parsers.printer import JsonStringPrinter
+from retrievalist_parsers.source import FileSource
+
+
+class TestBinarySerialization(TestCase):
+    straight_forward_doc = str(
+        Path("tests/resources/interview_cheatsheet.pdf").absolute()
+    )
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.testDocument = HierarchyParser().parse_pdf(
+            FileSource(cls.straight_forward_doc)
+        )
+        cls.json = JsonStringPrinter().print(cls.testDocument)
+
+    def test_round_trip(self):
+        for compression in serialization.COMPRESSIONS:
+            fp = io.BytesIO()
+            serialization.dump(self.testDocument, fp, compression=compression)
+            fp.seek(0)
+            document = serialization.load(fp)
+
+            self.assertEqual(self.json, JsonStringPrinter().print(document))
+            self.assertLess(len(fp.getvalue()), len(self.json) / 10)
+
+    def test_section_types_and_shared_styles(self):
+        document = serialization.loads(serialization.dumps(self.testDocument))
+
+        self.assertIsInstance(document.elements[0], DanglingTextSection)
+        self.assertIs(
+            document.elements[5].children[0].heading.style,
+            document.elements[6].children[0].heading.style,
+        )
+        self.assertEqual("interview_cheatsheet.pdf", document.metadata["filename"])
+
+    def test_invalid_data(self):
+        data = serialization.dumps(self.testDocument, compression="zlib")
+        with pytest.raises(ValueError, match="not a serialized document"):
+            serialization.loads(b"%PDF" + data[4:])
+        with pytest.raises(ValueError, match="unknown compression"):
+            serialization.dumps(self.testDocument, compression="gzip")
@@ -0,0 +1,110 @@
+import io
+from pathlib import Path
+from unittest import TestCase
+
+from pdfminer.layout import LAParams
+
+from retrievalist_parsers.hierarchy.parser import HierarchyParser
+from retrievalist_parsers.source import (
+    BufferSource,
+    FileObjectSource,
+    FileSource,
+    MmapSource,
+)
+
+
+class TestParallelFileSource(TestCase):
+    test_doc = str(Path("tests/resources/KnowingThatVsKnowingHow.pdf").absolute())
+
+    @staticmethod
+    def describe(elements):
+        return [(getattr(e, "page", None), e.get_text()) for e in elements]
+
+    def test_read_keeps_page_order(self):
+        sequential = self.describe(FileSource(self.test_doc).read())
+        parallel = self.describe(
+            FileSource(self.test_doc, workers=2, pages_per_shard=2).read()
+        )
+        self.assertEqual(sequential, parallel)
+
+    def test_read_selected_pages(self):
+        sequential = self.describe(
+            FileSource(self.test_doc, page_numbers=[1, 3, 4]).read()
+        )
+        parallel = self.describe(
+            FileSource(
+                self.test_doc, page_numbers=[1, 3, 4], workers=2, pages_per_shard=1
+            ).read()
+        )
+        self.assertEqual(sequential, parallel)
+        self.assertEqual(2, max(page for page, _ in parallel if page is not None))
+
+    def test_merged_count_sizes(self):
+        sequential = FileSource(self.test_doc).count_sizes()
+        parallel = FileSource(self.test_doc, workers=2, pages_per_shard=3).count_sizes()
+        self.assertEqual(sequential.data, parallel.data)
+        self.assertEqual(sequential.line_margin, parallel.line_margin)
+
+
+class TestMemorySources(TestCase):
+    test_doc = str(Path("tests/resources/lorem.pdf").absolute())
+
+    class Stream:
+        """
+        non-seekable binary stream, e.g. a request body.
+        """
+
+        def __init__(self, data):
+            self._data = io.BytesIO(data)
+
+        def read(self, *args):
+            return self._data.read(*args)
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        with open(cls.test_doc, "rb") as fp:
+            cls.data = fp.read()
+        cls.expected = cls.describe(FileSource(cls.test_doc, la_params=LAParams()))
+
+    @staticmethod
+    def describe(source):
+        return [(getattr(e, "page", None), e.get_text()) for e in source.read()]
+
+    def test_buffer_source(self):
+        self.assertEqual(
+            self.expected, self.describe(BufferSource(self.data, la_params=LAParams()))
+        )
+        self.assertEqual(
+            self.expected,
+            self.describe(
+                BufferSource(memoryview(bytearray(self.data)), la_params=LAParams())
+            ),
+        )
+
+    def test_mmap_source(self):
+        source = MmapSource(self.test_doc, la_params=LAParams())
+        self.assertEqual(self.expected, self.describe(source))
+        source.close()
+
+    def test_file_object_source(self):
+        with open(self.test_doc, "rb") as fp:
+            source = FileObjectSource(fp, la_params=LAParams())
+            self.assertEqual(self.expected, self.describe(source))
+            self.assertEqual(self.test_doc, source.uri)
+
+        source = FileObjectSource(self.Stream(self.data), la_params=LAParams())
+        self.assertEqual(self.expected, self.describe(source))
+
+    def test_same_digest_for_all_sources(self):
+        digest = FileSource(self.test_doc).digest
+        self.assertEqual(digest, BufferSource(self.data).digest)
+        self.assertEqual(digest, MmapSource(self.test_doc).digest)
+        with open(self.test_doc, "rb") as fp:
+            fp.seek(10)
+            self.assertEqual(digest, FileObjectSource(fp).digest)
+            self.assertEqual(10, fp.tell())
+
+    def test_parse_without_filename(self):
+        document = HierarchyParser().parse_pdf(BufferSource(self.data))
+        self.assertIsNone(document.metadata.get("filename"))
+        self.assertTrue(document.elements)
@@ -1,14 +1,18 @@
 import itertools
+import pickle
 from collections import Counter
 from pathlib import Path
+from types import SimpleNamespace
 from unittest import TestCase
 
 import pandas as pd
+import pytest
 
 from retrievalist_parsers import utils
 from retrievalist_parsers.analysis.annotate import StyleAnnotator
 from retrievalist_parsers.analysis.sizemapper import PivotLinearMapper, PivotLogMapper
 from retrievalist_parsers.analysis.styledistribution import (
+    LineMarginAnalyer,
     StyleDistribution,
     count_sizes,
 )
@@ -60,6 +64,88 @@ class TestSizeMapper(TestCase):
         self.assertEqual(TextSize.xlarge, scaler.translate(TextSize, 120))
 
 
+class TestStyleDistribution(TestCase):
+    def setUp(self):
+        self.distribution = StyleDistribution(
+            Counter({10.0: 40, 12.5: 10, 20.0: 5, 8.0: 45}), line_margin=0.3
+        )
+
+    def test_aggregates(self):
+        self.assertEqual(8.0, self.distribution.body_size)
+        self.assertEqual(8.0, self.distribution.min_found_size)
+        self.assertEqual(20.0, self.distribution.max_found_size)
+        self.assertEqual(100.0, self.distribution.amount_values)
+        self.assertEqual(4, self.distribution.amount_sizes)
+
+    def test_norm_data(self):
+        self.assertEqual(
+            {0.5: 0.4, 0.62: 0.1, 1.0: 0.05, 0.4: 0.45},
+            dict(self.distribution.norm_data),
+        )
+
+    def test_norm_data_binned(self):
+        binned = self.distribution.norm_data_binned(bins=10)
+        self.assertEqual(10, len(binned))
+        self.assertAlmostEqual(0.45, binned[0.4])
+        self.assertAlmostEqual(0.4, binned[0.5])
+        self.assertAlmostEqual(0.1, binned[0.6000000000000001])
+        # sizes beyond the last bin are assigned to it
+        self.assertAlmostEqual(0.05, binned[0.9])
+        self.assertAlmostEqual(1.0, sum(binned.values()))
+
+    def test_immutable(self):
+        with pytest.raises(AttributeError):
+            self.distribution._body_size = 12.0
+        with pytest.raises(TypeError):
+            self.distribution.data[10.0] = 1
+        self.distribution.norm_data[0.5] = 1.0
+        self.assertEqual(0.4, self.distribution.norm_data[0.5])
+
+    def test_pickle(self):
+        copy = pickle.loads(pickle.dumps(self.distribution))
+        self.assertEqual(self.distribution.data, copy.data)
+        self.assertEqual(self.distribution.to_json(), copy.to_json())
+
+    def test_merge(self):
+        other = StyleDistribution(Counter({8.0: 15, 30.0: 5}), line_margin=0.5)
+        merged = StyleDistribution.merge(self.distribution, other)
+        self.assertEqual(
+            Counter({10.0: 40, 12.5: 10, 20.0: 5, 8.0: 60, 30.0: 5}), merged.data
+        )
+        self.assertEqual(8.0, merged.body_size)
+        self.assertEqual(30.0, merged.max_found_size)
+        # line margins weighted by the amount of values
+        self.assertAlmostEqual(1 / 3, merged.line_margin)
+        self.assertEqual(
+            0.5, StyleDistribution.merge(self.distribution, line_margin=0.5).line_margin
+        )
+
+
+class TestLineMarginAnalyser(TestCase):
+    @staticmethod
+    def analyse(*tops: float) -> LineMarginAnalyer:
+        analyser = LineMarginAnalyer()
+        for top in tops:
+            analyser.consume(SimpleNamespace(y0=top - 10, y1=top, height=10))
+        return analyser
+
+    def test_merge(self):
+        adjacent = self.analyse(700, 688)
+        adjacent.merge(self.analyse(676, 664))
+        self.assertEqual({(2, 10): 3}, dict(adjacent._distanceCounter))
+
+        # e.g. sampled pages, the distance between both is not measured
+        sampled = self.analyse(700, 688)
+        sampled.merge(self.analyse(100, 88), adjacent=False)
+        self.assertEqual({(2, 10): 2}, dict(sampled._distanceCounter))
+        sampled.merge(self.analyse(500, 488))
+        self.assertEqual({(2, 10): 3, (422, 10): 1}, dict(sampled._distanceCounter))
+
+        empty = LineMarginAnalyer()
+        empty.merge(self.analyse(700, 688), adjacent=False)
+        self.assertEqual({(2, 10): 1}, dict(empty._distanceCounter))
+
+
 class TestFonts(TestCase):
     def test_fontnames(self):
         fonts = []
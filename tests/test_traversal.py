@@ -1,14 +1,22 @@
+import sys
 from pathlib import Path
 from unittest import TestCase
 
 from retrievalist_parsers.hierarchy.parser import HierarchyParser
 from retrievalist_parsers.hierarchy.traversal import (
     get_document_depth,
+    preorder_index,
     traverse_in_order,
     traverse_inorder_sections_with_content,
     traverse_level_order,
+    traverse_subtree,
+)
+from retrievalist_parsers.model.document import (
+    DanglingTextSection,
+    Section,
+    StructuredPdfDocument,
+    TextElement,
 )
-from retrievalist_parsers.model.document import DanglingTextSection
 from retrievalist_parsers.source import FileSource
 
 
@@ -91,3 +99,58 @@ class TestDocumentTraversal(TestCase):
             element for element in traverse_inorder_sections_with_content(self.test_doc)
         ]
         print(elements)
+
+
+class TestPreOrderIndex(TestCase):
+    @staticmethod
+    def create_document(depth):
+        root = Section(TextElement(None, style=None, text="0"))
+        parent = root
+        for level in range(1, depth):
+            child = Section(TextElement(None, style=None, text=str(level)), level)
+            parent.append_children(child)
+            parent = child
+        return StructuredPdfDocument([root, Section(None)])
+
+    def test_deep_document(self):
+        depth = sys.getrecursionlimit() * 2
+        document = self.create_document(depth)
+
+        self.assertEqual(depth + 1, len(list(traverse_in_order(document))))
+        self.assertEqual(depth, get_document_depth(document))
+        self.assertEqual(depth, len(document.elements[0].full_content.split("\n")))
+        self.assertEqual(
+            ["0", "1", "2", ""],
+            [section.heading_text for section in traverse_in_order(document, 3)],
+        )
+
+    def test_index_invalidated_on_mutation(self):
+        document = self.create_document(3)
+        index = preorder_index(document)
+        self.assertIs(index, preorder_index(document))
+
+        leaf = index.sections[2]
+        leaf.append_children(Section(TextElement(None, style=None, text="3"), 3))
+        self.assertIsNot(index, preorder_index(document))
+        self.assertEqual(
+            ["1", "2", "3"],
+            [
+                section.heading_text
+                for section in traverse_subtree(document, index.sections[1])
+            ],
+        )
+
+        document.elements.append(Section(None))
+        self.assertEqual(6, len(preorder_index(document)))
+
+    def test_index_survives_unrelated_documents(self):
+        document = self.create_document(3)
+        index = preorder_index(document)
+
+        other = self.create_document(3)
+        other.elements[0].append_children(Section(None, 1))
+        self.assertIs(index, preorder_index(document))
+        self.assertEqual(5, len(preorder_index(other)))
+
+        document.elements = [document.elements[0]]
+        self.assertEqual(3, len(preorder_index(document)))